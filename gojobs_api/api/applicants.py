@@ -0,0 +1,95 @@
+# applicants.py
+
+from .fragments import serialize_jobs
+from .models import Application, Job
+from .pagination import ApplicantPagination
+from .serializers import JOB_CARD_FIELDS, ApplicantSerializer, with_job_relations
+
+# Tris proposés par ?ordering= (préfixe - pour l'ordre décroissant)
+APPLICANT_ORDERING = {
+    'created_at': 'created_at',
+    'status': 'status',
+    'is_read': 'is_read',
+    'nom': 'candidate__last_name',
+}
+DEFAULT_APPLICANT_ORDERING = '-created_at'
+
+# Colonnes lues par ApplicantSerializer
+APPLICANT_COLUMNS = (
+    'id', 'job', 'status', 'is_read', 'created_at', 'cv_url', 'motivation_letter_url',
+    'candidate__id', 'candidate__first_name', 'candidate__last_name', 'candidate__email',
+    'candidate__phone', 'candidate__profile_image',
+)
+
+
+def applicant_queryset(applications, request):
+    """
+    Candidatures filtrées (?status=, ?is_read=) et triées (?ordering=) pour la liste
+    de l'employeur, candidat chargé par jointure
+    """
+    status = request.query_params.get('status')
+    if status:
+        applications = applications.filter(status=status)
+
+    is_read = request.query_params.get('is_read', '').lower()
+    if is_read in ('true', '1', 'false', '0'):
+        applications = applications.filter(is_read=is_read in ('true', '1'))
+
+    ordering = request.query_params.get('ordering') or DEFAULT_APPLICANT_ORDERING
+    field = APPLICANT_ORDERING.get(ordering.lstrip('-'))
+    if field is None:
+        ordering, field = DEFAULT_APPLICANT_ORDERING, APPLICANT_ORDERING['created_at']
+    descending = ordering.startswith('-')
+
+    return applications.select_related('candidate').only(*APPLICANT_COLUMNS).order_by(
+        f"-{field}" if descending else field,
+        '-id' if descending else 'id',
+    )
+
+
+def applicant_page(applications, request, view=None):
+    """
+    Page de candidatures compactes
+
+    Returns:
+        Tuple (candidatures de la page, lignes sérialisées, bloc meta)
+    """
+    paginator = ApplicantPagination()
+    page = paginator.paginate_queryset(applicant_queryset(applications, request), request, view=view)
+    rows = ApplicantSerializer(page, many=True, context={'request': request}).data
+    return page, rows, paginator.get_meta()
+
+
+def job_applicants(job, request, view=None):
+    """
+    Candidats d'une offre : l'offre (carte) une seule fois, puis une page de
+    candidatures compactes
+
+    Returns:
+        {job, applicants, meta}
+    """
+    _, rows, meta = applicant_page(Application.objects.filter(job=job), request, view)
+    jobs = with_job_relations(Job.objects.filter(pk=job.pk), fields=JOB_CARD_FIELDS)
+    return {
+        'job': serialize_jobs(jobs, {'request': request}, fields=JOB_CARD_FIELDS)[0],
+        'applicants': rows,
+        'meta': meta,
+    }
+
+
+def employer_applicants(employer_id, request, view=None):
+    """
+    Candidatures aux offres d'un employeur : les offres de la page (cartes) une
+    seule fois chacune, puis les candidatures compactes qui y renvoient par job_id
+
+    Returns:
+        {jobs, applicants, meta}
+    """
+    page, rows, meta = applicant_page(Application.objects.filter(job__employer_id=employer_id), request, view)
+    job_ids = {application.job_id for application in page}
+    jobs = with_job_relations(Job.objects.filter(pk__in=job_ids).order_by('-id'), fields=JOB_CARD_FIELDS)
+    return {
+        'jobs': serialize_jobs(jobs, {'request': request}, fields=JOB_CARD_FIELDS),
+        'applicants': rows,
+        'meta': meta,
+    }
@@ -4,3 +4,19 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+    
+    def ready(self):
+        # Enregistrer les récepteurs de signaux
+        from . import signals  # noqa: F401
+        
+        # Tâches périodiques (planificateur intégré, désactivé par défaut) ; le
+        # planificateur n'est démarré que par les serveurs (wsgi.py, asgi.py),
+        # jamais par les commandes de gestion
+        from django.conf import settings
+        from . import scheduler
+        from .lifecycle import sweep_jobs
+        from .rollups import compact_job_stat_rollups
+        from .view_buffer import flush_job_views
+        scheduler.register_task('sweep_jobs', settings.JOB_SWEEP_INTERVAL, sweep_jobs)
+        scheduler.register_task('flush_job_views', settings.JOB_VIEW_FLUSH_INTERVAL, flush_job_views)
+        scheduler.register_task('compact_job_stats', settings.JOB_STATS_COMPACT_INTERVAL, compact_job_stat_rollups)
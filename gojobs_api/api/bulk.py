@@ -0,0 +1,154 @@
+# bulk.py
+
+import hashlib
+import os
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from .counts import invalidate_job_counts
+from .dashboard import invalidate_employer_dashboard
+from .employer_counters import jobs_created
+from .facets import invalidate_job_facets
+from .feed_cache import invalidate_job_feed
+from .geo import assign_coordinates_bulk
+from .models import Job, JobPhoto
+from .saved_searches import match_saved_searches_bulk
+from .serializers import JobSerializer
+from .suggestions import apply_jobs_suggestions
+
+
+def store_shared_photos(files):
+    """
+    Enregistre les photos partagées d'un envoi en masse, une seule fois par contenu
+
+    Les fichiers sont écrits hors de la transaction des offres : en cas d'échec
+    de celle-ci, delete_stored_photos les supprime.
+
+    Args:
+        files: dict {clé: fichier envoyé}
+
+    Returns:
+        Tuple (dict {clé: nom du fichier enregistré}, noms des fichiers) ; deux
+        clés de même contenu désignent le même fichier
+    """
+    stored_by_digest = {}
+    stored = {}
+    created = []
+    for key, upload in files.items():
+        digest = hashlib.sha256()
+        for chunk in upload.chunks():
+            digest.update(chunk)
+        digest = digest.hexdigest()
+
+        if digest not in stored_by_digest:
+            upload.seek(0)
+            extension = os.path.splitext(upload.name)[1].lower()
+            stored_by_digest[digest] = default_storage.save(f'job_photos/{digest[:32]}{extension}', upload)
+            created.append(stored_by_digest[digest])
+        stored[key] = stored_by_digest[digest]
+    return stored, created
+
+
+def delete_stored_photos(names):
+    """Supprime les photos enregistrées pour un envoi annulé."""
+    for name in names:
+        default_storage.delete(name)
+
+
+def validate_rows(rows, files, context):
+    """
+    Valide chaque ligne avec JobSerializer et vérifie les photos référencées
+
+    Returns:
+        Tuple (lignes valides [(index, données validées, clés de photos)], erreurs {index: erreurs})
+    """
+    valid, errors = [], {}
+    for index, row in enumerate(rows):
+        if not isinstance(row, dict):
+            errors[index] = {'non_field_errors': ["Chaque offre doit être un objet"]}
+            continue
+
+        photo_keys = row.get('photos') or []
+        if not isinstance(photo_keys, list):
+            photo_keys = [photo_keys]
+        unknown = [key for key in photo_keys if key not in files]
+
+        serializer = JobSerializer(data=row, context=context)
+        if not serializer.is_valid() or unknown:
+            row_errors = dict(serializer.errors)
+            if unknown:
+                row_errors['photos'] = [f"Photo inconnue : {key}" for key in unknown]
+            errors[index] = row_errors
+            continue
+
+        data = dict(serializer.validated_data)
+        data.pop('user_id', None)
+        valid.append((index, data, photo_keys))
+    return valid, errors
+
+
+def bulk_create_jobs(rows, employer, files=None, context=None):
+    """
+    Crée un lot d'offres en une transaction
+
+    Les lignes invalides sont signalées sans empêcher la création des autres.
+    Les offres sont insérées par bulk_create (par lots de JOB_BULK_BATCH_SIZE) ;
+    les traitements normalement déclenchés par save() et les signaux (champs
+    dérivés, géocodage, suggestions, caches, recherches sauvegardées) sont
+    appliqués au lot.
+
+    Args:
+        rows: Liste de dictionnaires au format de JobSerializer ; la clé `photos`
+              liste les clés des photos partagées de l'offre
+        employer: Employeur des offres
+        files: dict {clé: fichier} des photos partagées
+        context: Contexte du serializer (requête)
+
+    Returns:
+        Liste de résultats par ligne : {index, status, id} ou {index, status, errors}
+    """
+    files = files or {}
+    valid, errors = validate_rows(rows, files, context)
+
+    jobs = []
+    for index, data, photo_keys in valid:
+        if not data.get('company') and employer.company_name:
+            data['company'] = employer.company_name
+        job = Job(employer=employer, **data)
+        job.prepare_save(geocode=False)
+        jobs.append(job)
+    assign_coordinates_bulk(jobs)
+
+    used_keys = {key for _, _, photo_keys in valid for key in photo_keys}
+    stored, created = store_shared_photos({key: files[key] for key in used_keys})
+    try:
+        with transaction.atomic():
+            Job.objects.bulk_create(jobs, batch_size=settings.JOB_BULK_BATCH_SIZE)
+            JobPhoto.objects.bulk_create(
+                [
+                    JobPhoto(job=job, photo=stored[key], order=order)
+                    for job, (_, _, photo_keys) in zip(jobs, valid)
+                    for order, key in enumerate(photo_keys)
+                ],
+                batch_size=settings.JOB_BULK_BATCH_SIZE,
+            )
+
+            active_jobs = [job for job in jobs if job.status == 'active']
+            apply_jobs_suggestions(active_jobs)
+            match_saved_searches_bulk(active_jobs)
+            jobs_created(employer.pk, jobs)
+
+            if jobs:
+                invalidate_employer_dashboard(employer.pk)
+                invalidate_job_counts()
+                invalidate_job_facets()
+                invalidate_job_feed()
+    except Exception:
+        # Offres annulées : aucune ligne ne référence les photos créées
+        delete_stored_photos(created)
+        raise
+
+    results = {index: {'index': index, 'status': 'error', 'errors': row_errors} for index, row_errors in errors.items()}
+    for (index, _, _), job in zip(valid, jobs):
+        results[index] = {'index': index, 'status': 'created', 'id': job.id}
+    return [results[index] for index in range(len(rows))]
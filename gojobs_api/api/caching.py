@@ -0,0 +1,55 @@
+# caching.py
+
+import hashlib
+import time
+from urllib.parse import urlencode
+from django.core.cache import cache
+
+
+def _generation_key(namespace):
+    return f'generation:{namespace}'
+
+
+def get_generation(namespace):
+    """
+    Retourne le numéro de génération courant d'un espace de cache
+    
+    Les clés de cache incluent ce numéro : l'incrémenter invalide
+    d'un coup toutes les entrées de l'espace.
+    """
+    key = _generation_key(namespace)
+    generation = cache.get(key)
+    if generation is None:
+        # Partir de l'horodatage pour ne pas réutiliser une génération déjà vue
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_generation(namespace):
+    """Invalide toutes les entrées d'un espace de cache."""
+    try:
+        return cache.incr(_generation_key(namespace))
+    except ValueError:
+        return get_generation(namespace)
+
+
+def query_signature(params, ignored=()):
+    """
+    Signature normalisée d'un ensemble de paramètres de requête
+    
+    Args:
+        params: QueryDict des paramètres
+        ignored: Paramètres à ne pas prendre en compte (pagination, tri...)
+    
+    Returns:
+        str: Empreinte indépendante de l'ordre des paramètres
+    """
+    items = sorted(
+        (key, value.strip())
+        for key in params
+        if key not in ignored
+        for value in params.getlist(key)
+        if value.strip()
+    )
+    return hashlib.sha1(urlencode(items).encode('utf-8')).hexdigest()
@@ -0,0 +1,123 @@
+# conditional.py
+
+import hashlib
+import time
+from calendar import timegm
+from django.conf import settings
+from django.db.models import Count, Max, Q, Sum
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+from .caching import get_generation
+from .feed_cache import FEED_NAMESPACE
+from .models import Job, Notification, SubscriptionPlan
+from .serializers import employer_job_count
+
+
+def make_etag(request, validators):
+    """
+    ETag d'une réponse à partir de ses validateurs (versions, compteurs, dates)
+
+    L'URL complète (hôte des URL absolues, chemin et paramètres, y compris vides)
+    entre dans l'ETag : deux représentations différentes n'ont jamais le même.
+    """
+    parts = (request.get_host(), request.path, sorted(request.query_params.lists()), validators)
+    return quote_etag(hashlib.md5(repr(parts).encode('utf-8')).hexdigest())
+
+
+def conditional_response(request, build, validators, last_modified=None):
+    """
+    GET conditionnel (If-None-Match / If-Modified-Since)
+
+    Les validateurs sont calculés sans sérialiser la réponse (une requête indexée
+    au plus) : si le client possède déjà la représentation courante, la réponse
+    est un 304 Not Modified et build() n'est pas appelé.
+
+    Args:
+        request: Requête
+        build: Fonction sans argument construisant la réponse complète
+        validators: Valeurs qui changent dès que la réponse change, None si la
+                    ressource n'existe pas (réponse construite sans validateurs)
+        last_modified: Date de dernière modification, le cas échéant
+
+    Returns:
+        Réponse 304, ou réponse de build() avec les en-têtes ETag / Last-Modified
+    """
+    if validators is None:
+        return build()
+
+    etag = make_etag(request, validators)
+    timestamp = timegm(last_modified.utctimetuple()) if last_modified else None
+
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = build()
+        if not 200 <= response.status_code < 300:
+            return response
+
+    response['ETag'] = etag
+    if timestamp is not None:
+        response['Last-Modified'] = http_date(timestamp)
+    return response
+
+
+def job_validators(pk):
+    """
+    Validateurs du détail d'une offre active
+
+    Version des fragments (contenu, photos, employeur), compteurs, nombre
+    d'offres de l'employeur et échéance, lus en une requête.
+
+    Returns:
+        Tuple (validateurs, date de dernière modification), (None, None) si l'offre n'existe pas
+    """
+    try:
+        pk = int(pk)
+    except (TypeError, ValueError):
+        return None, None
+
+    row = (
+        Job.objects.filter(pk=pk, status='active')
+        .annotate(employer_job_count=employer_job_count())
+        .values_list('version', 'views_count', 'applications_count', 'employer_job_count', 'expires_at', 'updated_at')
+        .first()
+    )
+    if row is None:
+        return None, None
+
+    *validators, expires_at, updated_at = row
+    if expires_at:
+        # days_until_expiry et is_expired dépendent de l'heure
+        now = timezone.now()
+        validators += [(expires_at - now).days, expires_at < now]
+    return tuple(validators), updated_at
+
+
+def feed_validators():
+    """
+    Validateurs des listes d'offres : génération du cache des listes, invalidée
+    par toute modification d'offre, et tranche de JOB_FEED_CACHE_TIMEOUT secondes
+    (mêmes compteurs périmés au plus que les listes en cache). Aucune requête SQL.
+    """
+    return get_generation(FEED_NAMESPACE), int(time.time() // settings.JOB_FEED_CACHE_TIMEOUT)
+
+
+def subscription_plan_validators():
+    """Validateurs des formules d'abonnement (table entière : une désactivation compte)."""
+    stats = SubscriptionPlan.objects.aggregate(count=Count('id'), updated_at=Max('updated_at'))
+    return (stats['count'], stats['updated_at']), stats['updated_at']
+
+
+def notification_validators(user):
+    """
+    Validateurs des notifications d'un utilisateur
+
+    Nombre, dernier identifiant et somme des identifiants lus : une nouvelle
+    notification, une suppression ou un changement d'état de lecture les modifie.
+    """
+    stats = Notification.objects.filter(user=user).aggregate(
+        count=Count('id'),
+        last_id=Max('id'),
+        read_ids=Sum('id', filter=Q(is_read=True)),
+    )
+    return (user.pk, stats['count'], stats['last_id'], stats['read_ids'])
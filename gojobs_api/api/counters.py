@@ -0,0 +1,183 @@
+# counters.py
+
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from django.db import connection, transaction
+from django.db.models import Case, Count, DecimalField, F, Q, Value, When
+from django.db.models.functions import Cast, Least, Round, TruncDate
+from django.db.models.lookups import GreaterThan
+from django.utils import timezone
+from .models import Application, FlashJob, Job, Statistic
+from .rollups import add_job_stat_rollups
+
+# Borne de DecimalField(max_digits=5, decimal_places=2) des taux de conversion
+MAX_CONVERSION_RATE = Decimal('999.99')
+
+
+def conversion_rate(applications, views):
+    """Taux de conversion (%) arrondi et borné, calculé en Python comme en SQL."""
+    if not views:
+        return Decimal(0)
+    return min(round(Decimal(applications) * 100 / views, 2), MAX_CONVERSION_RATE)
+
+
+def conversion_rate_expression(applications, views, default):
+    """
+    Taux de conversion calculé par la base
+
+    Args:
+        applications: Expression du nombre de candidatures
+        views: Expression du nombre de vues
+        default: Valeur lorsque le nombre de vues est nul
+    """
+    rate_field = DecimalField(max_digits=5, decimal_places=2)
+    rate = Round(Cast(applications, DecimalField(max_digits=12, decimal_places=2)) * 100 / views, 2)
+    return Case(
+        When(GreaterThan(views, 0), then=Least(rate, Value(MAX_CONVERSION_RATE))),
+        default=default,
+        output_field=rate_field,
+    )
+
+
+def add_daily_statistics(rows):
+    """
+    Ajoute des vues et des candidatures aux statistiques journalières
+    (INSERT ... ON CONFLICT, taux de conversion recalculé par la base)
+
+    Args:
+        rows: Itérable de (job_id, date, vues, candidatures)
+    """
+    rows = sorted(rows)
+    if not rows:
+        return
+
+    table = Statistic._meta.db_table
+    values = ', '.join(['(%s, %s, %s, %s, %s, now(), now())'] * len(rows))
+    params = [
+        value
+        for job_id, day, views, applications in rows
+        for value in (job_id, day, views, applications, conversion_rate(applications, views))
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} (job_id, date, views, applications, conversion_rate, created_at, updated_at) '
+            f'VALUES {values} ON CONFLICT (job_id, date) DO UPDATE '
+            f'SET views = {table}.views + EXCLUDED.views, '
+            f'applications = {table}.applications + EXCLUDED.applications, '
+            f'conversion_rate = CASE WHEN {table}.views + EXCLUDED.views > 0 '
+            f'THEN LEAST(ROUND(({table}.applications + EXCLUDED.applications) * 100.0 '
+            f'/ ({table}.views + EXCLUDED.views), 2), {MAX_CONVERSION_RATE}) ELSE 0 END, '
+            f'updated_at = EXCLUDED.updated_at',
+            params
+        )
+
+
+def statistic_date(moment=None):
+    """Jour (UTC) des statistiques journalières."""
+    return (moment or timezone.now()).astimezone(dt_timezone.utc).date()
+
+
+def apply_application_delta(application, delta):
+    """
+    Candidature créée (+1) ou supprimée (-1) : compteurs de l'offre et de
+    l'emploi flash par incréments F(), dans la transaction de l'écriture
+
+    Les statistiques journalières et agrégées (api/rollups.py) ne comptent que
+    les candidatures reçues : une suppression ne les modifie pas.
+    """
+    applications = F('applications_count') + delta
+    Job.objects.filter(pk=application.job_id).update(
+        applications_count=applications,
+        conversion_rate=conversion_rate_expression(applications, F('views_count'), F('conversion_rate')),
+        updated_at=timezone.now(),
+    )
+
+    # Emploi flash pourvu dès que le nombre maximum de candidats est atteint
+    current = F('current_applicants') + delta
+    FlashJob.objects.filter(job_id=application.job_id).update(
+        current_applicants=current,
+        status=Case(
+            When(Q(max_applicants__gt=0, max_applicants__lte=current), then=Value('filled')),
+            default=F('status'),
+        ),
+        updated_at=timezone.now(),
+    )
+
+    if delta > 0:
+        add_daily_statistics([(application.job_id, statistic_date(application.created_at), 0, delta)])
+        add_job_stat_rollups([(application.job_id, application.created_at, 0, delta)])
+
+    # Offre chargée avec la candidature : compteur en mémoire aligné sur la base
+    if Application.job.is_cached(application):
+        application.job.applications_count += delta
+
+
+def reconcile_application_counters(batch_size=1000):
+    """
+    Recalcule à partir des candidatures (GROUP BY) les compteurs des offres, des
+    emplois flash et les candidatures des statistiques journalières
+
+    Traitement par lots d'offres, chacun dans une transaction qui verrouille les
+    offres du lot : une candidature concurrente attend la fin du lot.
+
+    Returns:
+        dict: Nombre de lignes corrigées par table (jobs, flash_jobs, statistics)
+    """
+    repaired = {'jobs': 0, 'flash_jobs': 0, 'statistics': 0}
+    job_ids = list(Job.objects.order_by('id').values_list('id', flat=True))
+
+    for start in range(0, len(job_ids), batch_size):
+        batch = job_ids[start:start + batch_size]
+        with transaction.atomic():
+            list(Job.objects.filter(pk__in=batch).select_for_update().values_list('id'))
+            applications = Application.objects.filter(job_id__in=batch)
+            counts = dict(
+                applications.order_by().values('job_id').annotate(total=Count('id')).values_list('job_id', 'total')
+            )
+
+            jobs = Job.objects.filter(pk__in=batch).only('id', 'applications_count', 'views_count', 'conversion_rate')
+            drifted = []
+            for job in jobs:
+                total = counts.get(job.pk, 0)
+                rate = conversion_rate(total, job.views_count) if job.views_count else job.conversion_rate
+                if (job.applications_count, job.conversion_rate) != (total, rate):
+                    job.applications_count, job.conversion_rate = total, rate
+                    drifted.append(job)
+            Job.objects.bulk_update(drifted, ['applications_count', 'conversion_rate'])
+            repaired['jobs'] += len(drifted)
+
+            flash_jobs = FlashJob.objects.filter(job_id__in=batch).only('id', 'job_id', 'current_applicants')
+            drifted = []
+            for flash_job in flash_jobs:
+                if flash_job.current_applicants != counts.get(flash_job.job_id, 0):
+                    flash_job.current_applicants = counts.get(flash_job.job_id, 0)
+                    drifted.append(flash_job)
+            FlashJob.objects.bulk_update(drifted, ['current_applicants'])
+            repaired['flash_jobs'] += len(drifted)
+
+            repaired['statistics'] += _reconcile_statistics(batch, applications)
+
+    return repaired
+
+
+def _reconcile_statistics(job_ids, applications):
+    rows = (
+        applications.annotate(day=TruncDate('created_at', tzinfo=dt_timezone.utc))
+        .order_by().values('job_id', 'day').annotate(total=Count('id'))
+        .values_list('job_id', 'day', 'total')
+    )
+    daily = {(job_id, day): total for job_id, day, total in rows}
+
+    stats = Statistic.objects.filter(job_id__in=job_ids).only('id', 'job_id', 'date', 'views', 'applications')
+    drifted = []
+    for stat in stats:
+        total = daily.pop((stat.job_id, stat.date), 0)
+        if stat.applications != total:
+            stat.applications = total
+            stat.conversion_rate = conversion_rate(total, stat.views)
+            drifted.append(stat)
+    Statistic.objects.bulk_update(drifted, ['applications', 'conversion_rate'])
+
+    # Jours sans ligne de statistiques
+    add_daily_statistics((job_id, day, 0, total) for (job_id, day), total in daily.items())
+    return len(drifted) + len(daily)
@@ -0,0 +1,48 @@
+# counts.py
+
+import json
+from django.conf import settings
+from django.core.cache import cache
+from .caching import bump_generation, get_generation
+
+COUNTS_NAMESPACE = 'job_counts'
+
+
+def planner_estimate(queryset):
+    """Nombre de lignes estimé par le planificateur PostgreSQL (EXPLAIN), sans exécuter la requête."""
+    plan = json.loads(queryset.order_by().explain(format='json'))
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def count_jobs(queryset, signature):
+    """
+    Nombre d'offres d'un queryset filtré, mis en cache par signature de filtres
+    
+    Au-delà de JOB_COUNT_ESTIMATE_THRESHOLD lignes estimées, l'estimation du
+    planificateur est utilisée au lieu d'un COUNT(*) exact.
+    
+    Args:
+        queryset: Queryset filtré des offres
+        signature: Signature normalisée des filtres appliqués
+    
+    Returns:
+        Tuple (total, exact)
+    """
+    key = f'jobs:count:{get_generation(COUNTS_NAMESPACE)}:{signature}'
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+    
+    estimate = planner_estimate(queryset)
+    if estimate > settings.JOB_COUNT_ESTIMATE_THRESHOLD:
+        result = (estimate, False)
+    else:
+        result = (queryset.count(), True)
+    
+    cache.set(key, result, settings.JOB_COUNT_CACHE_TIMEOUT)
+    return result
+
+
+def invalidate_job_counts():
+    """Invalide les totaux en cache (publication, clôture ou suppression d'offres)."""
+    bump_generation(COUNTS_NAMESPACE)
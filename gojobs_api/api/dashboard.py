@@ -0,0 +1,121 @@
+# dashboard.py
+
+from datetime import timedelta
+from django.conf import settings
+from django.contrib.postgres.expressions import ArraySubquery
+from django.core.cache import cache
+from django.db.models import OuterRef
+from django.db.models.functions import JSONObject
+from django.utils import timezone
+from .caching import bump_generation, get_generation
+from .employer_counters import get_employer_counters
+from .models import EmployerCounters, Job
+from .rollups import day_start, job_timeseries
+from .view_sketches import unique_viewers
+
+# Nombre de jours des graphiques du tableau de bord
+DASHBOARD_DAYS = 14
+# Meilleures offres affichées
+DASHBOARD_TOP_JOBS = 5
+
+
+def _namespace(employer_id):
+    return f'employer_dashboard:{employer_id}'
+
+
+def dashboard_summary(employer_id):
+    """
+    Compteurs de l'employeur et ses meilleures offres, en une requête : ligne
+    des compteurs dénormalisés (api/employer_counters.py) et cinq offres les
+    plus candidatées en sous-requête ARRAY()
+
+    La ligne absente est créée au premier accès (deuxième requête).
+    """
+    top_jobs = (
+        Job.objects.filter(employer=OuterRef('pk'))
+        .order_by('-applications_count', '-created_at')
+        .values(data=JSONObject(
+            id='id', title='title', views='views_count', cvCount='applications_count', cvRate='conversion_rate'
+        ))[:DASHBOARD_TOP_JOBS]
+    )
+    summary = EmployerCounters.objects.filter(pk=employer_id).annotate(top_jobs=ArraySubquery(top_jobs))
+    counters = summary.first()
+    if counters is None:
+        get_employer_counters(employer_id)
+        counters = summary.get()
+    return counters
+
+
+def dashboard_unique_viewers(employer_id, jobs, start_date, end_date):
+    """
+    Visiteurs distincts de la période du tableau de bord, en cache
+    (EMPLOYER_DASHBOARD_VIEWERS_CACHE_TIMEOUT)
+
+    La fusion des esquisses de toutes les offres est la partie la plus coûteuse
+    du tableau de bord : elle est conservée hors de la génération de
+    l'employeur, et n'est pas recalculée à chaque candidature ou modification
+    d'offre.
+    """
+    key = f'dashboard_viewers:{employer_id}:{end_date.isoformat()}'
+    count = cache.get(key)
+    if count is None:
+        count = unique_viewers(jobs, start_date, end_date)
+        cache.set(key, count, settings.EMPLOYER_DASHBOARD_VIEWERS_CACHE_TIMEOUT)
+    return count
+
+
+def build_dashboard(employer_id):
+    """Données du tableau de bord (compteurs, graphiques sur 14 jours, meilleures offres)."""
+    counters = dashboard_summary(employer_id)
+    jobs = Job.objects.filter(employer_id=employer_id)
+
+    total_views = counters.total_views
+    total_applications = counters.total_applications
+    cv_rate = round((total_applications / total_views * 100), 2) if total_views > 0 else 0
+
+    # Vues et candidatures des 14 derniers jours, jours sans activité compris (une requête)
+    end_date = timezone.now().date()
+    start_date = end_date - timedelta(days=DASHBOARD_DAYS - 1)
+    points = job_timeseries(jobs, day_start(start_date), day_start(end_date) + timedelta(days=1), 'day')['points']
+    labels = [point['bucket'].strftime('%d/%m') for point in points]
+
+    return {
+        'totalJobs': counters.total_jobs,
+        'activeJobs': counters.active_jobs,
+        'totalApplications': total_applications,
+        'totalViews': total_views,
+        'cvRate': cv_rate,
+        'newApplications': counters.unread_applications,
+        # Visiteurs distincts sur la période, toutes offres confondues (fusion des esquisses)
+        'uniqueViewers': dashboard_unique_viewers(employer_id, jobs, start_date, end_date),
+        'viewsData': {'labels': labels, 'values': [point['views'] for point in points]},
+        'applicationData': {'labels': labels, 'values': [point['applications'] for point in points]},
+        'activeJobsData': [
+            {**job, 'cvRate': round(float(job['cvRate']), 2)} for job in counters.top_jobs
+        ],
+    }
+
+
+def employer_dashboard(employer_id):
+    """
+    Tableau de bord d'un employeur, mis en cache par employeur
+    (EMPLOYER_DASHBOARD_CACHE_TIMEOUT)
+
+    La clé inclut la génération de l'employeur, incrémentée à chaque écriture
+    qui modifie ses offres ou ses candidatures (invalidate_employer_dashboard) :
+    le cache est alors abandonné. Les vues n'invalident pas le tableau de bord,
+    elles y apparaissent à son expiration.
+    """
+    key = f'dashboard:{employer_id}:{get_generation(_namespace(employer_id))}'
+    data = cache.get(key)
+    if data is None:
+        data = build_dashboard(employer_id)
+        cache.set(key, data, settings.EMPLOYER_DASHBOARD_CACHE_TIMEOUT)
+    return data
+
+
+def invalidate_employer_dashboard(*employer_ids):
+    """Invalide le tableau de bord en cache d'un ou plusieurs employeurs."""
+    for employer_id in set(employer_ids):
+        if employer_id is not None:
+            bump_generation(_namespace(employer_id))
@@ -0,0 +1,208 @@
+# employer_counters.py
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Subquery, Sum
+from django.utils import timezone
+from .models import Application, EmployerCounters, Job
+
+COUNTER_FIELDS = ('total_jobs', 'active_jobs', 'total_applications', 'unread_applications', 'total_views')
+
+
+def counter_values(employer_ids):
+    """
+    Compteurs recalculés à partir des offres et des candidatures (deux agrégations)
+
+    Returns:
+        dict {employer_id: {champ: valeur}}, à zéro pour un employeur sans offre
+    """
+    values = {employer_id: dict.fromkeys(COUNTER_FIELDS, 0) for employer_id in employer_ids}
+
+    jobs = (
+        Job.objects.filter(employer_id__in=values).order_by().values('employer_id')
+        .annotate(
+            total_jobs=Count('id'),
+            active_jobs=Count('id', filter=Q(status='active')),
+            total_views=Sum('views_count'),
+        )
+    )
+    for row in jobs:
+        values[row.pop('employer_id')].update(row)
+
+    applications = (
+        Application.objects.filter(job__employer_id__in=values).order_by().values('job__employer_id')
+        .annotate(
+            total_applications=Count('id'),
+            unread_applications=Count('id', filter=Q(is_read=False)),
+        )
+    )
+    for row in applications:
+        values[row.pop('job__employer_id')].update(row)
+    return values
+
+
+def apply_employer_counters(employer, create=True, **deltas):
+    """
+    Applique des variations aux compteurs d'un employeur (UPDATE ... SET x = x + n)
+
+    À appeler dans la transaction de l'écriture comptée. La ligne absente est
+    créée à partir des tables, écriture en cours comprise.
+
+    Args:
+        employer: Identifiant de l'employeur (ou sous-requête le désignant)
+        create: Créer la ligne absente (False pour une suppression : l'employeur
+                peut être en cours de suppression)
+        **deltas: Variation de chaque compteur (COUNTER_FIELDS)
+    """
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    counters = EmployerCounters.objects.filter(pk=employer)
+    changes = {field: F(field) + delta for field, delta in deltas.items()}
+    if counters.update(updated_at=timezone.now(), **changes) or not create:
+        return
+
+    try:
+        with transaction.atomic():
+            EmployerCounters.objects.create(employer_id=employer, **counter_values([employer])[employer])
+    except IntegrityError:
+        # Ligne créée entre-temps par une autre transaction, qui ne voyait pas cette écriture
+        counters.update(updated_at=timezone.now(), **changes)
+
+
+def get_employer_counters(employer_id):
+    """Compteurs d'un employeur : lecture par clé primaire, ligne créée au premier accès."""
+    counters = EmployerCounters.objects.filter(pk=employer_id).first()
+    if counters is None:
+        counters, _ = EmployerCounters.objects.get_or_create(
+            pk=employer_id, defaults=counter_values([employer_id])[employer_id]
+        )
+    return counters
+
+
+def job_saved(job, created, update_fields=None):
+    """Publication d'une offre, changement de statut ou nouvelles vues."""
+    # Colonnes éventuellement différées (.only()) : non chargées, donc inchangées
+    status = job.__dict__.get('status')
+    views_count = job.__dict__.get('views_count') or 0
+    # Colonnes absentes de update_fields : non écrites, quelle que soit leur valeur en mémoire
+    if update_fields is not None:
+        if 'status' not in update_fields:
+            status = job.get_loaded_value('status')
+        if 'views_count' not in update_fields:
+            views_count = job.get_loaded_value('views_count') or 0
+    if created:
+        apply_employer_counters(
+            job.employer_id, total_jobs=1, active_jobs=int(status == 'active'), total_views=views_count
+        )
+        return
+
+    was_active = job.get_loaded_value('status') == 'active'
+    apply_employer_counters(
+        job.employer_id,
+        active_jobs=int(status == 'active') - int(was_active),
+        total_views=views_count - (job.get_loaded_value('views_count') or 0),
+    )
+
+
+def job_deleted(job):
+    # Les candidatures supprimées en cascade sont décomptées par application_deleted
+    apply_employer_counters(
+        job.employer_id,
+        create=False,
+        total_jobs=-1,
+        active_jobs=-int(job.status == 'active'),
+        total_views=-job.views_count,
+    )
+
+
+def jobs_created(employer_id, jobs):
+    """Offres créées en masse (bulk_create, sans signal)."""
+    apply_employer_counters(
+        employer_id,
+        total_jobs=len(jobs),
+        active_jobs=sum(job.status == 'active' for job in jobs),
+        total_views=sum(job.views_count for job in jobs),
+    )
+
+
+def jobs_closed(jobs):
+    """Offres actives clôturées par une mise à jour en masse (employer_id chargé)."""
+    closed = {}
+    for job in jobs:
+        closed[job.employer_id] = closed.get(job.employer_id, 0) + 1
+    for employer_id, count in closed.items():
+        apply_employer_counters(employer_id, active_jobs=-count)
+
+
+def application_saved(application, created):
+    """Nouvelle candidature ou changement de son état de lecture."""
+    unread = int(not application.is_read)
+    if created:
+        deltas = {'total_applications': 1, 'unread_applications': unread}
+    else:
+        deltas = {'unread_applications': unread - int(not application.get_loaded_value('is_read'))}
+
+    if any(deltas.values()):
+        apply_employer_counters(application.job.employer_id, **deltas)
+
+
+def application_deleted(application):
+    # Employeur désigné par sous-requête : l'offre n'est pas chargée
+    employer = Subquery(Job.objects.filter(pk=application.job_id).values('employer_id')[:1])
+    apply_employer_counters(
+        employer,
+        create=False,
+        total_applications=-1,
+        unread_applications=-int(not application.is_read),
+    )
+
+
+def counted_employer_ids():
+    """Employeurs ayant des offres ou des compteurs."""
+    with_jobs = set(Job.objects.order_by().values_list('employer_id', flat=True).distinct())
+    return sorted(with_jobs | set(EmployerCounters.objects.values_list('pk', flat=True)))
+
+
+def reconcile_employer_counters(employer_ids=None, batch_size=500):
+    """
+    Recalcule les compteurs à partir des tables et corrige les écarts
+
+    Les lignes d'un lot sont verrouillées avant le recalcul : une écriture
+    concurrente attend la fin du lot et applique son incrément au compteur
+    corrigé.
+
+    Args:
+        employer_ids: Employeurs à vérifier (tous par défaut, voir counted_employer_ids)
+        batch_size: Nombre d'employeurs par transaction
+
+    Returns:
+        Tuple (employeurs vérifiés, compteurs corrigés ou créés)
+    """
+    ids = counted_employer_ids() if employer_ids is None else sorted(employer_ids)
+    repaired = 0
+
+    for start in range(0, len(ids), batch_size):
+        batch = ids[start:start + batch_size]
+        with transaction.atomic():
+            existing = {
+                counters.pk: counters
+                for counters in EmployerCounters.objects.select_for_update().filter(pk__in=batch)
+            }
+            now = timezone.now()
+            drifted, missing = [], []
+            for employer_id, values in counter_values(batch).items():
+                counters = existing.get(employer_id)
+                if counters is None:
+                    missing.append(EmployerCounters(employer_id=employer_id, updated_at=now, **values))
+                elif any(getattr(counters, field) != value for field, value in values.items()):
+                    for field, value in values.items():
+                        setattr(counters, field, value)
+                    counters.updated_at = now
+                    drifted.append(counters)
+
+            EmployerCounters.objects.bulk_update(drifted, [*COUNTER_FIELDS, 'updated_at'])
+            EmployerCounters.objects.bulk_create(missing, ignore_conflicts=True)
+        repaired += len(drifted) + len(missing)
+
+    return len(ids), repaired
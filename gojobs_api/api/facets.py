@@ -0,0 +1,105 @@
+# facets.py
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from .caching import bump_generation, get_generation
+
+FACETS_NAMESPACE = 'job_facets'
+
+# Champs regroupés par valeur (liste de {value, count})
+FACET_FIELDS = ('category', 'city', 'contract_type', 'salary_type')
+
+# Critères booléens comptés par FILTER (nombre d'offres à True)
+FLAG_FIELDS = (
+    'has_accommodation', 'accommodation_accepts_children', 'accommodation_accepts_dogs',
+    'accommodation_is_accessible', 'accepts_working_visa', 'accepts_holiday_visa',
+    'accepts_student_visa', 'is_entry_level', 'requires_driving_license',
+    'job_accepts_handicapped', 'has_company_car', 'is_urgent', 'is_new', 'is_top',
+)
+
+
+def _facets_sql(queryset):
+    """
+    Construit la requête unique des facettes
+
+    Le queryset filtré sert de sous-requête ; GROUPING SETS produit en un seul
+    parcours un groupe par champ de facette plus un groupe global (), qui porte
+    le total et les compteurs FILTER des critères booléens.
+    """
+    subquery, params = queryset.order_by().values(*FACET_FIELDS, *FLAG_FIELDS).query.sql_with_params()
+    qn = connection.ops.quote_name
+    facet_columns = ', '.join(qn(field) for field in FACET_FIELDS)
+    flag_counts = ', '.join(
+        f'COUNT(*) FILTER (WHERE {qn(field)})' for field in FLAG_FIELDS
+    )
+    grouping_sets = ', '.join(f'({qn(field)})' for field in FACET_FIELDS)
+    sql = (
+        f'SELECT {facet_columns}, GROUPING({facet_columns}), COUNT(*), {flag_counts} '
+        f'FROM ({subquery}) AS jobs '
+        f'GROUP BY GROUPING SETS ({grouping_sets}, ())'
+    )
+    return sql, params
+
+
+def compute_job_facets(queryset):
+    """
+    Compte les offres par valeur de facette et par critère booléen
+
+    Args:
+        queryset: Queryset filtré des offres
+
+    Returns:
+        dict: {total, <champ>: [{value, count}, ...], flags: {<critère>: count}}
+    """
+    sql, params = _facets_sql(queryset)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    facets = {field: [] for field in FACET_FIELDS}
+    facets['total'] = 0
+    facets['flags'] = {field: 0 for field in FLAG_FIELDS}
+
+    size = len(FACET_FIELDS)
+    # GROUPING() renvoie un masque : bit à 1 pour chaque colonne agrégée
+    all_grouped = (1 << size) - 1
+    for row in rows:
+        values, grouping, count = row[:size], row[size], row[size + 1]
+        if grouping == all_grouped:
+            facets['total'] = count
+            facets['flags'] = dict(zip(FLAG_FIELDS, row[size + 2:]))
+            continue
+        for position, field in enumerate(FACET_FIELDS):
+            if not grouping & (1 << (size - 1 - position)):
+                facets[field].append({'value': values[position], 'count': count})
+                break
+
+    for field in FACET_FIELDS:
+        facets[field].sort(key=lambda item: (-item['count'], str(item['value'])))
+    return facets
+
+
+def job_facets(queryset, signature):
+    """Facettes d'un queryset filtré, mises en cache par signature de filtres."""
+    key = f'jobs:facets:{get_generation(FACETS_NAMESPACE)}:{signature}'
+    facets = cache.get(key)
+    if facets is None:
+        facets = compute_job_facets(queryset)
+        cache.set(key, facets, settings.JOB_FACETS_CACHE_TIMEOUT)
+    return facets
+
+
+def invalidate_job_facets():
+    """Invalide les facettes en cache."""
+    bump_generation(FACETS_NAMESPACE)
+
+
+def job_facets_changed(job, created=False):
+    """Indique si l'enregistrement d'une offre modifie des facettes."""
+    if created:
+        return True
+    return any(
+        job.get_loaded_value(field) != job.__dict__.get(field)
+        for field in ('status',) + FACET_FIELDS + FLAG_FIELDS
+    )
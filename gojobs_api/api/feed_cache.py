@@ -0,0 +1,57 @@
+# feed_cache.py
+
+from django.conf import settings
+from django.core.cache import cache
+from .caching import bump_generation, get_generation, query_signature
+
+FEED_NAMESPACE = 'job_feed'
+
+# Champs de compteurs : leur mise à jour seule n'invalide pas les listes en cache
+COUNTER_FIELDS = frozenset({'views_count', 'applications_count', 'conversion_rate'})
+
+
+def is_cacheable(request):
+    """Seules les listes demandées par des visiteurs anonymes sont mises en cache."""
+    return request.method == 'GET' and not request.user.is_authenticated
+
+
+def feed_cache_key(request, action):
+    """
+    Clé d'une réponse de liste : action, mode de pagination, hôte (URL absolues
+    des logos) et paramètres normalisés
+    """
+    # ?cursor= vide (première page par curseur) est ignoré par la signature
+    mode = 'cursor' if 'cursor' in request.query_params else 'page'
+    signature = query_signature(request.query_params)
+    return f'jobs:feed:{get_generation(FEED_NAMESPACE)}:{action}:{mode}:{request.get_host()}:{signature}'
+
+
+def cached_feed(request, action, build):
+    """
+    Retourne les données d'une liste d'offres, calculées une seule fois par
+    génération pour des requêtes anonymes identiques
+    
+    Args:
+        request: Requête DRF
+        action: Nom de l'action (list, search...)
+        build: Fonction sans argument calculant les données de la réponse
+    """
+    if not is_cacheable(request):
+        return build()
+    
+    key = feed_cache_key(request, action)
+    data = cache.get(key)
+    if data is None:
+        data = build()
+        cache.set(key, data, settings.JOB_FEED_CACHE_TIMEOUT)
+    return data
+
+
+def invalidate_job_feed():
+    """Invalide toutes les listes d'offres en cache."""
+    bump_generation(FEED_NAMESPACE)
+
+
+def is_counter_update(update_fields):
+    """Indique si un enregistrement ne touche que des compteurs (et la date de modification)."""
+    return bool(update_fields) and set(update_fields) - {'updated_at'} <= COUNTER_FIELDS
@@ -0,0 +1,94 @@
+# filters.py
+
+from django.db.models import F
+from rest_framework import filters
+from .models import JOB_FLAG_BITS
+from .search import search_jobs
+
+
+class JobSearchFilter(filters.SearchFilter):
+    """
+    SearchFilter (?search=) utilisant le moteur plein texte des offres
+    au lieu de requêtes ILIKE sur chaque champ de `search_fields`.
+    """
+    
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        if not search_terms:
+            return queryset
+        
+        return search_jobs(queryset, ' '.join(search_terms))
+
+
+
+class JobFlagsFilter(filters.BaseFilterBackend):
+    """
+    Filtre les offres sur leurs critères booléens par un seul prédicat
+    `flags & masque = attendu` sur la colonne Job.flags (index status, flags).
+    
+    Paramètres acceptés : chaque critère par son nom (?has_accommodation=true,
+    ?is_urgent=false...) et les alias historiques de l'application
+    (accommodation, accommodation_children, accommodation_pets,
+    accommodation_accessible, company_car, entry_level, visa_type).
+    """
+    
+    TRUE_VALUES = ('true', '1')
+    FALSE_VALUES = ('false', '0')
+    
+    # Alias n'acceptant que la valeur true
+    ALIASES = {
+        'company_car': 'has_company_car',
+        'entry_level': 'is_entry_level',
+    }
+    ACCOMMODATION_ALIASES = {
+        'accommodation_children': 'accommodation_accepts_children',
+        'accommodation_pets': 'accommodation_accepts_dogs',
+        'accommodation_accessible': 'accommodation_is_accessible',
+    }
+    VISA_TYPES = {
+        'work': 'accepts_working_visa',
+        'holiday': 'accepts_holiday_visa',
+        'student': 'accepts_student_visa',
+    }
+    
+    def get_required_flags(self, params):
+        """
+        Retourne les critères demandés
+        
+        Returns:
+            Tuple (critères à True, critères à False)
+        """
+        required, excluded = set(), set()
+        
+        for field in JOB_FLAG_BITS:
+            value = params.get(field, '').lower()
+            if value in self.TRUE_VALUES:
+                required.add(field)
+            elif value in self.FALSE_VALUES:
+                excluded.add(field)
+        
+        for param, field in self.ALIASES.items():
+            if params.get(param) == 'true':
+                required.add(field)
+        
+        if params.get('accommodation') == 'true':
+            required.add('has_accommodation')
+            # Sous-filtres pour le logement
+            for param, field in self.ACCOMMODATION_ALIASES.items():
+                if params.get(param) == 'true':
+                    required.add(field)
+        
+        visa_field = self.VISA_TYPES.get(params.get('visa_type'))
+        if visa_field:
+            required.add(visa_field)
+        
+        return required, excluded - required
+    
+    def filter_queryset(self, request, queryset, view):
+        required, excluded = self.get_required_flags(request.query_params)
+        if not required and not excluded:
+            return queryset
+        
+        expected = sum(JOB_FLAG_BITS[field] for field in required)
+        mask = expected + sum(JOB_FLAG_BITS[field] for field in excluded)
+        return queryset.alias(masked_flags=F('flags').bitand(mask)).filter(masked_flags=expected)
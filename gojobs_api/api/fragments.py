@@ -0,0 +1,128 @@
+# fragments.py
+
+import hashlib
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from .models import Job
+from .serializers import JobSerializer, UserSerializer
+
+# Champs recalculés à chaque requête : annotation (distance), fonction de l'heure
+# (expiration) ou des autres offres de l'employeur (nombre d'offres)
+REQUEST_FIELDS = ('distance', 'days_until_expiry', 'is_expired', 'employeur')
+
+
+def employer_public_fields():
+    """Colonnes de l'employeur reprises dans la représentation d'une offre."""
+    return frozenset(UserSerializer.Meta.fields) - {'password'}
+
+
+def representation_key(fields):
+    """Identifiant de la représentation (complète ou partielle, voir requested_job_fields)."""
+    if fields is None:
+        return 'full'
+    return hashlib.md5(','.join(sorted(fields)).encode('utf-8')).hexdigest()[:12]
+
+
+def fragment_key(job, representation):
+    return f'jobs:fragment:{representation}:{job.pk}:{job.version}'
+
+
+def absolute_urls(data, request):
+    """
+    Rend absolues les URL d'un fragment, comme JobSerializer le fait en présence
+    de la requête (logo, photo de profil de l'employeur)
+    """
+    if request is None:
+        return data
+
+    logo = data.get('logo')
+    if logo is not None:
+        base_url = request.build_absolute_uri('/').rstrip('/')
+        data['logo'] = f"{base_url}{logo}" if logo.startswith('/') else f"{base_url}/{logo}"
+
+    employer = data.get('employer')
+    if employer and employer.get('profile_image'):
+        data['employer'] = {**employer, 'profile_image': request.build_absolute_uri(employer['profile_image'])}
+    return data
+
+
+def serialize_jobs(jobs, context, fields=None):
+    """
+    Sérialise une liste d'offres à partir des fragments en cache
+
+    Un fragment est la représentation d'une offre sans la requête (URL relatives),
+    partageable entre utilisateurs ; sa clé contient Job.version, incrémentée à
+    chaque modification de l'offre, de ses photos ou de son employeur. Les
+    fragments sont lus en un seul get_many, seules les offres absentes sont
+    sérialisées. Les champs dépendant de la requête (REQUEST_FIELDS, URL
+    absolues) sont ensuite recalculés pour chaque offre.
+
+    Args:
+        jobs: Offres chargées (voir with_job_relations)
+        context: Contexte du serializer (requête)
+        fields: Champs demandés (requested_job_fields), None pour l'offre complète
+
+    Returns:
+        Liste des offres sérialisées, dans l'ordre de `jobs`
+    """
+    jobs = list(jobs)
+    representation = representation_key(fields)
+    keys = [fragment_key(job, representation) for job in jobs]
+    fragments = cache.get_many(keys)
+
+    missing = [job for job, key in zip(jobs, keys) if key not in fragments]
+    if missing:
+        data = JobSerializer(missing, many=True, fields=fields, context={}).data
+        serialized = {fragment_key(job, representation): item for job, item in zip(missing, data)}
+        cache.set_many(serialized, settings.JOB_FRAGMENT_CACHE_TIMEOUT)
+        fragments.update(serialized)
+
+    serializer = JobSerializer(fields=fields, context=context)
+    request_fields = [serializer.fields[name] for name in REQUEST_FIELDS if name in serializer.fields]
+    request = context.get('request')
+
+    results = []
+    for job, key in zip(jobs, keys):
+        data = dict(fragments[key])
+        for field in request_fields:
+            data[field.field_name] = field.to_representation(field.get_attribute(job))
+        results.append(absolute_urls(data, request))
+    return results
+
+
+def invalidate_job_fragments(queryset):
+    """
+    Périme les fragments en cache des offres d'un queryset (mise à jour sans save())
+
+    Seule la version change : updated_at (tri, Last-Modified) reste celui de la
+    dernière modification de l'offre.
+    """
+    return queryset.update(version=F('version') + 1)
+
+
+def employer_public_changes(employer, update_fields=None):
+    """Colonnes publiques de l'employeur dont la valeur enregistrée a changé."""
+    fields = [
+        field for field in employer._meta.concrete_fields
+        if field.name in employer_public_fields()
+        and (update_fields is None or field.name in update_fields)
+    ]
+    if not hasattr(employer, '_loaded_values'):
+        # Instance non lue en base : valeurs précédentes inconnues
+        return [field.name for field in fields]
+    return [
+        field.name for field in fields
+        if field.attname in employer.__dict__
+        and employer.get_loaded_value(field.attname) != employer.__dict__[field.attname]
+    ]
+
+
+def invalidate_employer_fragments(employer, update_fields=None):
+    """
+    Périme les fragments des offres d'un employeur dont les informations
+    publiques ont changé (à appeler avant la mise à jour des valeurs chargées)
+    """
+    if not employer_public_changes(employer, update_fields):
+        return 0
+    return invalidate_job_fragments(Job.objects.filter(employer=employer))
@@ -0,0 +1,381 @@
+# geo.py
+
+import math
+import re
+import unicodedata
+from django.db.models import FloatField, Q, Value
+from django.db.models.functions import ASin, Cos, Least, Power, Radians, Sin, Sqrt
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32
+
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+GEOHASH_PRECISION = 9
+
+# Gazetteer hors ligne : ville normalisée -> (latitude, longitude)
+GAZETTEER = {
+    'paris': (48.8566, 2.3522),
+    'marseille': (43.2965, 5.3698),
+    'lyon': (45.7640, 4.8357),
+    'toulouse': (43.6047, 1.4442),
+    'nice': (43.7102, 7.2620),
+    'nantes': (47.2184, -1.5536),
+    'montpellier': (43.6108, 3.8767),
+    'strasbourg': (48.5734, 7.7521),
+    'bordeaux': (44.8378, -0.5792),
+    'lille': (50.6292, 3.0573),
+    'rennes': (48.1173, -1.6778),
+    'reims': (49.2583, 4.0317),
+    'toulon': (43.1242, 5.9280),
+    'saint etienne': (45.4397, 4.3872),
+    'le havre': (49.4944, 0.1079),
+    'grenoble': (45.1885, 5.7245),
+    'dijon': (47.3220, 5.0415),
+    'angers': (47.4784, -0.5632),
+    'nimes': (43.8367, 4.3601),
+    'villeurbanne': (45.7719, 4.8902),
+    'clermont ferrand': (45.7772, 3.0870),
+    'le mans': (48.0061, 0.1996),
+    'aix en provence': (43.5297, 5.4474),
+    'brest': (48.3904, -4.4861),
+    'tours': (47.3941, 0.6848),
+    'amiens': (49.8941, 2.2958),
+    'limoges': (45.8336, 1.2611),
+    'annecy': (45.8992, 6.1294),
+    'perpignan': (42.6887, 2.8948),
+    'metz': (49.1193, 6.1757),
+    'besancon': (47.2378, 6.0241),
+    'orleans': (47.9030, 1.9093),
+    'rouen': (49.4432, 1.0999),
+    'mulhouse': (47.7508, 7.3359),
+    'caen': (49.1829, -0.3707),
+    'nancy': (48.6921, 6.1844),
+    'argenteuil': (48.9472, 2.2467),
+    'montreuil': (48.8638, 2.4485),
+    'roubaix': (50.6942, 3.1746),
+    'tourcoing': (50.7239, 3.1612),
+    'avignon': (43.9493, 4.8055),
+    'poitiers': (46.5802, 0.3404),
+    'pau': (43.2951, -0.3708),
+    'la rochelle': (46.1603, -1.1511),
+    'cannes': (43.5528, 7.0174),
+    'antibes': (43.5808, 7.1251),
+    'calais': (50.9513, 1.8587),
+    'ajaccio': (41.9192, 8.7386),
+    'bastia': (42.6977, 9.4508),
+    'bayonne': (43.4929, -1.4748),
+    'biarritz': (43.4832, -1.5586),
+    'chamonix mont blanc': (45.9237, 6.8694),
+    'chamonix': (45.9237, 6.8694),
+    'saint malo': (48.6493, -2.0257),
+    'versailles': (48.8049, 2.1204),
+    'boulogne billancourt': (48.8397, 2.2399),
+    'saint denis': (48.9362, 2.3574),
+    'troyes': (48.2973, 4.0744),
+    'valence': (44.9334, 4.8924),
+    'colmar': (48.0794, 7.3585),
+    'lorient': (47.7483, -3.3702),
+    'quimper': (47.9960, -4.1020),
+    'vannes': (47.6582, -2.7608),
+    'saint nazaire': (47.2735, -2.2138),
+    'arles': (43.6768, 4.6303),
+    'beziers': (43.3442, 3.2158),
+    'carcassonne': (43.2130, 2.3491),
+    'montauban': (44.0176, 1.3550),
+    'chambery': (45.5646, 5.9178),
+    'deauville': (49.3600, 0.0750),
+    'saint tropez': (43.2727, 6.6406),
+    'menton': (43.7747, 7.4975),
+    'frejus': (43.4330, 6.7370),
+    'hyeres': (43.1204, 6.1286),
+    'arcachon': (44.6586, -1.1689),
+    'les sables d olonne': (46.4967, -1.7831),
+    'courchevel': (45.4154, 6.6346),
+    'val d isere': (45.4481, 6.9799),
+    'megeve': (45.8567, 6.6175),
+}
+
+
+def normalize_place(value):
+    """Normalise un nom de lieu : minuscules, sans accents ni ponctuation, 'st' développé."""
+    value = unicodedata.normalize('NFKD', value or '')
+    value = ''.join(char for char in value if not unicodedata.combining(char)).lower()
+    value = ' '.join(re.findall(r'[a-z0-9]+', value))
+    return re.sub(r'\b(st|ste)\b', lambda match: 'saint' if match.group(1) == 'st' else 'sainte', value)
+
+
+def gazetteer_lookup(city, address=None):
+    """
+    Coordonnées d'une ville d'après le gazetteer hors ligne
+
+    La ville est cherchée telle quelle, puis dans l'adresse
+    (ex. « 12 rue de la Paix, 69002 Lyon »).
+    """
+    name = normalize_place(city)
+    if name in GAZETTEER:
+        return GAZETTEER[name]
+
+    # Arrondissements et cedex : « Paris 11e », « Lyon Cedex 03 »
+    words = name.split()
+    for size in range(len(words), 0, -1):
+        if ' '.join(words[:size]) in GAZETTEER:
+            return GAZETTEER[' '.join(words[:size])]
+
+    # Dernier recours : la ville la plus longue citée dans l'adresse
+    text = f' {normalize_place(address)} '
+    matches = [place for place in GAZETTEER if f' {place} ' in text]
+    if matches:
+        return GAZETTEER[max(matches, key=len)]
+    return None
+
+
+def geocode(city, address=None):
+    """
+    Géocode une ville (et éventuellement une adresse)
+
+    Les résultats, y compris les échecs, sont conservés dans GeocodeCache :
+    une entrée corrigée à la main y prend le pas sur le gazetteer.
+
+    Returns:
+        Tuple (latitude, longitude) ou None
+    """
+    from .models import GeocodeCache
+
+    query = normalize_place(f'{address or ""} {city or ""}')[:255]
+    if not query:
+        return None
+
+    entry = GeocodeCache.objects.filter(query=query).first()
+    if entry is None:
+        coordinates = gazetteer_lookup(city, address)
+        latitude, longitude = coordinates or (None, None)
+        entry, _ = GeocodeCache.objects.get_or_create(
+            query=query,
+            defaults={'latitude': latitude, 'longitude': longitude, 'source': 'gazetteer'}
+        )
+
+    if entry.latitude is None or entry.longitude is None:
+        return None
+    return entry.latitude, entry.longitude
+
+
+def geocode_many(places):
+    """
+    Géocode un lot de lieux en deux requêtes (lecture du cache, insertion des manquants)
+
+    Args:
+        places: Itérable de couples (ville, adresse)
+
+    Returns:
+        dict {(ville, adresse): (latitude, longitude) ou None}
+    """
+    from .models import GeocodeCache
+
+    queries = {place: normalize_place(f'{place[1] or ""} {place[0] or ""}')[:255] for place in set(places)}
+    entries = {
+        entry.query: entry
+        for entry in GeocodeCache.objects.filter(query__in=[query for query in queries.values() if query])
+    }
+
+    missing = {}
+    for (city, address), query in queries.items():
+        if query and query not in entries and query not in missing:
+            latitude, longitude = gazetteer_lookup(city, address) or (None, None)
+            missing[query] = GeocodeCache(query=query, latitude=latitude, longitude=longitude, source='gazetteer')
+    GeocodeCache.objects.bulk_create(missing.values(), ignore_conflicts=True)
+    entries.update(missing)
+
+    results = {}
+    for place, query in queries.items():
+        entry = entries.get(query)
+        if entry is None or entry.latitude is None or entry.longitude is None:
+            results[place] = None
+        else:
+            results[place] = (entry.latitude, entry.longitude)
+    return results
+
+
+def assign_coordinates_bulk(instances):
+    """Renseigne les coordonnées d'un lot d'offres ou d'utilisateurs (voir geocode_many)."""
+    coordinates = geocode_many((instance.city, instance.address) for instance in instances)
+    for instance in instances:
+        position = coordinates[(instance.city, instance.address)]
+        if position:
+            instance.latitude, instance.longitude = position
+            instance.geohash = geohash_encode(*position)
+        else:
+            instance.latitude = instance.longitude = instance.geohash = None
+
+
+def assign_coordinates(instance, update_fields=None):
+    """
+    Renseigne latitude, longitude et geohash d'une offre ou d'un utilisateur
+    à partir de sa ville et de son adresse
+
+    Args:
+        instance: Job ou User
+        update_fields: update_fields passés à save(), le cas échéant
+
+    Returns:
+        Liste des champs de coordonnées à ajouter à update_fields
+    """
+    if update_fields is not None and not {'city', 'address'} & set(update_fields):
+        return []
+
+    # Ville et adresse lues en base et inchangées : position conservée, même
+    # absente (lieu inconnu du géocodage)
+    loaded_values = getattr(instance, '_loaded_values', {})
+    if instance.pk and all(
+        field in loaded_values and loaded_values[field] == getattr(instance, field) for field in ('city', 'address')
+    ):
+        return []
+
+    set_coordinates(instance)
+    return ['latitude', 'longitude', 'geohash']
+
+
+def set_coordinates(instance):
+    """Géocode la ville et l'adresse d'une offre ou d'un utilisateur (voir geocode)."""
+    coordinates = geocode(instance.city, instance.address)
+    if coordinates:
+        instance.latitude, instance.longitude = coordinates
+        instance.geohash = geohash_encode(*coordinates)
+    else:
+        instance.latitude = instance.longitude = instance.geohash = None
+
+
+def geohash_encode(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Encode une position en geohash (base 32, bits de longitude et latitude entrelacés)."""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+
+    while len(chars) < precision:
+        interval, coordinate = (lng_range, longitude) if even else (lat_range, latitude)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(GEOHASH_ALPHABET[value])
+            bits, value = 0, 0
+
+    return ''.join(chars)
+
+
+def geohash_cell_size(precision):
+    """Hauteur et largeur (en degrés) d'une cellule geohash."""
+    bits = 5 * precision
+    lat_bits = bits // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << (bits - lat_bits))
+
+
+def geohash_cover(latitude, longitude, radius_km):
+    """
+    Préfixes geohash couvrant un cercle de rayon radius_km
+
+    La précision retenue est la plus fine dont les cellules mesurent au moins
+    le rayon : la cellule du centre et ses 8 voisines couvrent alors le cercle.
+
+    Returns:
+        Liste de préfixes, ou None si le cercle est trop grand pour être couvert
+    """
+    lat_scale = max(math.cos(math.radians(latitude)), 1e-6)
+
+    precision = 0
+    for candidate in range(1, GEOHASH_PRECISION + 1):
+        height, width = geohash_cell_size(candidate)
+        if height * KM_PER_DEGREE < radius_km or width * KM_PER_DEGREE * lat_scale < radius_km:
+            break
+        precision = candidate
+    if not precision:
+        return None
+
+    height, width = geohash_cell_size(precision)
+    prefixes = set()
+    for dlat in (-height, 0, height):
+        for dlng in (-width, 0, width):
+            lat = min(max(latitude + dlat, -90.0), 90.0 - 1e-9)
+            lng = (longitude + dlng + 180.0) % 360.0 - 180.0
+            prefixes.add(geohash_encode(lat, lng, precision))
+    return sorted(prefixes)
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """Distance orthodromique en kilomètres entre deux positions."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (
+        math.sin((phi2 - phi1) / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def haversine_expression(latitude, longitude):
+    """Expression SQL de la distance (km) entre la position d'une ligne et un point."""
+    lat = Value(math.radians(latitude), output_field=FloatField())
+    lng = Value(math.radians(longitude), output_field=FloatField())
+    half_dlat = (Radians('latitude') - lat) / 2
+    half_dlng = (Radians('longitude') - lng) / 2
+    a = Power(Sin(half_dlat), 2) + Cos(lat) * Cos(Radians('latitude')) * Power(Sin(half_dlng), 2)
+    return Value(2 * EARTH_RADIUS_KM) * ASin(Least(Sqrt(a), Value(1.0)))
+
+
+def filter_within_radius(queryset, latitude, longitude, radius_km):
+    """
+    Restreint un queryset (Job ou User) aux positions situées à moins de radius_km
+
+    Les préfixes geohash (index B-tree, collation C) puis la boîte englobante, corrigée du
+    rétrécissement des longitudes avec la latitude, écartent l'essentiel des
+    lignes avant le calcul exact de la distance (annotation `distance`, en km).
+    Le résultat est trié par distance croissante.
+    """
+    prefixes = geohash_cover(latitude, longitude, radius_km)
+    if prefixes:
+        # Une plage [préfixe, préfixe suivant) par cellule : chacune est une
+        # condition d'index (BitmapOr), contrairement à des LIKE combinés par OR
+        prefix_filter = Q()
+        for prefix in prefixes:
+            upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+            prefix_filter |= Q(geohash__gte=prefix, geohash__lt=upper)
+        queryset = queryset.filter(prefix_filter)
+
+    delta_lat = radius_km / KM_PER_DEGREE
+    queryset = queryset.filter(latitude__gte=latitude - delta_lat, latitude__lte=latitude + delta_lat)
+
+    lat_scale = math.cos(math.radians(min(abs(latitude) + delta_lat, 90.0)))
+    if lat_scale > 1e-6:
+        delta_lng = radius_km / (KM_PER_DEGREE * lat_scale)
+        if delta_lng < 180.0:
+            queryset = queryset.filter(longitude__gte=longitude - delta_lng, longitude__lte=longitude + delta_lng)
+
+    return queryset.annotate(
+        distance=haversine_expression(latitude, longitude)
+    ).filter(distance__lte=radius_km).order_by('distance', 'pk')
+
+
+def backfill_coordinates(model, batch_size=500):
+    """
+    Géocode les lignes d'un modèle (Job ou User) dont la position manque
+
+    Returns:
+        Nombre de lignes géocodées
+    """
+    queryset = model.objects.filter(latitude__isnull=True).exclude(city__isnull=True).exclude(city='')
+    updated = 0
+    batch = []
+    for instance in queryset.only('pk', 'city', 'address', 'latitude').iterator(chunk_size=batch_size):
+        set_coordinates(instance)
+        if instance.latitude is None:
+            continue
+        batch.append(instance)
+        if len(batch) >= batch_size:
+            updated += model.objects.bulk_update(batch, ['latitude', 'longitude', 'geohash'])
+            batch = []
+    if batch:
+        updated += model.objects.bulk_update(batch, ['latitude', 'longitude', 'geohash'])
+    return updated
@@ -0,0 +1,93 @@
+# hyperloglog.py
+
+import hashlib
+import math
+
+# 2^12 registres d'un octet : erreur type 1,04 / sqrt(4096) ≈ 1,6 %
+PRECISION = 12
+REGISTER_COUNT = 1 << PRECISION
+# Bits du hachage (64 bits) restant après l'index du registre
+_VALUE_BITS = 64 - PRECISION
+
+# Encodage : dense (un octet par registre) ou creux (index sur 2 octets, valeur sur 1),
+# le plus court des deux
+_DENSE, _SPARSE = b'D', b'S'
+
+
+def hash_value(value):
+    """Hachage 64 bits stable entre processus (contrairement à hash())."""
+    digest = hashlib.blake2b(str(value).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+
+class HyperLogLog:
+    """
+    Esquisse HyperLogLog (p = 12) : estimation du nombre d'éléments distincts
+    d'un ensemble en 4 Ko au plus, quel que soit son cardinal
+
+    Deux esquisses se fusionnent par maximum registre à registre : l'esquisse
+    de plusieurs jours est la fusion des esquisses journalières.
+    """
+
+    __slots__ = ('registers',)
+
+    def __init__(self, registers=None):
+        self.registers = bytearray(registers) if registers is not None else bytearray(REGISTER_COUNT)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Esquisse encodée par to_bytes (vide si data est vide)."""
+        data = bytes(data or b'')
+        if not data:
+            return cls()
+        if data[:1] == _DENSE:
+            return cls(data[1:])
+
+        sketch = cls()
+        for offset in range(1, len(data), 3):
+            index = int.from_bytes(data[offset:offset + 2], 'big')
+            sketch.registers[index] = data[offset + 2]
+        return sketch
+
+    def to_bytes(self):
+        used = [(index, rank) for index, rank in enumerate(self.registers) if rank]
+        if 3 * len(used) >= REGISTER_COUNT:
+            return _DENSE + bytes(self.registers)
+        return _SPARSE + b''.join(index.to_bytes(2, 'big') + bytes((rank,)) for index, rank in used)
+
+    @staticmethod
+    def observation(value):
+        """
+        Registre et rang d'un élément (position du premier bit à 1 des bits restants)
+
+        Returns:
+            Tuple (index, rang)
+        """
+        hashed = hash_value(value)
+        index = hashed >> _VALUE_BITS
+        remainder = hashed & ((1 << _VALUE_BITS) - 1)
+        return index, _VALUE_BITS - remainder.bit_length() + 1
+
+    def add(self, value):
+        self.add_observation(*self.observation(value))
+
+    def add_observation(self, index, rank):
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other):
+        """Fusionne une autre esquisse dans celle-ci (union des ensembles)."""
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def count(self):
+        """Estimation du nombre d'éléments distincts (correction des petits cardinaux)."""
+        m = REGISTER_COUNT
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -rank for rank in self.registers)
+
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Comptage linéaire, plus précis lorsque des registres sont encore vides
+            estimate = m * math.log(m / zeros)
+        return round(estimate)
@@ -0,0 +1,117 @@
+# lifecycle.py
+
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from .counts import invalidate_job_counts
+from .dashboard import invalidate_employer_dashboard
+from .employer_counters import jobs_closed
+from .facets import invalidate_job_facets
+from .feed_cache import invalidate_job_feed
+from .models import JOB_FLAG_BITS, Job, JobBoost
+from .ranking import refresh_rank_scores
+from .suggestions import apply_jobs_suggestions
+
+
+def _invalidate_listings():
+    invalidate_job_counts()
+    invalidate_job_facets()
+    invalidate_job_feed()
+
+
+def close_expired_jobs(batch_size=None, now=None):
+    """
+    Clôture les offres actives dont la date d'expiration est passée
+
+    Traitement par lots (index status, expires_at), chacun dans sa propre
+    transaction : une interruption ne perd rien et une nouvelle exécution
+    reprend là où la précédente s'est arrêtée. Les lignes verrouillées par un
+    autre balayage en cours sont ignorées (SKIP LOCKED).
+
+    Returns:
+        int: Nombre d'offres clôturées
+    """
+    batch_size = batch_size or settings.JOB_SWEEP_BATCH_SIZE
+    now = now or timezone.now()
+    closed = 0
+
+    while True:
+        with transaction.atomic():
+            jobs = list(
+                Job.objects.filter(status='active', expires_at__lte=now)
+                .select_for_update(skip_locked=True, of=('self',))
+                .select_related('employer')
+                .only('id', 'employer_id', 'status', 'title', 'city', 'company', 'employer__company_name')
+                .order_by('expires_at', 'id')[:batch_size]
+            )
+            if not jobs:
+                break
+
+            Job.objects.filter(pk__in=[job.pk for job in jobs]).update(
+                status='closed', updated_at=now, version=F('version') + 1
+            )
+            # Retirer les offres clôturées des suggestions d'autocomplétion
+            apply_jobs_suggestions(jobs, delta=-1)
+            jobs_closed(jobs)
+            invalidate_employer_dashboard(*(job.employer_id for job in jobs))
+
+        closed += len(jobs)
+        if len(jobs) < batch_size:
+            break
+
+    if closed:
+        _invalidate_listings()
+    return closed
+
+
+def expire_new_flags(max_age_days=None, batch_size=None, now=None):
+    """
+    Retire le badge « nouveau » des offres publiées depuis plus de max_age_days jours,
+    sauf si un boost « nouveau » est en cours
+
+    Returns:
+        int: Nombre d'offres mises à jour
+    """
+    max_age_days = settings.JOB_NEW_MAX_AGE_DAYS if max_age_days is None else max_age_days
+    batch_size = batch_size or settings.JOB_SWEEP_BATCH_SIZE
+    now = now or timezone.now()
+
+    boosted = JobBoost.objects.filter(
+        type='new', is_active=True, starts_at__lte=now, expires_at__gt=now
+    ).values('job_id')
+    candidates = (
+        Job.objects.filter(is_new=True, created_at__lt=now - timedelta(days=max_age_days))
+        .exclude(pk__in=boosted)
+        .order_by('id')
+    )
+
+    updated = 0
+    while True:
+        ids = list(candidates.values_list('id', flat=True)[:batch_size])
+        if not ids:
+            break
+        # Le masque Job.flags suit le champ is_new
+        updated += Job.objects.filter(pk__in=ids, is_new=True).update(
+            is_new=False,
+            flags=F('flags').bitand(~JOB_FLAG_BITS['is_new']),
+            updated_at=now,
+            version=F('version') + 1,
+        )
+        if len(ids) < batch_size:
+            break
+
+    if updated:
+        _invalidate_listings()
+    return updated
+
+
+def sweep_jobs(batch_size=None):
+    """Balayage complet du cycle de vie des offres (commande et tâche planifiée)."""
+    return {
+        'closed': close_expired_jobs(batch_size=batch_size),
+        'new_expired': expire_new_flags(batch_size=batch_size),
+        # Décroissance de la fraîcheur, boosts commencés ou terminés
+        'ranked': refresh_rank_scores(batch_size=batch_size),
+    }
@@ -0,0 +1,58 @@
+import json
+import timeit
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+from rest_framework.request import Request
+from api.fragments import serialize_jobs
+from api.models import Job
+from api.renderers import EnvelopeJSONRenderer, orjson
+from api.serializers import with_job_relations
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare le rendu JSON d'une page d'offres : JSONRenderer suivi de la réécriture "
+        "d'APIResponseMiddleware, JSONRenderer seul, et EnvelopeJSONRenderer"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, default=100, help="Nombre d'offres de la page")
+        parser.add_argument('--repeat', type=int, default=200)
+
+    def handle(self, *args, **options):
+        size = options['size']
+        jobs = list(with_job_relations(Job.objects.order_by('-id'))[:size])
+        if not jobs:
+            raise CommandError("Aucune offre en base")
+        # Compléter la page en répétant les offres disponibles
+        jobs = (jobs * (size // len(jobs) + 1))[:size]
+
+        request = Request(APIRequestFactory().get('/api/jobs/'))
+        data = {
+            'status': 'success',
+            'data': {
+                'data': serialize_jobs(jobs, {'request': request}),
+                'meta': {'current_page': 1, 'last_page': 1, 'per_page': size, 'total': size},
+            },
+        }
+
+        def middleware_pass():
+            body = JSONRenderer().render(data)
+            content = json.loads(body.decode('utf-8'))
+            return json.dumps(content).encode('utf-8')
+
+        renderers = [
+            ("JSONRenderer + APIResponseMiddleware", middleware_pass),
+            ("JSONRenderer", lambda: JSONRenderer().render(data)),
+            ("EnvelopeJSONRenderer", lambda: EnvelopeJSONRenderer().render(data)),
+        ]
+
+        size_kb = len(EnvelopeJSONRenderer().render(data)) / 1024
+        self.stdout.write(f"Page de {size} offres, {size_kb:.0f} Ko, orjson {'présent' if orjson else 'absent'}")
+
+        baseline = None
+        for name, render in renderers:
+            seconds = min(timeit.repeat(render, number=options['repeat'], repeat=3)) / options['repeat']
+            baseline = baseline or seconds
+            self.stdout.write(f"{name:<40} {seconds * 1000:8.3f} ms  x{baseline / seconds:.1f}")
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from api.rollups import compact_job_stat_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Supprime les statistiques agrégées horaires et journalières au-delà de leur "
+        "durée de conservation (JOB_STATS_HOURLY_RETENTION_DAYS, JOB_STATS_DAILY_RETENTION_DAYS)"
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None)
+    
+    def handle(self, *args, **options):
+        deleted = compact_job_stat_rollups(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"{deleted} période(s) expirée(s) supprimée(s)"))
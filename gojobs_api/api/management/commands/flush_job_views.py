@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from api.view_buffer import flush_job_views, view_buffer_enabled
+
+
+class Command(BaseCommand):
+    help = (
+        "Reporte en base les vues d'offres cumulées dans le cache (compteurs des offres "
+        "et des employeurs, statistiques journalières)"
+    )
+    
+    def handle(self, *args, **options):
+        if not view_buffer_enabled():
+            self.stdout.write(self.style.WARNING(
+                "Tampon désactivé (cache propre à chaque processus) : les vues sont écrites directement"
+            ))
+        applied = flush_job_views()
+        self.stdout.write(self.style.SUCCESS(f"{applied} vue(s) reportée(s)"))
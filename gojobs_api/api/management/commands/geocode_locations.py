@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from api.geo import backfill_coordinates
+from api.models import Job, User
+
+
+class Command(BaseCommand):
+    help = "Géocode les offres et les utilisateurs sans coordonnées à partir de leur ville et de leur adresse"
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+    
+    def handle(self, *args, **options):
+        for model in (Job, User):
+            count = backfill_coordinates(model, batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f"{model._meta.verbose_name_plural} : {count} géocodé(e)s"))
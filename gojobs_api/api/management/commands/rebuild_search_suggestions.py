@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from api.suggestions import rebuild_suggestions
+
+
+class Command(BaseCommand):
+    help = "Reconstruit la table des suggestions d'autocomplétion à partir des offres actives"
+    
+    def handle(self, *args, **options):
+        count = rebuild_suggestions()
+        self.stdout.write(self.style.SUCCESS(f"{count} suggestions reconstruites"))
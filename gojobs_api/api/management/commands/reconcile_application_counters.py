@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from api.counters import reconcile_application_counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcule à partir des candidatures le nombre de candidatures et le taux de conversion "
+        "des offres, les candidats des emplois flash et les statistiques journalières"
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+    
+    def handle(self, *args, **options):
+        repaired = reconcile_application_counters(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"{repaired['jobs']} offre(s), {repaired['flash_jobs']} emploi(s) flash et "
+            f"{repaired['statistics']} statistique(s) journalière(s) corrigé(e)s"
+        ))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from api.employer_counters import reconcile_employer_counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcule les compteurs des employeurs (offres, offres actives, candidatures, "
+        "candidatures non lues, vues) et corrige les écarts"
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--employer', type=int, action='append', dest='employers',
+                            help="Identifiant d'un employeur (répétable), tous par défaut")
+        parser.add_argument('--batch-size', type=int, default=500)
+    
+    def handle(self, *args, **options):
+        checked, repaired = reconcile_employer_counters(
+            employer_ids=options['employers'],
+            batch_size=options['batch_size']
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"{checked} employeur(s) vérifié(s), {repaired} compteur(s) corrigé(s) ou créé(s)"
+        ))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from api.lifecycle import close_expired_jobs, expire_new_flags
+from api.ranking import refresh_rank_scores
+
+
+class Command(BaseCommand):
+    help = (
+        "Clôture les offres expirées, retire le badge « nouveau » des offres anciennes "
+        "et recalcule le score de classement des offres actives"
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument('--new-max-age-days', type=int, default=None)
+    
+    def handle(self, *args, **options):
+        closed = close_expired_jobs(batch_size=options['batch_size'])
+        new_expired = expire_new_flags(
+            max_age_days=options['new_max_age_days'],
+            batch_size=options['batch_size']
+        )
+        ranked = refresh_rank_scores(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"{closed} offre(s) clôturée(s), {new_expired} badge(s) « nouveau » retiré(s), "
+            f"{ranked} score(s) recalculé(s)"
+        ))
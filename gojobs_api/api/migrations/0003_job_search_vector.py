@@ -0,0 +1,35 @@
+# Generated by Django 5.2 on 2026-10-18 13:55
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import UnaccentExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_subscriptionplan_alter_subscription_options_and_more'),
+    ]
+
+    operations = [
+        UnaccentExtension(),
+        # Configuration française insensible aux accents pour le vecteur de recherche
+        migrations.RunSQL(
+            sql=[
+                "CREATE TEXT SEARCH CONFIGURATION french_unaccent (COPY = pg_catalog.french)",
+                "ALTER TEXT SEARCH CONFIGURATION french_unaccent "
+                "ALTER MAPPING FOR hword, hword_part, word WITH unaccent, french_stem",
+            ],
+            reverse_sql="DROP TEXT SEARCH CONFIGURATION IF EXISTS french_unaccent",
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.SearchVector('title', config='french_unaccent', weight='A'), '||', django.contrib.postgres.search.SearchVector('company', config='french_unaccent', weight='B'), django.contrib.postgres.search.SearchConfig('french_unaccent')), '||', django.contrib.postgres.search.SearchVector('city', config='french_unaccent', weight='B'), django.contrib.postgres.search.SearchConfig('french_unaccent')), '||', django.contrib.postgres.search.SearchVector('description', config='french_unaccent', weight='C'), django.contrib.postgres.search.SearchConfig('french_unaccent')), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='job_search_vector_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2 on 2026-10-18 13:57
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_job_search_vector'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.CreateModel(
+            name='SearchSuggestion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('title', 'Intitulé'), ('city', 'Ville'), ('company', 'Entreprise')], max_length=10, verbose_name='type')),
+                ('value', models.CharField(max_length=255, verbose_name='libellé')),
+                ('normalized', models.CharField(max_length=255, verbose_name='libellé normalisé')),
+                ('job_count', models.IntegerField(default=0, verbose_name="nombre d'offres actives")),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='mis à jour le')),
+            ],
+            options={
+                'verbose_name': 'suggestion de recherche',
+                'verbose_name_plural': 'suggestions de recherche',
+                'ordering': ['-job_count'],
+                'indexes': [models.Index(fields=['normalized'], name='suggestion_prefix_idx', opclasses=['varchar_pattern_ops']), django.contrib.postgres.indexes.GinIndex(fields=['normalized'], name='suggestion_trgm_idx', opclasses=['gin_trgm_ops'])],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'normalized'), name='unique_search_suggestion')],
+            },
+        ),
+    ]
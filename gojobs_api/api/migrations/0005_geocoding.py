@@ -0,0 +1,67 @@
+# Generated by Django 5.2 on 2026-10-18 14:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_searchsuggestion'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeocodeCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('query', models.CharField(max_length=255, unique=True, verbose_name='lieu normalisé')),
+                ('latitude', models.FloatField(blank=True, null=True, verbose_name='latitude')),
+                ('longitude', models.FloatField(blank=True, null=True, verbose_name='longitude')),
+                ('source', models.CharField(choices=[('gazetteer', 'Gazetteer'), ('manual', 'Manuel')], default='gazetteer', max_length=20, verbose_name='source')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='créé le')),
+            ],
+            options={
+                'verbose_name': 'lieu géocodé',
+                'verbose_name_plural': 'lieux géocodés',
+            },
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='geohash',
+            field=models.CharField(blank=True, db_collation='C', max_length=12, null=True, verbose_name='geohash'),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True, verbose_name='latitude'),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True, verbose_name='longitude'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='geohash',
+            field=models.CharField(blank=True, db_collation='C', max_length=12, null=True, verbose_name='geohash'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True, verbose_name='latitude'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True, verbose_name='longitude'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['geohash'], name='job_geohash_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['geohash'], name='user_geohash_idx'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2 on 2026-10-18 14:04
+
+from django.db import migrations, models
+
+# Copie figée de api.models.JOB_FLAG_FIELDS au moment de la migration
+JOB_FLAG_FIELDS = (
+    'accepts_working_visa',
+    'accepts_holiday_visa',
+    'accepts_student_visa',
+    'has_accommodation',
+    'accommodation_accepts_children',
+    'accommodation_accepts_dogs',
+    'accommodation_is_accessible',
+    'job_accepts_handicapped',
+    'has_company_car',
+    'is_entry_level',
+    'requires_driving_license',
+    'is_urgent',
+    'is_new',
+    'is_top',
+)
+
+
+def fill_job_flags(apps, schema_editor):
+    Job = apps.get_model('api', 'Job')
+    flags = sum(
+        models.Case(
+            models.When(**{field: True}, then=models.Value(1 << position)),
+            default=models.Value(0),
+        )
+        for position, field in enumerate(JOB_FLAG_FIELDS)
+    )
+    Job.objects.update(flags=flags)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_geocoding'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='flags',
+            field=models.IntegerField(default=0, verbose_name='critères'),
+        ),
+        migrations.RunPython(fill_job_flags, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['status', 'flags'], name='job_status_flags_idx'),
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.2 on 2026-10-18 14:07
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_job_flags'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notification',
+            name='type',
+            field=models.CharField(choices=[('new_application', 'Nouvelle candidature'), ('application_status', 'Statut de candidature'), ('new_message', 'Nouveau message'), ('flash_job', 'Emploi flash'), ('new_contract', 'Nouveau contrat'), ('signed_contract', 'Contrat signé'), ('subscription', 'Abonnement'), ('payment', 'Paiement'), ('saved_search', 'Recherche sauvegardée')], max_length=30, verbose_name='type'),
+        ),
+        migrations.CreateModel(
+            name='SavedSearch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, max_length=100, verbose_name='nom')),
+                ('filters', models.JSONField(default=dict, verbose_name='critères')),
+                ('predicate_count', models.PositiveSmallIntegerField(default=0, verbose_name='nombre de prédicats')),
+                ('notify', models.BooleanField(default=True, verbose_name='notifier les nouvelles offres')),
+                ('last_seen_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='consultée le')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='créée le')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saved_searches', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'recherche sauvegardée',
+                'verbose_name_plural': 'recherches sauvegardées',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SavedSearchMatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('matched_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='trouvée le')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saved_search_matches', to='api.job')),
+                ('saved_search', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='matches', to='api.savedsearch')),
+            ],
+            options={
+                'verbose_name': 'résultat de recherche sauvegardée',
+                'verbose_name_plural': 'résultats de recherches sauvegardées',
+                'ordering': ['-matched_at'],
+                'indexes': [models.Index(fields=['saved_search', 'matched_at'], name='saved_search_match_idx')],
+                'constraints': [models.UniqueConstraint(fields=('saved_search', 'job'), name='unique_saved_search_match')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SavedSearchPredicate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field', models.CharField(max_length=30, verbose_name='critère')),
+                ('value', models.CharField(max_length=255, verbose_name='valeur')),
+                ('saved_search', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='predicates', to='api.savedsearch')),
+            ],
+            options={
+                'verbose_name': 'prédicat de recherche',
+                'verbose_name_plural': 'prédicats de recherche',
+                'indexes': [models.Index(fields=['field', 'value', 'saved_search'], name='saved_search_posting_idx')],
+            },
+        ),
+    ]
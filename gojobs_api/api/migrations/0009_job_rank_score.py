@@ -0,0 +1,55 @@
+# Generated by Django 5.2 on 2026-10-18 14:11
+
+import math
+from django.db import migrations, models
+from django.db.models import Case, FloatField, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce, Exp, Extract, Floor, Greatest
+from django.utils import timezone
+
+
+def fill_rank_scores(apps, schema_editor):
+    # Copie figée du score de api/ranking.py à la date de la migration
+    Job = apps.get_model('api', 'Job')
+    JobBoost = apps.get_model('api', 'JobBoost')
+    now = timezone.now()
+    tier_weights = {'top': 1000.0, 'urgent': 500.0, 'new': 200.0}
+    active_tier = Subquery(
+        JobBoost.objects.filter(
+            job=OuterRef('pk'), is_active=True, starts_at__lte=now, expires_at__gt=now
+        ).annotate(
+            weight=Case(
+                *[When(type=boost_type, then=Value(weight)) for boost_type, weight in tier_weights.items()],
+                default=Value(0.0),
+                output_field=FloatField(),
+            )
+        ).order_by('-weight').values('weight')[:1],
+        output_field=FloatField(),
+    )
+    urgency = Case(When(is_urgent=True, then=Value(100.0)), default=Value(0.0), output_field=FloatField())
+    decay_rate = math.log(2) / (3 * 86400)
+    # Âge par paliers de 6 heures, comme à l'exécution
+    step = 6 * 60 * 60.0
+    age = Value(now.timestamp()) - Extract('created_at', 'epoch', output_field=FloatField())
+    age_seconds = Floor(age / Value(step)) * Value(step)
+    fresh = Value(100.0) * Exp(Greatest(Value(-decay_rate) * age_seconds, Value(-50.0)), output_field=FloatField())
+    Job.objects.update(rank_score=Coalesce(active_tier, Value(0.0)) + urgency + fresh)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_job_lifecycle_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='rank_score',
+            field=models.FloatField(default=0, verbose_name='score de classement'),
+        ),
+        migrations.RunPython(fill_rank_scores, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['status', '-rank_score', '-id'], name='job_feed_rank_idx'),
+        ),
+    ]
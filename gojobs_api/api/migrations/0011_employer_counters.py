@@ -0,0 +1,32 @@
+# Generated by Django 5.2 on 2026-10-18 14:28
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_job_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmployerCounters',
+            fields=[
+                ('employer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='counters', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('total_jobs', models.IntegerField(default=0, verbose_name="nombre d'offres")),
+                ('active_jobs', models.IntegerField(default=0, verbose_name='offres actives')),
+                ('total_applications', models.IntegerField(default=0, verbose_name='nombre de candidatures')),
+                ('unread_applications', models.IntegerField(default=0, verbose_name='candidatures non lues')),
+                ('total_views', models.BigIntegerField(default=0, verbose_name='nombre de vues')),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='mis à jour le')),
+            ],
+            options={
+                'verbose_name': 'compteurs employeur',
+                'verbose_name_plural': 'compteurs employeurs',
+            },
+        ),
+    ]
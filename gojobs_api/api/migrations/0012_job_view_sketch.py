@@ -0,0 +1,29 @@
+# Generated by Django 5.2 on 2026-10-18 14:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_employer_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobViewSketch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='date')),
+                ('sketch', models.BinaryField(verbose_name='esquisse')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='mis à jour le')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='view_sketches', to='api.job')),
+            ],
+            options={
+                'verbose_name': 'visiteurs distincts',
+                'verbose_name_plural': 'visiteurs distincts',
+                'constraints': [models.UniqueConstraint(fields=('job', 'date'), name='unique_job_date_view_sketch')],
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2 on 2026-10-18 14:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_job_view_sketch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobStatRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('hour', 'Heure'), ('day', 'Jour'), ('month', 'Mois')], max_length=5, verbose_name='granularité')),
+                ('bucket', models.DateTimeField(verbose_name='période')),
+                ('views', models.IntegerField(default=0, verbose_name='vues')),
+                ('applications', models.IntegerField(default=0, verbose_name='candidatures')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stat_rollups', to='api.job')),
+            ],
+            options={
+                'verbose_name': 'statistiques agrégées',
+                'verbose_name_plural': 'statistiques agrégées',
+                'indexes': [models.Index(fields=['granularity', 'bucket'], name='stat_rollup_expiry_idx')],
+                'constraints': [models.UniqueConstraint(fields=('job', 'granularity', 'bucket'), name='unique_job_stat_rollup')],
+            },
+        ),
+        # Jours et mois repris des statistiques journalières existantes
+        migrations.RunSQL(
+            sql=[
+                "INSERT INTO api_jobstatrollup (job_id, granularity, bucket, views, applications) "
+                "SELECT job_id, 'day', date::timestamp AT TIME ZONE 'UTC', views, applications "
+                "FROM api_statistic",
+                "INSERT INTO api_jobstatrollup (job_id, granularity, bucket, views, applications) "
+                "SELECT job_id, 'month', date_trunc('month', date::timestamp) AT TIME ZONE 'UTC', "
+                "SUM(views), SUM(applications) "
+                "FROM api_statistic GROUP BY job_id, date_trunc('month', date::timestamp)",
+            ],
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
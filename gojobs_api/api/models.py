@@ -2,14 +2,40 @@ import re
 from django.db import models
 
 # Create your models here.
-from django.db import models
+from django.db import DatabaseError, models, transaction
 from django.contrib.auth.models import AbstractUser, BaseUserManager
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.forms import ValidationError
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone 
 from datetime import timedelta
 
 
+# Configuration PostgreSQL de recherche plein texte (français + unaccent),
+# créée par la migration 0003_job_search_vector
+JOB_SEARCH_CONFIG = 'french_unaccent'
+
+# Critères booléens des offres, regroupés dans le masque Job.flags (bit i = 1 << i).
+# L'ordre fixe la position des bits : ajouter en fin de liste, ne jamais réordonner.
+JOB_FLAG_FIELDS = (
+    'accepts_working_visa',
+    'accepts_holiday_visa',
+    'accepts_student_visa',
+    'has_accommodation',
+    'accommodation_accepts_children',
+    'accommodation_accepts_dogs',
+    'accommodation_is_accessible',
+    'job_accepts_handicapped',
+    'has_company_car',
+    'is_entry_level',
+    'requires_driving_license',
+    'is_urgent',
+    'is_new',
+    'is_top',
+)
+JOB_FLAG_BITS = {field: 1 << position for position, field in enumerate(JOB_FLAG_FIELDS)}
+
 class UserManager(BaseUserManager):
     """Manager personnalisé pour le modèle User."""
     
@@ -73,6 +99,12 @@ class User(AbstractUser):
     company_size = models.CharField(_('taille de l\'entreprise'), max_length=50, blank=True, null=True)
     company_industry = models.CharField(_('secteur de l\'entreprise'), max_length=100, blank=True, null=True)
     
+    # Position géocodée à partir de la ville / de l'adresse (voir api/geo.py)
+    latitude = models.FloatField(_('latitude'), blank=True, null=True)
+    longitude = models.FloatField(_('longitude'), blank=True, null=True)
+    # Collation C : les plages de préfixes geohash suivent l'ordre binaire
+    geohash = models.CharField(_('geohash'), max_length=12, blank=True, null=True, db_collation='C')
+    
     # Champs pour l'authentification
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['first_name', 'last_name']
@@ -82,10 +114,43 @@ class User(AbstractUser):
     class Meta:
         verbose_name = _('utilisateur')
         verbose_name_plural = _('utilisateurs')
+        indexes = [
+            models.Index(fields=['geohash'], name='user_geohash_idx'),
+        ]
     
     def __str__(self):
         return self.email
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Conserver les valeurs chargées pour détecter les changements à l'enregistrement
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+    
+    def get_loaded_value(self, attname):
+        """Valeur d'un champ telle qu'enregistrée en base (valeur courante si elle n'a pas été chargée)."""
+        loaded_values = getattr(self, '_loaded_values', {})
+        if attname in loaded_values:
+            return loaded_values[attname]
+        return self.__dict__.get(attname)
+    
+    def save(self, *args, **kwargs):
+        # Géocoder le candidat lorsque sa ville ou son adresse change
+        from .geo import assign_coordinates
+        update_fields = kwargs.get('update_fields')
+        geo_fields = assign_coordinates(self, update_fields)
+        if update_fields is not None and geo_fields:
+            kwargs['update_fields'] = set(update_fields) | set(geo_fields)
+        
+        super().save(*args, **kwargs)
+        
+        self._loaded_values = {
+            field.attname: self.__dict__[field.attname]
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__
+        }
+    
     @property
     def name(self):
         """Retourne le nom complet de l'utilisateur."""
@@ -166,6 +231,10 @@ class Job(models.Model):
     city = models.CharField(_('ville'), max_length=100)
     address = models.CharField(_('adresse'), max_length=255, blank=True, null=True)
     company = models.CharField(_('entreprise'), max_length=255, blank=True, null=True)
+    latitude = models.FloatField(_('latitude'), blank=True, null=True)
+    longitude = models.FloatField(_('longitude'), blank=True, null=True)
+    # Collation C : les plages de préfixes geohash suivent l'ordre binaire
+    geohash = models.CharField(_('geohash'), max_length=12, blank=True, null=True, db_collation='C')
     # Rémunération
     salary_type = models.CharField(_('type de salaire'), max_length=10, choices=SALARY_TYPE_CHOICES)
     salary_amount = models.DecimalField(_('montant du salaire'), max_digits=10, decimal_places=2, blank=True, null=True)
@@ -198,6 +267,12 @@ class Job(models.Model):
     is_new = models.BooleanField(_('nouveau'), default=True)
     is_top = models.BooleanField(_('premium'), default=False)
     status = models.CharField(_('statut'), max_length=10, choices=STATUS_CHOICES, default='active')
+    # Masque des critères booléens (JOB_FLAG_FIELDS), recalculé à chaque enregistrement
+    flags = models.IntegerField(_('critères'), default=0)
+    # Score de classement du fil (boost, urgence, fraîcheur), voir api/ranking.py
+    rank_score = models.FloatField(_('score de classement'), default=0)
+    # Version des fragments sérialisés en cache (voir api/fragments.py)
+    version = models.PositiveIntegerField(_('version'), default=1)
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(default=timezone.now)
     expires_at = models.DateTimeField(_('expire le'), blank=True, null=True)
@@ -207,6 +282,18 @@ class Job(models.Model):
     applications_count = models.IntegerField(_('nombre de candidatures'), default=0)
     conversion_rate = models.DecimalField(_('taux de conversion'), max_digits=5, decimal_places=2, default=0)
     
+    # Recherche plein texte : vecteur pondéré maintenu par PostgreSQL
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector('title', weight='A', config=JOB_SEARCH_CONFIG)
+            + SearchVector('company', weight='B', config=JOB_SEARCH_CONFIG)
+            + SearchVector('city', weight='B', config=JOB_SEARCH_CONFIG)
+            + SearchVector('description', weight='C', config=JOB_SEARCH_CONFIG)
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+    
     class Meta:
         verbose_name = _('offre d\'emploi')
         verbose_name_plural = _('offres d\'emploi')
@@ -215,21 +302,144 @@ class Job(models.Model):
             models.Index(fields=['status']),
             models.Index(fields=['category']),
             models.Index(fields=['city']),
+            # Filtres combinés sur les critères : flags & masque, lu dans l'index
+            models.Index(fields=['status', 'flags'], name='job_status_flags_idx'),
+            # Ordre par défaut du fil : (-rank_score, -id)
+            models.Index(fields=['status', '-rank_score', '-id'], name='job_feed_rank_idx'),
+            # Balayage des offres expirées (status='active' AND expires_at <= now)
+            models.Index(fields=['status', 'expires_at'], name='job_status_expires_idx'),
+            # Expiration du badge « nouveau »
+            models.Index(fields=['created_at'], name='job_is_new_created_idx', condition=models.Q(is_new=True)),
+            GinIndex(fields=['search_vector'], name='job_search_vector_idx'),
+            # Recherche par rayon : plages de préfixes geohash sur les offres actives
+            models.Index(fields=['geohash'], name='job_geohash_idx', condition=models.Q(status='active')),
         ]
     
     def __str__(self):
         return f"{self.title} à {self.city}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Conserver les valeurs chargées pour détecter les changements à l'enregistrement
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+    
+    def get_loaded_value(self, attname):
+        """
+        Retourne la valeur d'un champ telle qu'enregistrée en base avant les
+        modifications en cours (valeur courante si elle n'a pas été chargée).
+        """
+        loaded_values = getattr(self, '_loaded_values', {})
+        if attname in loaded_values:
+            return loaded_values[attname]
+        return self.__dict__.get(attname)
+    
+    def assigned_counters(self):
+        """Compteurs dont la valeur en mémoire diffère de la valeur chargée (affectation explicite)."""
+        from .feed_cache import COUNTER_FIELDS
+        return {
+            name for name in COUNTER_FIELDS
+            if name in self.__dict__ and self.__dict__[name] != self.get_loaded_value(name)
+        }
+    
     def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        extra_fields = self.prepare_save(update_fields)
+        if update_fields is not None and extra_fields:
+            kwargs['update_fields'] = set(update_fields) | set(extra_fields)
+        
+        # Les compteurs sont tenus par incréments F() (api/counters.py) : un enregistrement
+        # complet n'écrit que ceux affectés explicitement, jamais une valeur lue avant un
+        # incrément concurrent
+        untouched = set()
+        if update_fields is None and not self._state.adding:
+            from .feed_cache import COUNTER_FIELDS
+            untouched = COUNTER_FIELDS - self.assigned_counters()
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in untouched and field.attname not in deferred
+            ]
+        
+        # Compteurs de l'employeur (signal post_save) mis à jour dans la même transaction
+        try:
+            with transaction.atomic():
+                super().save(*args, **kwargs)
+        except DatabaseError:
+            # Ligne supprimée entre-temps : insertion, comme un enregistrement complet par défaut
+            if not untouched or Job.objects.filter(pk=self.pk).exists():
+                raise
+            kwargs.pop('update_fields')
+            with transaction.atomic():
+                super().save(*args, force_insert=True, **kwargs)
+        
+        # Les signaux post_save ont vu l'état précédent : suivre désormais l'état enregistré
+        self._loaded_values = {
+            field.attname: self.__dict__[field.attname]
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__
+        }
+    
+    def prepare_save(self, update_fields=None, geocode=True):
+        """
+        Calcule les champs dérivés avant l'enregistrement (aussi utilisé par
+        la création en masse, qui ne passe pas par save())
+        
+        Args:
+            update_fields: update_fields passés à save(), le cas échéant
+            geocode: Géocoder l'offre (False si les coordonnées sont calculées par lot)
+        
+        Returns:
+            Liste des champs dérivés à ajouter à update_fields
+        """
+        extra_fields = []
+        
         # Si l'offre est nouvelle, définir la date d'expiration à 30 jours par défaut
         if not self.expires_at:
             self.expires_at = timezone.now() + timedelta(days=30)
         
-        # Calcul du taux de conversion si le nombre de vues est > 0
-        if self.views_count > 0:
-            self.conversion_rate = (self.applications_count / self.views_count) * 100
-            
-        super().save(*args, **kwargs)
+        # Taux de conversion (borné comme en SQL) lorsque les compteurs sont affectés
+        # explicitement ; les incréments F() le recalculent en base (api/counters.py)
+        counters = {'views_count', 'applications_count'}
+        if self.views_count > 0 and (self._state.adding or self.assigned_counters() & counters):
+            from .counters import conversion_rate
+            self.conversion_rate = conversion_rate(self.applications_count, self.views_count)
+            if update_fields is not None and set(update_fields) & counters:
+                extra_fields.append('conversion_rate')
+        
+        # Géocoder l'offre lorsque sa ville ou son adresse change
+        if geocode:
+            from .geo import assign_coordinates
+            extra_fields.extend(assign_coordinates(self, update_fields))
+        
+        # Score initial d'une nouvelle offre (les boosts et la décroissance
+        # sont ensuite recalculés en SQL, voir api/ranking.py)
+        if self._state.adding:
+            from .ranking import initial_rank_score
+            self.rank_score = initial_rank_score(self)
+        
+        # Recalculer le masque des critères
+        self.flags = self.compute_flags()
+        if update_fields is not None and set(update_fields) & set(JOB_FLAG_FIELDS):
+            extra_fields.append('flags')
+        
+        # Toute modification autre que celle des compteurs périme les fragments en cache
+        from .feed_cache import is_counter_update
+        if not self._state.adding and not is_counter_update(update_fields):
+            self.version += 1
+            extra_fields.append('version')
+        
+        # Date de dernière modification (Last-Modified des GET conditionnels), compteurs compris
+        if not self._state.adding:
+            self.updated_at = timezone.now()
+            extra_fields.append('updated_at')
+        
+        return extra_fields
+    
+    def compute_flags(self):
+        """Calcule le masque des critères booléens de l'offre."""
+        return sum(bit for field, bit in JOB_FLAG_BITS.items() if getattr(self, field))
     
     @property
     def is_expired(self):
@@ -295,13 +505,57 @@ class Application(models.Model):
     def __str__(self):
         return f"Candidature de {self.candidate.email} pour {self.job.title}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Conserver les valeurs chargées pour détecter les changements à l'enregistrement
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+    
+    def get_loaded_value(self, attname):
+        """Valeur d'un champ telle qu'enregistrée en base (valeur courante si elle n'a pas été chargée)."""
+        loaded_values = getattr(self, '_loaded_values', {})
+        if attname in loaded_values:
+            return loaded_values[attname]
+        return self.__dict__.get(attname)
+    
     def save(self, *args, **kwargs):
-        # Si c'est une nouvelle candidature, incrémenter le compteur de candidatures de l'offre
-        if not self.pk:
-            self.job.applications_count += 1
-            self.job.save()
-            
-        super().save(*args, **kwargs)
+        # Compteurs de l'offre, de l'emploi flash, des statistiques et de l'employeur
+        # (signaux post_save, voir api/counters.py) mis à jour dans la même transaction
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+        
+        self._loaded_values = {
+            field.attname: self.__dict__[field.attname]
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__
+        }
+
+
+class EmployerCounters(models.Model):
+    """
+    Compteurs dénormalisés d'un employeur (tableau de bord, nombre d'offres affiché
+    avec chaque offre)
+    
+    Tenus à jour par incréments F() dans la transaction des écritures d'offres et
+    de candidatures (voir api/employer_counters.py) ; la commande
+    reconcile_employer_counters corrige les écarts éventuels.
+    """
+    
+    employer = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='counters')
+    total_jobs = models.IntegerField(_('nombre d\'offres'), default=0)
+    active_jobs = models.IntegerField(_('offres actives'), default=0)
+    total_applications = models.IntegerField(_('nombre de candidatures'), default=0)
+    unread_applications = models.IntegerField(_('candidatures non lues'), default=0)
+    total_views = models.BigIntegerField(_('nombre de vues'), default=0)
+    updated_at = models.DateTimeField(_('mis à jour le'), default=timezone.now)
+    
+    class Meta:
+        verbose_name = _('compteurs employeur')
+        verbose_name_plural = _('compteurs employeurs')
+    
+    def __str__(self):
+        return f"Compteurs de l'employeur {self.employer_id}"
 
 
 class Contract(models.Model):
@@ -372,6 +626,7 @@ class Notification(models.Model):
         ('signed_contract', 'Contrat signé'),
         ('subscription', 'Abonnement'),
         ('payment', 'Paiement'),
+        ('saved_search', 'Recherche sauvegardée'),
     )
     
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications')
@@ -554,17 +809,25 @@ class JobBoost(models.Model):
     def __str__(self):
         return f"Boost {self.get_type_display()} pour {self.job.title}"
     
+    # Badge de l'offre correspondant à chaque type de boost
+    JOB_FIELDS = {
+        'urgent': 'is_urgent',
+        'new': 'is_new',
+        'top': 'is_top',
+    }
+    
     def save(self, *args, **kwargs):
         # Mettre à jour le statut du job en fonction du type de boost
-        if self.type == 'urgent':
-            self.job.is_urgent = True
-        elif self.type == 'new':
-            self.job.is_new = True
-        elif self.type == 'top':
-            self.job.is_top = True
-            
-        self.job.save()
+        field = self.JOB_FIELDS.get(self.type)
+        if field and not getattr(self.job, field):
+            setattr(self.job, field, True)
+            self.job.save(update_fields=[field])
+        
         super().save(*args, **kwargs)
+        
+        # Le boost commence, change ou s'arrête : recalculer le score de l'offre
+        from .ranking import update_rank_scores
+        update_rank_scores(Job.objects.filter(pk=self.job_id))
 
 class JobShare(models.Model):
     """Modèle pour suivre les partages d'offres d'emploi."""
@@ -648,6 +911,65 @@ class Statistic(models.Model):
         
         super().save(*args, **kwargs)
 
+class JobViewSketch(models.Model):
+    """
+    Visiteurs distincts d'une offre sur une journée : esquisse HyperLogLog
+    (api/hyperloglog.py, 4 Ko au plus), fusionnable entre journées
+    """
+    
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='view_sketches')
+    date = models.DateField(_('date'))
+    sketch = models.BinaryField(_('esquisse'))
+    updated_at = models.DateTimeField(_('mis à jour le'), auto_now=True)
+    
+    class Meta:
+        verbose_name = _('visiteurs distincts')
+        verbose_name_plural = _('visiteurs distincts')
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'date'], name='unique_job_date_view_sketch')
+        ]
+    
+    def __str__(self):
+        return f"Visiteurs distincts de l'offre {self.job_id} le {self.date}"
+
+
+class JobStatRollup(models.Model):
+    """
+    Vues et candidatures d'une offre par heure, jour ou mois (api/rollups.py)
+    
+    Les trois niveaux sont alimentés ensemble par les écritures ; les heures et
+    les jours sont supprimés au-delà de leur durée de conservation, les mois
+    sont conservés.
+    """
+    
+    GRANULARITY_CHOICES = (
+        ('hour', 'Heure'),
+        ('day', 'Jour'),
+        ('month', 'Mois'),
+    )
+    
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='stat_rollups')
+    granularity = models.CharField(_('granularité'), max_length=5, choices=GRANULARITY_CHOICES)
+    # Début de la période (UTC)
+    bucket = models.DateTimeField(_('période'))
+    views = models.IntegerField(_('vues'), default=0)
+    applications = models.IntegerField(_('candidatures'), default=0)
+    
+    class Meta:
+        verbose_name = _('statistiques agrégées')
+        verbose_name_plural = _('statistiques agrégées')
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'granularity', 'bucket'], name='unique_job_stat_rollup')
+        ]
+        indexes = [
+            # Purge des périodes expirées
+            models.Index(fields=['granularity', 'bucket'], name='stat_rollup_expiry_idx'),
+        ]
+    
+    def __str__(self):
+        return f"Statistiques de l'offre {self.job_id} ({self.granularity} {self.bucket:%Y-%m-%d %H:%M})"
+
+
 class FlashJob(models.Model):
     """Modèle pour les emplois flash (urgent et à court terme)."""
     
@@ -790,4 +1112,149 @@ class ApplyAiSuggestion(models.Model):
         ]
     
     def __str__(self):
-        return f"Suggestion pour {self.user.email}: {self.job.title} ({self.match_percentage}%)"
\ No newline at end of file
+        return f"Suggestion pour {self.user.email}: {self.job.title} ({self.match_percentage}%)"
+
+class SearchSuggestion(models.Model):
+    """Suggestions d'autocomplétion de la recherche d'offres (intitulés, villes, entreprises)."""
+    
+    KIND_CHOICES = (
+        ('title', 'Intitulé'),
+        ('city', 'Ville'),
+        ('company', 'Entreprise'),
+    )
+    
+    kind = models.CharField(_('type'), max_length=10, choices=KIND_CHOICES)
+    value = models.CharField(_('libellé'), max_length=255)
+    # Libellé en minuscules et sans accents, utilisé pour la recherche
+    normalized = models.CharField(_('libellé normalisé'), max_length=255)
+    job_count = models.IntegerField(_('nombre d\'offres actives'), default=0)
+    updated_at = models.DateTimeField(_('mis à jour le'), auto_now=True)
+    
+    class Meta:
+        verbose_name = _('suggestion de recherche')
+        verbose_name_plural = _('suggestions de recherche')
+        ordering = ['-job_count']
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'normalized'], name='unique_search_suggestion')
+        ]
+        indexes = [
+            # Recherche par préfixe (LIKE 'abc%')
+            models.Index(fields=['normalized'], name='suggestion_prefix_idx', opclasses=['varchar_pattern_ops']),
+            # Recherche tolérante aux fautes (pg_trgm)
+            GinIndex(fields=['normalized'], name='suggestion_trgm_idx', opclasses=['gin_trgm_ops']),
+        ]
+    
+    def __str__(self):
+        return f"{self.value} ({self.get_kind_display()}, {self.job_count})"
+
+
+class GeocodeCache(models.Model):
+    """Cache de géocodage : lieu normalisé -> coordonnées (vides si le lieu est inconnu)."""
+    
+    SOURCE_CHOICES = (
+        ('gazetteer', 'Gazetteer'),
+        ('manual', 'Manuel'),
+    )
+    
+    query = models.CharField(_('lieu normalisé'), max_length=255, unique=True)
+    latitude = models.FloatField(_('latitude'), blank=True, null=True)
+    longitude = models.FloatField(_('longitude'), blank=True, null=True)
+    source = models.CharField(_('source'), max_length=20, choices=SOURCE_CHOICES, default='gazetteer')
+    created_at = models.DateTimeField(_('créé le'), auto_now_add=True)
+    
+    class Meta:
+        verbose_name = _('lieu géocodé')
+        verbose_name_plural = _('lieux géocodés')
+    
+    def __str__(self):
+        return f"{self.query} ({self.latitude}, {self.longitude})"
+
+
+class SavedSearch(models.Model):
+    """
+    Recherche d'offres sauvegardée par un candidat
+    
+    Les critères (category, city, contract_type, flags, q) sont indexés dans
+    SavedSearchPredicate : une nouvelle offre n'est comparée qu'aux recherches
+    partageant au moins un de ses critères.
+    """
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='saved_searches')
+    name = models.CharField(_('nom'), max_length=100, blank=True)
+    # {"category": "...", "city": "...", "contract_type": "...", "flags": [...], "q": "..."}
+    filters = models.JSONField(_('critères'), default=dict)
+    # Nombre de prédicats indexés : une offre correspond si elle les vérifie tous
+    predicate_count = models.PositiveSmallIntegerField(_('nombre de prédicats'), default=0)
+    notify = models.BooleanField(_('notifier les nouvelles offres'), default=True)
+    last_seen_at = models.DateTimeField(_('consultée le'), default=timezone.now)
+    created_at = models.DateTimeField(_('créée le'), auto_now_add=True)
+    
+    class Meta:
+        verbose_name = _('recherche sauvegardée')
+        verbose_name_plural = _('recherches sauvegardées')
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"Recherche {self.name or self.filters} de {self.user.email}"
+    
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'filters' not in update_fields:
+            super().save(*args, **kwargs)
+            return
+        
+        # Réindexer les critères de la recherche
+        from .saved_searches import search_predicates
+        predicates = search_predicates(self.filters)
+        self.predicate_count = len(predicates)
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | {'predicate_count'}
+        
+        # Recherche et index remplacés ensemble : jamais visible sans ses critères
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.predicates.all().delete()
+            SavedSearchPredicate.objects.bulk_create([
+                SavedSearchPredicate(saved_search=self, field=field, value=value)
+                for field, value in predicates
+            ])
+
+
+class SavedSearchPredicate(models.Model):
+    """Entrée de l'index inversé des recherches sauvegardées : (critère, valeur) -> recherche."""
+    
+    saved_search = models.ForeignKey(SavedSearch, on_delete=models.CASCADE, related_name='predicates')
+    field = models.CharField(_('critère'), max_length=30)
+    value = models.CharField(_('valeur'), max_length=255)
+    
+    class Meta:
+        verbose_name = _('prédicat de recherche')
+        verbose_name_plural = _('prédicats de recherche')
+        indexes = [
+            models.Index(fields=['field', 'value', 'saved_search'], name='saved_search_posting_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.field}={self.value}"
+
+
+class SavedSearchMatch(models.Model):
+    """Offre correspondant à une recherche sauvegardée, enregistrée à sa publication."""
+    
+    saved_search = models.ForeignKey(SavedSearch, on_delete=models.CASCADE, related_name='matches')
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='saved_search_matches')
+    matched_at = models.DateTimeField(_('trouvée le'), default=timezone.now)
+    
+    class Meta:
+        verbose_name = _('résultat de recherche sauvegardée')
+        verbose_name_plural = _('résultats de recherches sauvegardées')
+        ordering = ['-matched_at']
+        constraints = [
+            models.UniqueConstraint(fields=['saved_search', 'job'], name='unique_saved_search_match')
+        ]
+        indexes = [
+            models.Index(fields=['saved_search', 'matched_at'], name='saved_search_match_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.job} pour {self.saved_search}"
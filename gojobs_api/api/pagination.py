@@ -0,0 +1,191 @@
+# pagination.py
+
+import base64
+import json
+from datetime import datetime
+from django.core.exceptions import FieldDoesNotExist
+from django.core.paginator import Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+from .caching import query_signature
+from .counts import count_jobs
+
+# Paramètres sans effet sur le nombre de résultats (dont la représentation : ?fields=, ?view=)
+PAGINATION_PARAMS = ('page', 'cursor', 'ordering', 'format', 'fields', 'view')
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Paginator dont le total est mis en cache par signature de filtres,
+    et estimé par le planificateur au-delà d'un seuil.
+    """
+    
+    def __init__(self, object_list, per_page, signature, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.signature = signature
+        self.count_is_exact = True
+    
+    @cached_property
+    def count(self):
+        total, self.count_is_exact = count_jobs(self.object_list, self.signature)
+        return total
+
+
+class JobPageNumberPagination(PageNumberPagination):
+    """Pagination par numéro de page des offres, avec total mis en cache ou estimé."""
+    
+    def paginate_queryset(self, queryset, request, view=None):
+        action = getattr(view, 'action', None)
+        self.signature = f"{action}:{query_signature(request.query_params, ignored=PAGINATION_PARAMS)}"
+        return super().paginate_queryset(queryset, request, view=view)
+    
+    def django_paginator_class(self, queryset, page_size):
+        return CachedCountPaginator(queryset, page_size, self.signature)
+
+
+class ApplicantPagination(PageNumberPagination):
+    """Pagination des listes de candidatures de l'employeur (?page=, ?page_size=)."""
+    
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    
+    def get_meta(self):
+        return {
+            "current_page": self.page.number,
+            "last_page": self.page.paginator.num_pages,
+            "per_page": self.page.paginator.per_page,
+            "total": self.page.paginator.count,
+        }
+
+
+class JobKeysetPagination(BasePagination):
+    """
+    Pagination par curseur (keyset) pour les listes d'offres
+    
+    La page suivante est sélectionnée par une condition sur la clé de tri
+    (champ de tri principal, puis identifiant) au lieu d'un OFFSET, sans
+    COUNT(*) : le coût d'une page ne dépend pas de sa profondeur.
+    """
+    
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    default_ordering = '-created_at'
+    invalid_cursor_message = 'Curseur invalide'
+    
+    @classmethod
+    def is_requested(cls, request):
+        """Le mode curseur est activé par la présence du paramètre ?cursor= (vide pour la 1re page)."""
+        return cls.cursor_query_param in request.query_params
+    
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.ordering_field, self.descending = self.get_ordering(queryset)
+        self.next_position = None
+        
+        queryset = queryset.order_by(*self.get_order_by())
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self.get_position_filter(queryset, *position))
+        
+        results = list(queryset[:self.page_size + 1])
+        page = results[:self.page_size]
+        
+        if len(results) > self.page_size:
+            last = page[-1]
+            self.next_position = [getattr(last, self.ordering_field), last.pk]
+        
+        return page
+    
+    def get_ordering(self, queryset):
+        """Retourne le champ de tri principal du queryset et son sens."""
+        ordering = list(queryset.query.order_by) or list(queryset.model._meta.ordering)
+        field = ordering[0] if ordering and isinstance(ordering[0], str) else self.default_ordering
+        
+        if field.lstrip('-') in ('id', 'pk'):
+            field = self.default_ordering
+        
+        return field.lstrip('-'), field.startswith('-')
+    
+    def get_order_by(self):
+        if self.descending:
+            return [F(self.ordering_field).desc(nulls_last=True), '-pk']
+        return [F(self.ordering_field).asc(nulls_last=True), 'pk']
+    
+    def is_nullable(self, queryset):
+        try:
+            return queryset.model._meta.get_field(self.ordering_field).null
+        except FieldDoesNotExist:
+            # Annotation (ex. score de pertinence)
+            return False
+    
+    def get_position_filter(self, queryset, value, pk):
+        """Condition sélectionnant les lignes situées après la position (valeur, id)."""
+        beyond = 'lt' if self.descending else 'gt'
+        after_pk = Q(**{f'pk__{beyond}': pk})
+        
+        # Les valeurs NULL sont triées en dernier
+        if value is None:
+            return Q(**{f'{self.ordering_field}__isnull': True}) & after_pk
+        
+        condition = Q(**{f'{self.ordering_field}__{beyond}': value}) | (
+            Q(**{self.ordering_field: value}) & after_pk
+        )
+        if self.is_nullable(queryset):
+            condition |= Q(**{f'{self.ordering_field}__isnull': True})
+        return condition
+    
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            position = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            value, pk = position['v'], int(position['id'])
+            if position['o'] != self.ordering_field:
+                raise ValueError
+            if position.get('t') == 'datetime':
+                value = parse_datetime(value)
+                if value is None:
+                    raise ValueError
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError):
+            raise NotFound(self.invalid_cursor_message)
+        
+        return value, pk
+    
+    def encode_cursor(self, position):
+        value, pk = position
+        cursor = {'o': self.ordering_field, 'v': value, 'id': pk}
+        # DjangoJSONEncoder tronque les dates à la milliseconde : les lignes de la même
+        # milliseconde que la dernière de la page seraient sautées
+        if isinstance(value, datetime):
+            cursor.update(v=value.isoformat(), t='datetime')
+        payload = json.dumps(cursor, cls=DjangoJSONEncoder)
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+    
+    def get_next_cursor(self):
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position)
+    
+    def get_next_link(self):
+        cursor = self.get_next_cursor()
+        if cursor is None:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, cursor)
+    
+    def get_meta(self):
+        """Bloc `meta` de l'enveloppe {data, meta} attendue par le frontend."""
+        return {
+            'per_page': self.page_size,
+            'next_cursor': self.get_next_cursor(),
+            'next': self.get_next_link(),
+            'has_more': self.next_position is not None,
+        }
@@ -0,0 +1,117 @@
+# ranking.py
+
+import math
+from django.conf import settings
+from django.db.models import Case, FloatField, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce, Exp, Extract, Floor, Greatest
+from django.utils import timezone
+
+# Poids du boost actif le plus élevé : un boost « top » passe devant tout le reste
+BOOST_TIER_WEIGHTS = {
+    'top': 1000.0,
+    'urgent': 500.0,
+    'new': 200.0,
+}
+# Offre marquée urgente (boost ou emploi flash)
+URGENCY_WEIGHT = 100.0
+# Fraîcheur : FRESHNESS_WEIGHT à la publication, divisé par deux tous les FRESHNESS_HALF_LIFE_DAYS
+FRESHNESS_WEIGHT = 100.0
+FRESHNESS_HALF_LIFE_DAYS = 3
+# Âge compté par paliers : le score d'une offre ne change qu'au passage d'un palier,
+# et non à chaque recalcul (écritures et ordre des curseurs stables entre deux paliers)
+FRESHNESS_STEP_SECONDS = 6 * 60 * 60
+
+
+def freshness(created_at, now=None):
+    """Part de fraîcheur du score pour une date de publication (calcul Python)."""
+    now = now or timezone.now()
+    age_seconds = max((now - created_at).total_seconds(), 0) // FRESHNESS_STEP_SECONDS * FRESHNESS_STEP_SECONDS
+    return FRESHNESS_WEIGHT * 0.5 ** (age_seconds / 86400 / FRESHNESS_HALF_LIFE_DAYS)
+
+
+def initial_rank_score(job, now=None):
+    """Score d'une offre sans boost (à la création, avant tout boost)."""
+    return (URGENCY_WEIGHT if job.is_urgent else 0.0) + freshness(job.created_at, now)
+
+
+def rank_score_expression(boost_model, now=None):
+    """
+    Expression SQL du score de classement d'une offre
+
+    score = poids du boost actif le plus élevé + urgence + fraîcheur décroissante
+
+    Args:
+        boost_model: Modèle JobBoost (paramètre pour servir aussi dans les migrations)
+        now: Instant de référence du calcul
+    """
+    now = now or timezone.now()
+    active_tier = Subquery(
+        boost_model.objects.filter(
+            job=OuterRef('pk'), is_active=True, starts_at__lte=now, expires_at__gt=now
+        ).annotate(
+            weight=Case(
+                *[When(type=boost_type, then=Value(weight)) for boost_type, weight in BOOST_TIER_WEIGHTS.items()],
+                default=Value(0.0),
+                output_field=FloatField(),
+            )
+        ).order_by('-weight').values('weight')[:1],
+        output_field=FloatField(),
+    )
+    urgency = Case(
+        When(is_urgent=True, then=Value(URGENCY_WEIGHT)),
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+    # 0.5 ** (âge / demi-vie) = exp(-ln 2 * âge / demi-vie), âge en secondes par paliers ;
+    # exposant borné pour éviter le dépassement de capacité de exp() sur les offres anciennes
+    decay_rate = math.log(2) / (FRESHNESS_HALF_LIFE_DAYS * 86400)
+    age = Value(now.timestamp()) - Extract('created_at', 'epoch', output_field=FloatField())
+    age_seconds = Floor(age / Value(float(FRESHNESS_STEP_SECONDS))) * Value(float(FRESHNESS_STEP_SECONDS))
+    exponent = Greatest(Value(-decay_rate) * age_seconds, Value(-50.0))
+    fresh = Value(FRESHNESS_WEIGHT) * Exp(exponent, output_field=FloatField())
+
+    return Coalesce(active_tier, Value(0.0)) + urgency + fresh
+
+
+def update_rank_scores(queryset, now=None):
+    """
+    Recalcule en SQL le score de classement des offres d'un queryset, sans
+    réécrire les offres dont le score est inchangé
+
+    Returns:
+        int: Nombre d'offres dont le score a changé
+    """
+    from .models import JobBoost
+    score = rank_score_expression(JobBoost, now)
+    return queryset.exclude(rank_score=score).update(rank_score=score)
+
+
+def refresh_rank_scores(batch_size=None, now=None):
+    """
+    Recalcule le score des offres actives par tranches d'identifiants
+    (palier de fraîcheur franchi, début et fin des boosts)
+
+    Seules les offres dont le score change sont réécrites, et les listes en
+    cache ne sont invalidées que dans ce cas.
+
+    Returns:
+        int: Nombre d'offres dont le score a changé
+    """
+    from .feed_cache import invalidate_job_feed
+    from .models import Job
+
+    batch_size = batch_size or settings.JOB_SWEEP_BATCH_SIZE
+    now = now or timezone.now()
+    active = Job.objects.filter(status='active').order_by('id')
+
+    updated, last_id = 0, 0
+    while True:
+        ids = list(active.filter(id__gt=last_id).values_list('id', flat=True)[:batch_size])
+        if not ids:
+            break
+        updated += update_rank_scores(Job.objects.filter(id__in=ids), now)
+        last_id = ids[-1]
+
+    if updated:
+        invalidate_job_feed()
+    return updated
@@ -0,0 +1,67 @@
+# renderers.py
+
+import decimal
+from django.conf import settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # Encodeur standard de DRF
+    orjson = None
+
+
+def is_envelope(data):
+    """Indique si des données sont déjà au format {status, data, message} de api_response."""
+    return isinstance(data, dict) and 'status' in data and 'data' in data
+
+
+class EnvelopeJSONRenderer(JSONRenderer):
+    """
+    Rendu JSON des réponses de l'API en une seule passe
+
+    Avec API_RESPONSE_ENVELOPE, les réponses /api/ qui ne sont pas déjà au format
+    {status, data, message} (api_response) y sont placées au moment du rendu, à
+    la place d'APIResponseMiddleware qui relisait et réencodait chaque réponse.
+
+    L'encodage utilise orjson lorsqu'il est installé : UUID encodés nativement ;
+    dates et heures, Decimal et autres types par JSONEncoder, pour un rendu
+    identique à celui de JSONRenderer (précision des heures comprise). Sans
+    orjson, ou pour un rendu indenté, le rendu est celui de JSONRenderer.
+    """
+
+    encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        data = self.envelope(data, renderer_context)
+
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+        return orjson.dumps(
+            data, default=self.default, option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        )
+
+    def envelope(self, data, renderer_context):
+        if not settings.API_RESPONSE_ENVELOPE or is_envelope(data):
+            return data
+
+        request = renderer_context.get('request')
+        if request is None or not request.path_info.startswith('/api/'):
+            return data
+
+        response = renderer_context.get('response')
+        status_code = response.status_code if response is not None else 200
+        return {
+            'status': 'success' if status_code < 400 else 'error',
+            'data': data,
+            'message': None,
+        }
+
+    def default(self, obj):
+        if isinstance(obj, decimal.Decimal):
+            return float(obj)
+        return self.encoder.default(obj)
@@ -0,0 +1,192 @@
+# rollups.py
+
+from collections import defaultdict
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Sum
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from .models import JobStatRollup
+
+# Niveaux du plus fin au plus grossier
+GRANULARITIES = ('hour', 'day', 'month')
+
+
+def bucket_start(moment, granularity):
+    """Début (UTC) de la période contenant un instant."""
+    moment = moment.astimezone(dt_timezone.utc)
+    if granularity == 'hour':
+        return moment.replace(minute=0, second=0, microsecond=0)
+    if granularity == 'day':
+        return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def day_start(day):
+    """Début (UTC) d'une journée des statistiques."""
+    return datetime.combine(day, time.min, tzinfo=dt_timezone.utc)
+
+
+def parse_stats_moment(value):
+    """
+    Borne d'intervalle passée en paramètre : date-heure ISO 8601 (UTC si le
+    fuseau n'est pas précisé) ou date (début de la journée)
+
+    Raises:
+        ValueError: Valeur mal formée
+    """
+    if not value:
+        return None
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(value)
+        return day_start(day)
+    if timezone.is_naive(moment):
+        moment = moment.replace(tzinfo=dt_timezone.utc)
+    return moment
+
+
+def next_bucket(start, granularity):
+    if granularity == 'hour':
+        return start + timedelta(hours=1)
+    if granularity == 'day':
+        return start + timedelta(days=1)
+    return (start + timedelta(days=32)).replace(day=1)
+
+
+def retention_start(granularity, now=None):
+    """Début de la période conservée pour un niveau (None : conservé sans limite)."""
+    now = now or timezone.now()
+    if granularity == 'hour':
+        return bucket_start(now - timedelta(days=settings.JOB_STATS_HOURLY_RETENTION_DAYS), 'hour')
+    if granularity == 'day':
+        return bucket_start(now - timedelta(days=settings.JOB_STATS_DAILY_RETENTION_DAYS), 'day')
+    return None
+
+
+def add_job_stat_rollups(rows):
+    """
+    Ajoute des vues et des candidatures aux trois niveaux d'agrégation
+    (INSERT ... ON CONFLICT, une seule requête)
+
+    Args:
+        rows: Itérable de (job_id, instant, vues, candidatures)
+    """
+    totals = defaultdict(lambda: [0, 0])
+    for job_id, moment, views, applications in rows:
+        for granularity in GRANULARITIES:
+            total = totals[(job_id, granularity, bucket_start(moment, granularity))]
+            total[0] += views
+            total[1] += applications
+    if not totals:
+        return
+
+    table = JobStatRollup._meta.db_table
+    keys = sorted(totals)
+    values = ', '.join(['(%s, %s, %s, %s, %s)'] * len(keys))
+    params = [value for key in keys for value in (*key, *totals[key])]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} (job_id, granularity, bucket, views, applications) VALUES {values} '
+            f'ON CONFLICT (job_id, granularity, bucket) DO UPDATE '
+            f'SET views = {table}.views + EXCLUDED.views, '
+            f'applications = {table}.applications + EXCLUDED.applications',
+            params
+        )
+
+
+def choose_granularity(start, resolution, now=None):
+    """
+    Niveau interrogé : le plus grossier qui ne dépasse pas la résolution demandée
+    et dont la période conservée couvre le début de l'intervalle, sinon le
+    premier niveau plus grossier qui la couvre
+    """
+    covering = [
+        granularity for granularity in GRANULARITIES
+        if retention_start(granularity, now) is None or retention_start(granularity, now) <= start
+    ]
+    finer = [
+        granularity for granularity in covering
+        if GRANULARITIES.index(granularity) <= GRANULARITIES.index(resolution)
+    ]
+    return finer[-1] if finer else covering[0]
+
+
+def default_resolution(start, end):
+    """Résolution adaptée à la longueur de l'intervalle (au plus quelques centaines de points)."""
+    if end - start <= timedelta(days=2):
+        return 'hour'
+    if end - start <= timedelta(days=180):
+        return 'day'
+    return 'month'
+
+
+def job_timeseries(jobs, start, end, resolution=None):
+    """
+    Vues et candidatures d'une ou plusieurs offres par période, en une requête
+
+    Args:
+        jobs: Offre, identifiant ou queryset d'offres
+        start, end: Bornes de l'intervalle (datetime), fin exclue
+        resolution: 'hour', 'day' ou 'month' (selon la longueur de l'intervalle par défaut)
+
+    Returns:
+        {granularity, points: [{bucket, views, applications}, ...]}, périodes
+        vides comprises
+    """
+    resolution = resolution or default_resolution(start, end)
+    granularity = choose_granularity(start, resolution)
+    first = bucket_start(start, granularity)
+
+    rollups = JobStatRollup.objects.filter(granularity=granularity, bucket__gte=first, bucket__lt=end)
+    if hasattr(jobs, 'values'):
+        rollups = rollups.filter(job__in=jobs.values('pk'))
+    else:
+        rollups = rollups.filter(job=jobs)
+    totals = {
+        row['bucket']: row
+        for row in rollups.order_by().values('bucket').annotate(views=Sum('views'), applications=Sum('applications'))
+    }
+
+    points = []
+    bucket = first
+    while bucket < end:
+        row = totals.get(bucket, {})
+        points.append({
+            'bucket': bucket,
+            'views': row.get('views', 0),
+            'applications': row.get('applications', 0),
+        })
+        bucket = next_bucket(bucket, granularity)
+    return {'granularity': granularity, 'points': points}
+
+
+def compact_job_stat_rollups(batch_size=None, now=None):
+    """
+    Supprime les heures et les jours au-delà de leur durée de conservation
+    (les niveaux plus grossiers contiennent déjà leurs totaux)
+
+    Suppression par lots (index granularity, bucket), chacun dans sa propre
+    transaction.
+
+    Returns:
+        int: Nombre de lignes supprimées
+    """
+    batch_size = batch_size or settings.JOB_SWEEP_BATCH_SIZE
+    deleted = 0
+    for granularity in GRANULARITIES:
+        expiry = retention_start(granularity, now)
+        if expiry is None:
+            continue
+        expired = JobStatRollup.objects.filter(granularity=granularity, bucket__lt=expiry)
+        while True:
+            with transaction.atomic():
+                ids = list(expired.values_list('id', flat=True)[:batch_size])
+                if ids:
+                    deleted += JobStatRollup.objects.filter(pk__in=ids).delete()[0]
+            if len(ids) < batch_size:
+                break
+    return deleted
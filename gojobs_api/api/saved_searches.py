@@ -0,0 +1,200 @@
+# saved_searches.py
+
+from collections import Counter
+from django.db.models import BooleanField, Count, ExpressionWrapper, F, Q
+from django.utils import timezone
+from .models import JOB_FLAG_BITS, Job, SavedSearch, SavedSearchMatch, SavedSearchPredicate
+from .search import build_search_query
+from .suggestions import normalize_suggestion
+
+# Critères indexés par valeur (les critères booléens sont indexés sous 'flag')
+SEARCH_FIELDS = ('category', 'city', 'contract_type')
+FILTER_KEYS = SEARCH_FIELDS + ('flags', 'q')
+
+
+def search_predicates(filters):
+    """
+    Prédicats indexés d'une recherche sauvegardée
+
+    Args:
+        filters: Critères de la recherche ({category, city, contract_type, flags, q})
+
+    Returns:
+        Liste de couples (critère, valeur normalisée) ; le texte libre `q` n'est
+        pas indexé, il est vérifié sur les seules recherches candidates.
+    """
+    predicates = []
+    for field in SEARCH_FIELDS:
+        value = normalize_suggestion(filters.get(field) or '')
+        if value:
+            predicates.append((field, value))
+    for flag in sorted(set(filters.get('flags') or [])):
+        predicates.append(('flag', flag))
+    return predicates
+
+
+def job_predicates(job):
+    """Prédicats vérifiés par une offre, dans le format de search_predicates."""
+    predicates = []
+    for field in SEARCH_FIELDS:
+        value = normalize_suggestion(getattr(job, field) or '')
+        if value:
+            predicates.append((field, value))
+    for flag in JOB_FLAG_BITS:
+        if getattr(job, flag):
+            predicates.append(('flag', flag))
+    return predicates
+
+
+def validate_search_filters(filters):
+    """
+    Vérifie les critères d'une recherche sauvegardée
+
+    Returns:
+        Liste des erreurs (vide si les critères sont valides)
+    """
+    if not isinstance(filters, dict):
+        return ["Les critères doivent être un objet"]
+
+    errors = [f"Critère inconnu : {key}" for key in filters if key not in FILTER_KEYS]
+    flags = filters.get('flags') or []
+    if not isinstance(flags, list):
+        errors.append("flags doit être une liste")
+    else:
+        errors.extend(f"Critère booléen inconnu : {flag}" for flag in flags if flag not in JOB_FLAG_BITS)
+
+    if not errors and not search_predicates(filters):
+        errors.append("Au moins un critère parmi category, city, contract_type ou flags est requis")
+    return errors
+
+
+def match_saved_searches(job):
+    """Enregistre une offre publiée ou réactivée comme résultat des recherches qu'elle vérifie."""
+    return match_saved_searches_bulk([job]).get(job.pk, [])
+
+
+def match_saved_searches_bulk(jobs):
+    """
+    Enregistre des offres comme résultats des recherches sauvegardées qu'elles vérifient
+
+    Seuls les prédicats des offres sont lus dans l'index inversé (une requête
+    pour tout le lot) : une recherche correspond à une offre lorsque tous ses
+    prédicats figurent parmi ceux de l'offre.
+
+    Args:
+        jobs: Offres publiées ou réactivées
+
+    Returns:
+        dict {id de l'offre: recherches sauvegardées correspondantes}
+    """
+    job_postings = {job.pk: set(job_predicates(job)) for job in jobs}
+    all_postings = set().union(*job_postings.values()) if job_postings else set()
+    if not all_postings:
+        return {}
+
+    postings = Q()
+    for field, value in all_postings:
+        postings |= Q(field=field, value=value)
+
+    # Prédicats des recherches concernées, regroupés par recherche
+    searches_by_posting = {}
+    predicate_counts = {}
+    rows = SavedSearchPredicate.objects.filter(postings).values_list(
+        'field', 'value', 'saved_search', 'saved_search__predicate_count'
+    )
+    for field, value, saved_search_id, predicate_count in rows:
+        searches_by_posting.setdefault((field, value), []).append(saved_search_id)
+        predicate_counts[saved_search_id] = predicate_count
+
+    candidates_by_job = {}
+    for job_id, predicates in job_postings.items():
+        hits = Counter(
+            saved_search_id
+            for posting in predicates
+            for saved_search_id in searches_by_posting.get(posting, ())
+        )
+        candidates_by_job[job_id] = [
+            saved_search_id for saved_search_id, count in hits.items()
+            if count == predicate_counts[saved_search_id]
+        ]
+
+    candidate_ids = set().union(*candidates_by_job.values())
+    if not candidate_ids:
+        return {}
+    saved_searches = SavedSearch.objects.in_bulk(candidate_ids)
+    matched_texts = text_matches(
+        (job_id, saved_searches[saved_search_id].filters.get('q'))
+        for job_id, search_ids in candidates_by_job.items()
+        for saved_search_id in search_ids
+    )
+
+    now = timezone.now()
+    matches, notified, results = [], [], {}
+    for job in jobs:
+        for saved_search_id in candidates_by_job.get(job.pk, ()):
+            saved_search = saved_searches[saved_search_id]
+            if (job.pk, saved_search.filters.get('q')) not in matched_texts:
+                continue
+            results.setdefault(job.pk, []).append(saved_search)
+            matches.append(SavedSearchMatch(saved_search=saved_search, job=job, matched_at=now))
+            if saved_search.notify:
+                notified.append((job, saved_search))
+
+    # Une offre réactivée redevient un nouveau résultat
+    SavedSearchMatch.objects.bulk_create(
+        matches,
+        update_conflicts=True,
+        unique_fields=['saved_search', 'job'],
+        update_fields=['matched_at'],
+    )
+
+    from .services import notify_saved_search_matches
+    notify_saved_search_matches(notified)
+
+    return results
+
+
+def text_matches(pairs):
+    """
+    Vérifie le texte libre `q` de recherches candidates sur leurs offres, en une
+    requête : une colonne booléenne par texte distinct, lue pour les seules
+    offres concernées (pk__in)
+
+    Args:
+        pairs: Itérable de (id de l'offre, texte libre)
+
+    Returns:
+        Ensemble des couples vérifiés ; un texte sans mot exploitable
+        (build_search_query) est toujours vérifié
+    """
+    queries, matched, texts_by_job = {}, set(), {}
+    for job_id, text in pairs:
+        if text not in queries:
+            queries[text] = build_search_query(text)
+        if queries[text] is None:
+            matched.add((job_id, text))
+        else:
+            texts_by_job.setdefault(job_id, set()).add(text)
+    if not texts_by_job:
+        return matched
+
+    searched = [text for text, query in queries.items() if query is not None]
+    columns = {text: f'q{index}' for index, text in enumerate(searched)}
+    rows = Job.objects.filter(pk__in=texts_by_job).annotate(**{
+        column: ExpressionWrapper(Q(search_vector=queries[text]), output_field=BooleanField())
+        for text, column in columns.items()
+    }).values('pk', *columns.values())
+    matched.update(
+        (row['pk'], text)
+        for row in rows
+        for text in texts_by_job[row['pk']]
+        if row[columns[text]]
+    )
+    return matched
+
+
+def with_new_counts(queryset):
+    """Annote les recherches sauvegardées du nombre de résultats depuis leur dernière consultation."""
+    return queryset.annotate(
+        new_count=Count('matches', filter=Q(matches__matched_at__gt=F('last_seen_at')))
+    )
@@ -0,0 +1,82 @@
+# scheduler.py
+
+import logging
+import threading
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+# Tâches périodiques : nom -> (intervalle en secondes, fonction)
+_tasks = {}
+_started = False
+_start_lock = threading.Lock()
+
+
+def register_task(name, interval, func):
+    """
+    Déclare une tâche périodique exécutée par le planificateur intégré
+
+    Args:
+        name: Identifiant de la tâche (sert aussi de verrou entre processus)
+        interval: Intervalle entre deux exécutions, en secondes
+        func: Fonction sans argument
+    """
+    _tasks[name] = (interval, func)
+
+
+def run_task(name):
+    """
+    Exécute une tâche si aucun autre processus ne l'exécute déjà
+
+    Le verrou est une clé du cache partagé, posée pour la durée de l'intervalle.
+
+    Returns:
+        bool: True si la tâche a été exécutée par ce processus
+    """
+    interval, func = _tasks[name]
+    lock_key = f'scheduler:lock:{name}'
+    if not cache.add(lock_key, True, timeout=interval):
+        return False
+
+    close_old_connections()
+    try:
+        func()
+    except Exception:
+        logger.exception("Échec de la tâche planifiée %s", name)
+    finally:
+        close_old_connections()
+    return True
+
+
+def _schedule(name):
+    interval, _ = _tasks[name]
+
+    def tick():
+        run_task(name)
+        _schedule(name)
+
+    timer = threading.Timer(interval, tick)
+    timer.daemon = True
+    timer.start()
+
+
+def start():
+    """
+    Démarre le planificateur dans le processus courant (si JOB_SCHEDULER_ENABLED)
+
+    Appelé par les points d'entrée des serveurs (gojobs_api/wsgi.py et asgi.py) :
+    les commandes de gestion (migrate, shell, sweep_jobs...) ne le démarrent pas.
+    """
+    global _started
+    if not settings.JOB_SCHEDULER_ENABLED:
+        return
+    with _start_lock:
+        if _started:
+            return
+        _started = True
+
+    for name in _tasks:
+        _schedule(name)
+    logger.info("Planificateur démarré : %s", ', '.join(sorted(_tasks)))
@@ -0,0 +1,53 @@
+# search.py
+
+import re
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+from .models import JOB_SEARCH_CONFIG
+
+# Mots retenus dans la saisie utilisateur (lettres, chiffres)
+TOKEN_PATTERN = re.compile(r'[^\W_]+', re.UNICODE)
+MAX_SEARCH_TERMS = 10
+
+
+def build_search_query(text):
+    """
+    Construit la requête tsquery correspondant à une saisie utilisateur
+    
+    Les mots sont combinés par un ET logique ; le dernier mot est traité comme
+    un préfixe pour supporter la recherche pendant la frappe.
+    
+    Args:
+        text: Texte saisi par l'utilisateur
+    
+    Returns:
+        SearchQuery ou None si la saisie ne contient aucun mot exploitable
+    """
+    tokens = TOKEN_PATTERN.findall(text or '')[:MAX_SEARCH_TERMS]
+    if not tokens:
+        return None
+    
+    terms = tokens[:-1] + [f"{tokens[-1]}:*"]
+    return SearchQuery(' & '.join(terms), search_type='raw', config=JOB_SEARCH_CONFIG)
+
+
+def search_jobs(queryset, text):
+    """
+    Filtre un queryset d'offres par recherche plein texte et le trie par pertinence
+    
+    Args:
+        queryset: Queryset d'offres d'emploi à filtrer
+        text: Texte saisi par l'utilisateur
+    
+    Returns:
+        Queryset annoté du score `rank`, trié par pertinence puis date
+    """
+    query = build_search_query(text)
+    if query is None:
+        return queryset
+    
+    # Score en double précision pour pouvoir le comparer exactement (pagination par curseur)
+    return queryset.filter(search_vector=query).annotate(
+        rank=Cast(SearchRank(F('search_vector'), query), FloatField())
+    ).order_by('-rank', '-created_at')
@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from .models import *
 from django.conf import settings
+from django.db.models import F, Prefetch
+from .employer_counters import get_employer_counters
 from urllib.parse import urljoin
 from rest_framework.request import Request
 from rest_framework.response import Response
@@ -55,6 +57,106 @@ class JobPhotoSerializer(serializers.ModelSerializer):
         fields = ['id', 'job', 'photo', 'order', 'created_at']
         read_only_fields = ['created_at']
 
+# Représentation compacte des cartes du fil d'offres (?view=card)
+JOB_CARD_FIELDS = (
+    'id', 'title', 'entreprise', 'logo', 'category', 'contract_type', 'address',
+    'salaire', 'typeSalaire', 'isUrgent', 'isNew', 'is_top', 'created_at', 'distance',
+)
+
+# Colonnes lues par les champs de JobSerializer qui ne portent pas le nom d'une
+# colonne de Job (les autres champs lisent la colonne de même nom)
+JOB_FIELD_COLUMNS = {
+    'salaire': ('salary_amount',),
+    'typeSalaire': ('salary_type',),
+    'isUrgent': ('is_urgent',),
+    'isNew': ('is_new',),
+    'logement': ('has_accommodation',),
+    'vehicule': ('has_company_car',),
+    'days_until_expiry': ('expires_at',),
+    'is_expired': ('expires_at',),
+    'employer': ('employer',),
+    'entreprise': ('employer__company_name',),
+    'employeur': ('employer__first_name', 'employer__last_name', 'employer__member_since'),
+    # Photos (prefetch), distance (annotation), user_id (écriture seule)
+    'logo': (),
+    'photos': (),
+    'distance': (),
+    'user_id': (),
+}
+
+
+def employer_job_count():
+    """
+    Nombre d'offres de l'employeur d'une offre (annotation employer_job_count), lu
+    dans ses compteurs dénormalisés par jointure ; None si ses compteurs n'existent pas encore
+    """
+    return F('employer__counters__total_jobs')
+
+
+def requested_job_fields(query_params):
+    """
+    Champs de JobSerializer demandés par ?fields=a,b,c ou ?view=card
+    
+    Les noms inconnus sont ignorés et l'identifiant est toujours renvoyé.
+    
+    Returns:
+        Tuple des champs, ou None pour la représentation complète
+    """
+    fields = query_params.get('fields')
+    if fields:
+        known = JobSerializer.Meta.fields
+        requested = {name.strip() for name in fields.split(',')}
+        return ('id',) + tuple(name for name in known if name in requested and name != 'id')
+    if query_params.get('view') == 'card':
+        return JOB_CARD_FIELDS
+    return None
+
+
+def with_job_relations(queryset, fields=None, columns=()):
+    """
+    Charge en amont tout ce que lit JobSerializer pour un queryset d'offres
+    
+    Employeur par jointure, photos ordonnées en une requête pour toute la page,
+    nombre d'offres de l'employeur lu dans ses compteurs (EmployerCounters, par
+    jointure) ; le vecteur de recherche, inutile à la sérialisation, n'est pas
+    chargé.
+    
+    Args:
+        queryset: Queryset d'offres
+        fields: Champs sérialisés (requested_job_fields) ; seuls les colonnes et
+                relations qu'ils lisent sont alors chargées
+        columns: Colonnes de Job chargées en plus des champs (ex. champs de tri)
+    """
+    if fields is None:
+        needed = set(JobSerializer.Meta.fields)
+    else:
+        needed = set(fields)
+    
+    if needed & {'logo', 'photos'}:
+        queryset = queryset.prefetch_related(
+            Prefetch('photos', queryset=JobPhoto.objects.order_by('order', 'id'))
+        )
+    if 'employeur' in needed:
+        queryset = queryset.annotate(employer_job_count=employer_job_count())
+    
+    if fields is None:
+        return queryset.select_related('employer').defer('search_vector')
+    
+    loaded = {'id', 'version', *columns}
+    for name in fields:
+        loaded.update(JOB_FIELD_COLUMNS.get(name, (name,)))
+    # Employeur complet (UserSerializer imbriqué) ou seulement les colonnes lues
+    if 'employer' in loaded:
+        loaded = {column for column in loaded if not column.startswith('employer__')}
+    if any(column.split('__')[0] == 'employer' for column in loaded):
+        queryset = queryset.select_related('employer')
+    return queryset.only(*loaded)
+
+
+def ordered_photos(job):
+    """Photos d'une offre dans l'ordre d'affichage (depuis le cache de prefetch s'il existe)."""
+    return list(job.photos.all())
+
 class JobSerializer(serializers.ModelSerializer):
     employer = UserSerializer(read_only=True)
     # photos = JobPhotoSerializer(many=True, read_only=True)
@@ -77,6 +179,16 @@ class JobSerializer(serializers.ModelSerializer):
     vehicule = serializers.BooleanField(source='has_company_car')
     employeur = serializers.SerializerMethodField()
     photos = serializers.SerializerMethodField()
+    distance = serializers.SerializerMethodField()
+    
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Représentation partielle (?fields=, ?view=card) : les champs non
+        # demandés, y compris les champs calculés, ne sont pas évalués
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+    
     class Meta:
         model = Job
         fields = [
@@ -90,11 +202,12 @@ class JobSerializer(serializers.ModelSerializer):
             'is_urgent', 'is_new', 'is_top', 'status','created_at',
             'expires_at', 'views_count', 'applications_count', 'conversion_rate',
             'photos', 'days_until_expiry', 'is_expired','user_id','company',
+            'latitude', 'longitude', 'distance',
             # Champs personnalisés pour le frontend
              'entreprise',  'salaire', 'typeSalaire',
             'logo', 'isUrgent', 'isNew', 'logement', 'vehicule', 'employeur'
         ]
-        read_only_fields = ['created_at','user_id','updated_at', 'views_count', 'applications_count', 'conversion_rate']
+        read_only_fields = ['created_at','user_id','updated_at', 'views_count', 'applications_count', 'conversion_rate', 'latitude', 'longitude']
     
     def create(self, validated_data):
         # Supprimer user_id du validated_data car il est traité séparément dans perform_create
@@ -111,6 +224,11 @@ class JobSerializer(serializers.ModelSerializer):
     def get_salaire(self, obj):
         return obj.salary_amount
     
+    def get_distance(self, obj):
+        # Distance en km, annotée par la recherche par rayon (?lat=&lng=&distance=)
+        distance = getattr(obj, 'distance', None)
+        return round(distance, 2) if distance is not None else None
+    
     def get_queryset(self):
         queryset = super().get_queryset()
         
@@ -126,22 +244,19 @@ class JobSerializer(serializers.ModelSerializer):
         return 'horaire' if obj.salary_type == 'hourly' else 'mensuel'
     
     def get_logo(self, obj):
-        print(obj)
-        print(JobPhoto.objects.all())
-        photos = JobPhoto.objects.filter(job=obj).order_by('order').first()
-        print(photos)
-        if photos and photos.photo:
+        photos = ordered_photos(obj)
+        photo = photos[0] if photos else None
+        if photo and photo.photo:
             # Récupérer le domaine du site à partir de la requête
             request = self.context.get('request')
             if request is not None and isinstance(request, Request):
                 base_url = request.build_absolute_uri('/').rstrip('/')
                 # Construire l'URL absolue
-                if photos.photo.url.startswith('/'):
-                    print()
-                    return f"{base_url}{photos.photo.url}"
+                if photo.photo.url.startswith('/'):
+                    return f"{base_url}{photo.photo.url}"
                 else:
-                    return f"{base_url}/{photos.photo.url}"
-            return photos.photo.url
+                    return f"{base_url}/{photo.photo.url}"
+            return photo.photo.url
         
         # URL par défaut
         request = self.context.get('request')
@@ -152,15 +267,18 @@ class JobSerializer(serializers.ModelSerializer):
     
     def get_photos(self, obj):
         """Récupérer les URLs des photos associées à cette offre"""
-        photos = JobPhoto.objects.filter(job=obj).order_by('order')
-        return [photo.photo.url for photo in photos]
+        return [photo.photo.url for photo in ordered_photos(obj)]
     
     def get_employeur(self, obj):
+        # Nombre d'offres annoté par with_job_relations, sinon lu (ou initialisé) ici
+        job_count = getattr(obj, 'employer_job_count', None)
+        if job_count is None:
+            job_count = get_employer_counters(obj.employer_id).total_jobs
         return {
             'id': obj.employer.id,
             'nom': obj.employer.name,
             'memberSince': obj.employer.member_since or 2023,
-            'jobCount': Job.objects.filter(employer=obj.employer).count()
+            'jobCount': job_count
         }
     
     def validate(self, data):
@@ -243,6 +361,20 @@ class ApplicationSerializer(serializers.ModelSerializer):
         
         return data
 
+
+class ApplicantSerializer(ApplicationSerializer):
+    """
+    Ligne compacte d'une candidature pour les listes de l'employeur : l'offre est
+    renvoyée une seule fois à côté des lignes, le candidat est résumé (candidat)
+    """
+    job = None
+    candidate = None
+    job_id = serializers.IntegerField(read_only=True)
+    
+    class Meta(ApplicationSerializer.Meta):
+        fields = ['id', 'job_id', 'status', 'is_read', 'created_at', 'date', 'candidat', 'cv', 'resume']
+
+
 class ContractSerializer(serializers.ModelSerializer):
     job = JobSerializer(read_only=True)
     employer = UserSerializer(read_only=True)
@@ -410,4 +542,20 @@ class ApplyAiSuggestionSerializer(serializers.ModelSerializer):
             'id', 'user', 'job', 'match_percentage', 'match_reasons',
             'status', 'applied_date', 'is_viewed', 'created_at'
         ]
-        read_only_fields = ['created_at']
\ No newline at end of file
+        read_only_fields = ['created_at']
+
+
+class SavedSearchSerializer(serializers.ModelSerializer):
+    new_count = serializers.IntegerField(read_only=True, default=0)
+    
+    class Meta:
+        model = SavedSearch
+        fields = ['id', 'name', 'filters', 'notify', 'last_seen_at', 'created_at', 'new_count']
+        read_only_fields = ['last_seen_at', 'created_at']
+    
+    def validate_filters(self, value):
+        from .saved_searches import validate_search_filters
+        errors = validate_search_filters(value)
+        if errors:
+            raise serializers.ValidationError(errors)
+        return value
@@ -113,6 +113,31 @@ def notify_flash_job(flash_job, users=None):
     
     return notifications
 
+def notify_saved_search_matches(matches):
+    """
+    Notifie les candidats dont une recherche sauvegardée correspond à une nouvelle offre
+    
+    Args:
+        matches: Liste de couples (offre publiée ou réactivée, recherche sauvegardée
+                 correspondante avec notification activée)
+    """
+    notifications = [
+        Notification(
+            user_id=saved_search.user_id,
+            type='saved_search',
+            data={
+                'saved_search_id': saved_search.id,
+                'saved_search_name': saved_search.name,
+                'job_id': job.id,
+                'job_title': job.title,
+                'location': job.city
+            }
+        )
+        for job, saved_search in matches
+    ]
+    
+    return Notification.objects.bulk_create(notifications)
+
 def notify_new_contract(contract):
     """Notifie le candidat d'un nouveau contrat à signer"""
     if not contract.candidate:
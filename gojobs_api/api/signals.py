@@ -0,0 +1,110 @@
+# signals.py
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from . import employer_counters
+from .counters import apply_application_delta
+from .counts import invalidate_job_counts
+from .dashboard import invalidate_employer_dashboard
+from .facets import invalidate_job_facets, job_facets_changed
+from .feed_cache import invalidate_job_feed, is_counter_update
+from .fragments import invalidate_employer_fragments, invalidate_job_fragments
+from .models import Application, Job, JobBoost, JobPhoto, User
+from .ranking import update_rank_scores
+from .saved_searches import match_saved_searches
+from .suggestions import remove_job_suggestions, update_employer_suggestions, update_job_suggestions
+
+
+@receiver(post_save, sender=Job)
+def job_saved(sender, instance, created, **kwargs):
+    """Répercute la publication, la modification ou la clôture d'une offre."""
+    update_job_suggestions(instance, created=created)
+    employer_counters.job_saved(instance, created, kwargs.get('update_fields'))
+    invalidate_employer_dashboard(instance.employer_id)
+    
+    status_changed = instance.get_loaded_value('status') != instance.__dict__.get('status')
+    if created or status_changed:
+        invalidate_job_counts()
+    
+    # L'urgence (emploi flash) entre dans le score de classement
+    if not created and instance.get_loaded_value('is_urgent') != instance.__dict__.get('is_urgent'):
+        update_rank_scores(Job.objects.filter(pk=instance.pk))
+    
+    # Offre publiée ou réactivée : prévenir les recherches sauvegardées
+    if instance.status == 'active' and (created or status_changed):
+        match_saved_searches(instance)
+    
+    if job_facets_changed(instance, created=created):
+        invalidate_job_facets()
+    
+    if not is_counter_update(kwargs.get('update_fields')):
+        invalidate_job_feed()
+
+
+@receiver(post_delete, sender=Job)
+def job_deleted(sender, instance, **kwargs):
+    """Répercute la suppression d'une offre."""
+    remove_job_suggestions(instance)
+    employer_counters.job_deleted(instance)
+    invalidate_employer_dashboard(instance.employer_id)
+    invalidate_job_counts()
+    invalidate_job_facets()
+    invalidate_job_feed()
+
+
+@receiver(post_save, sender=Application)
+def application_saved(sender, instance, created, **kwargs):
+    """Nouvelle candidature ou candidature lue : compteurs de l'offre et de l'employeur."""
+    if created:
+        apply_application_delta(instance, 1)
+    employer_counters.application_saved(instance, created)
+    
+    # Seuls le nombre de candidatures et celui des non lues figurent au tableau de bord
+    if created or instance.get_loaded_value('is_read') != instance.is_read:
+        invalidate_employer_dashboard(instance.job.employer_id)
+
+
+@receiver(post_delete, sender=Application)
+def application_deleted(sender, instance, **kwargs):
+    apply_application_delta(instance, -1)
+    employer_counters.application_deleted(instance)
+    
+    if Application.job.is_cached(instance):
+        invalidate_employer_dashboard(instance.job.employer_id)
+    else:
+        invalidate_employer_dashboard(
+            Job.objects.filter(pk=instance.job_id).values_list('employer_id', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=JobPhoto)
+@receiver(post_delete, sender=JobPhoto)
+@receiver(post_save, sender=JobBoost)
+@receiver(post_delete, sender=JobBoost)
+def job_media_changed(sender, instance, **kwargs):
+    """Les photos (logo) et les boosts modifient l'affichage des listes d'offres."""
+    invalidate_job_feed()
+
+
+@receiver(post_save, sender=JobPhoto)
+@receiver(post_delete, sender=JobPhoto)
+def job_photo_changed(sender, instance, **kwargs):
+    """Les photos font partie des fragments sérialisés de l'offre."""
+    invalidate_job_fragments(Job.objects.filter(pk=instance.job_id))
+
+
+@receiver(post_delete, sender=JobBoost)
+def job_boost_deleted(sender, instance, **kwargs):
+    """Un boost supprimé ne compte plus dans le score de classement de l'offre."""
+    update_rank_scores(Job.objects.filter(pk=instance.job_id))
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, **kwargs):
+    """
+    Le nom, l'entreprise et le profil de l'employeur figurent dans ses offres
+    sérialisées ; son entreprise sert de suggestion pour celles qui n'en ont pas
+    """
+    if not created:
+        invalidate_employer_fragments(instance, kwargs.get('update_fields'))
+        update_employer_suggestions(instance, kwargs.get('update_fields'))
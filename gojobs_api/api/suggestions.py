@@ -0,0 +1,277 @@
+# suggestions.py
+
+import unicodedata
+from collections import Counter, defaultdict
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F, Q, Value
+from django.db.models.functions import Coalesce, NullIf
+from .models import Job, SearchSuggestion, User
+
+SUGGESTION_MAX_LENGTH = 255
+# Champs de l'offre dont dépendent ses suggestions
+SUGGESTION_FIELDS = ('status', 'title', 'city', 'company')
+
+
+def normalize_suggestion(text):
+    """
+    Normalise un libellé pour la recherche : minuscules, sans accents,
+    espaces multiples réduits.
+    """
+    if not text:
+        return ''
+    
+    decomposed = unicodedata.normalize('NFKD', str(text))
+    without_accents = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return ' '.join(without_accents.lower().split())[:SUGGESTION_MAX_LENGTH]
+
+
+def job_suggestion_terms(job, employer_company='', loaded=False):
+    """
+    Retourne les termes (type, libellé) qu'une offre active apporte aux suggestions
+    
+    Args:
+        job: L'offre d'emploi
+        employer_company: Entreprise de l'employeur, utilisée à défaut d'entreprise
+                          sur l'offre (voir employer_companies)
+        loaded: Utiliser les valeurs chargées depuis la base plutôt que les valeurs courantes
+    
+    Returns:
+        Liste de tuples (type, libellé), vide si l'offre n'est pas active
+    """
+    value = job.get_loaded_value if loaded else job.__dict__.get
+    if value('status') != 'active':
+        return []
+    
+    company = value('company') or employer_company
+    
+    terms = [('title', value('title')), ('city', value('city')), ('company', company)]
+    return [(kind, label.strip()) for kind, label in terms if label and label.strip()]
+
+
+def employer_companies(jobs, loaded=False):
+    """
+    Entreprises des employeurs d'offres actives sans entreprise propre
+    
+    Les employeurs déjà chargés (select_related, instance passée à la création)
+    sont lus sans requête, les autres en une seule requête.
+    
+    Args:
+        jobs: Offres d'emploi
+        loaded: Tenir compte aussi des valeurs chargées depuis la base
+    
+    Returns:
+        dict {employer_id: entreprise}
+    """
+    companies, missing = {}, set()
+    for job in jobs:
+        states = [job.__dict__.get] + ([job.get_loaded_value] if loaded else [])
+        if not any(value('status') == 'active' and not value('company') for value in states):
+            continue
+        if Job.employer.is_cached(job):
+            companies[job.employer_id] = job.employer.company_name
+        else:
+            missing.add(job.employer_id)
+    if missing:
+        companies.update(User.objects.filter(pk__in=missing).values_list('pk', 'company_name'))
+    return companies
+
+
+def apply_suggestion_delta(terms, delta):
+    """
+    Ajoute `delta` au nombre d'offres de chaque terme, en créant les suggestions manquantes
+    
+    Args:
+        terms: Liste de tuples (type, libellé)
+        delta: Variation à appliquer (+1 à la publication, -1 à la clôture)
+    """
+    for kind, label in terms:
+        normalized = normalize_suggestion(label)
+        if not normalized:
+            continue
+        
+        suggestions = SearchSuggestion.objects.filter(kind=kind, normalized=normalized)
+        if suggestions.update(job_count=F('job_count') + delta) or delta <= 0:
+            continue
+        
+        try:
+            with transaction.atomic():
+                SearchSuggestion.objects.create(
+                    kind=kind,
+                    value=label[:SUGGESTION_MAX_LENGTH],
+                    normalized=normalized,
+                    job_count=delta
+                )
+        except IntegrityError:
+            # Créée entre-temps par une requête concurrente
+            suggestions.update(job_count=F('job_count') + delta)
+
+
+def update_job_suggestions(job, created=False):
+    """Met à jour les suggestions après l'enregistrement d'une offre."""
+    if not created and all(job.get_loaded_value(field) == job.__dict__.get(field) for field in SUGGESTION_FIELDS):
+        return
+    
+    company = employer_companies([job], loaded=not created).get(job.employer_id, '')
+    previous = Counter() if created else Counter(job_suggestion_terms(job, company, loaded=True))
+    current = Counter(job_suggestion_terms(job, company))
+    
+    apply_suggestion_delta(list((previous - current).elements()), -1)
+    apply_suggestion_delta(list((current - previous).elements()), 1)
+
+
+def apply_jobs_suggestions(jobs, delta=1):
+    """
+    Répercute sur les suggestions la publication (delta=1) ou la clôture (delta=-1)
+    d'un lot d'offres, en une seule requête
+    
+    Publication : INSERT ... ON CONFLICT incrémente les suggestions existantes et
+    crée les manquantes. Clôture : UPDATE ... FROM (VALUES ...) décrémente.
+    """
+    totals = Counter()
+    labels = {}
+    companies = employer_companies(jobs)
+    for job in jobs:
+        for kind, label in job_suggestion_terms(job, companies.get(job.employer_id, '')):
+            key = (kind, normalize_suggestion(label))
+            if key[1]:
+                totals[key] += delta
+                labels.setdefault(key, label[:SUGGESTION_MAX_LENGTH])
+    
+    if not totals:
+        return
+    
+    table = SearchSuggestion._meta.db_table
+    params = []
+    if delta > 0:
+        for (kind, normalized), count in totals.items():
+            params.extend([kind, labels[(kind, normalized)], normalized, count])
+        values = ', '.join(['(%s, %s, %s, %s, now())'] * len(totals))
+        sql = (
+            f'INSERT INTO {table} (kind, value, normalized, job_count, updated_at) VALUES {values} '
+            f'ON CONFLICT (kind, normalized) DO UPDATE '
+            f'SET job_count = {table}.job_count + EXCLUDED.job_count, updated_at = EXCLUDED.updated_at'
+        )
+    else:
+        for (kind, normalized), count in totals.items():
+            params.extend([kind, normalized, count])
+        values = ', '.join(['(%s, %s, %s::integer)'] * len(totals))
+        sql = (
+            f'UPDATE {table} SET job_count = {table}.job_count + deltas.delta, updated_at = now() '
+            f'FROM (VALUES {values}) AS deltas (kind, normalized, delta) '
+            f'WHERE {table}.kind = deltas.kind AND {table}.normalized = deltas.normalized'
+        )
+    
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+
+
+def remove_job_suggestions(job):
+    """Met à jour les suggestions après la suppression d'une offre."""
+    company = employer_companies([job], loaded=True).get(job.employer_id, '')
+    apply_suggestion_delta(job_suggestion_terms(job, company, loaded=True), -1)
+
+
+def update_employer_suggestions(employer, update_fields=None):
+    """
+    Reporte un changement d'entreprise de l'employeur sur les suggestions de
+    ses offres actives sans entreprise propre (à appeler avant la mise à jour
+    des valeurs chargées)
+    """
+    if update_fields is not None and 'company_name' not in update_fields:
+        return
+    previous, current = employer.get_loaded_value('company_name'), employer.__dict__.get('company_name')
+    if normalize_suggestion(previous) == normalize_suggestion(current):
+        return
+    
+    count = Job.objects.filter(employer=employer, status='active').filter(
+        Q(company__isnull=True) | Q(company='')
+    ).count()
+    if count:
+        apply_suggestion_delta([('company', previous)] if previous else [], -count)
+        apply_suggestion_delta([('company', current)] if current else [], count)
+
+
+def rebuild_suggestions():
+    """
+    Reconstruit entièrement la table des suggestions à partir des offres actives
+    
+    Returns:
+        int: Nombre de suggestions créées
+    """
+    active_jobs = Job.objects.filter(status='active').order_by()
+    sources = {
+        'title': active_jobs.values(label=F('title')),
+        'city': active_jobs.values(label=F('city')),
+        'company': active_jobs.values(label=Coalesce(NullIf('company', Value('')), 'employer__company_name')),
+    }
+    
+    suggestions = []
+    for kind, rows in sources.items():
+        counts = defaultdict(int)
+        labels = defaultdict(Counter)
+        for row in rows.annotate(count=Count('id')):
+            normalized = normalize_suggestion(row['label'])
+            if not normalized:
+                continue
+            counts[normalized] += row['count']
+            labels[normalized][row['label'].strip()] += row['count']
+        
+        for normalized, count in counts.items():
+            suggestions.append(SearchSuggestion(
+                kind=kind,
+                value=labels[normalized].most_common(1)[0][0][:SUGGESTION_MAX_LENGTH],
+                normalized=normalized,
+                job_count=count
+            ))
+    
+    with transaction.atomic():
+        SearchSuggestion.objects.all().delete()
+        SearchSuggestion.objects.bulk_create(suggestions, batch_size=1000)
+    
+    return len(suggestions)
+
+
+def autocomplete(text, kinds=None, limit=8):
+    """
+    Suggestions pour une saisie partielle : correspondances par préfixe,
+    complétées par des correspondances approximatives (trigrammes)
+    
+    Args:
+        text: Texte saisi par l'utilisateur
+        kinds: Types de suggestions à retourner (tous par défaut)
+        limit: Nombre maximal de suggestions
+    
+    Returns:
+        Liste de dictionnaires {value, kind, count}
+    """
+    normalized = normalize_suggestion(text)
+    if not normalized:
+        return []
+    
+    suggestions = SearchSuggestion.objects.filter(job_count__gt=0)
+    if kinds:
+        suggestions = suggestions.filter(kind__in=kinds)
+    
+    fields = ('id', 'value', 'kind', 'job_count')
+    results = list(
+        suggestions.filter(normalized__startswith=normalized)
+        .order_by('-job_count', 'normalized')
+        .values(*fields)[:limit]
+    )
+    
+    # Compléter avec les libellés proches (fautes de frappe) si nécessaire
+    if len(results) < limit and len(normalized) >= 3:
+        found = [result['id'] for result in results]
+        results += list(
+            suggestions.filter(normalized__trigram_word_similar=normalized)
+            .exclude(id__in=found)
+            .annotate(similarity=TrigramWordSimilarity(normalized, 'normalized'))
+            .order_by('-similarity', '-job_count')
+            .values(*fields)[:limit - len(results)]
+        )
+    
+    return [
+        {'value': result['value'], 'kind': result['kind'], 'count': result['job_count']}
+        for result in results
+    ]
@@ -1,3 +1,941 @@
-from django.test import TestCase
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from datetime import timedelta
+from decimal import Decimal
+from importlib import import_module
+from unittest import mock
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from gojobs_api.middleware import negotiate_encoding
+from .caching import get_generation
+from .counters import MAX_CONVERSION_RATE, reconcile_application_counters, statistic_date
+from .employer_counters import reconcile_employer_counters
+from .feed_cache import FEED_NAMESPACE
+from .geo import (
+    GAZETTEER, KM_PER_DEGREE, filter_within_radius, geohash_cell_size, geohash_cover, geohash_encode, haversine_km,
+)
+from .hyperloglog import HyperLogLog
+from .lifecycle import close_expired_jobs, expire_new_flags
+from .models import (
+    JOB_FLAG_BITS, Application, EmployerCounters, FlashJob, Job, JobBoost, JobPhoto, JobStatRollup, JobViewSketch,
+    SavedSearch, SavedSearchMatch, SearchSuggestion, Statistic, User,
+)
+from .ranking import FRESHNESS_STEP_SECONDS, refresh_rank_scores
+from .renderers import EnvelopeJSONRenderer
+from .rollups import compact_job_stat_rollups
+from .search import build_search_query, search_jobs
+from .serializers import JOB_CARD_FIELDS
+from .suggestions import autocomplete
+from .view_buffer import buffer_job_view, flush_job_views
+from .view_sketches import unique_viewers, visitor_id
 
-# Create your tests here.
+
+class JobTestCase(TestCase):
+    """Offres de trois employeurs, partagées par les tests des fonctionnalités des offres"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employers = [
+            User.objects.create_user(
+                email=f'employeur{i}@example.com', password=None, role='employer',
+                first_name='Employeur', last_name=str(i), company_name=f'Entreprise {i}'
+            )
+            for i in range(3)
+        ]
+        cls.jobs = []
+        for i in range(25):
+            job = Job.objects.create(
+                employer=cls.employers[i % 3],
+                title=f'Serveur {i}',
+                description='Service en salle',
+                category='restauration',
+                contract_type='CDD',
+                city='Paris',
+                status='active',
+            )
+            for order in range(2):
+                JobPhoto.objects.create(job=job, photo=f'job_photos/{job.pk}-{order}.jpg', order=order)
+            cls.jobs.append(job)
+
+    def setUp(self):
+        # Les réponses anonymes et les totaux sont mis en cache
+        cache.clear()
+        self.client = APIClient()
+
+    def flush_views(self):
+        # Tranches du tampon de vues terminées
+        return flush_job_views(now=time.time() + 3 * settings.JOB_VIEW_BUFFER_SLOT)
+
+    def create_candidates(self, count):
+        return [
+            User.objects.create_user(
+                email=f'candidat{i}@example.com', password=None, role='candidate',
+                first_name='Candidat', last_name=f'{i:02d}'
+            )
+            for i in range(count)
+        ]
+
+
+class JobQueryBudgetTests(JobTestCase):
+    """
+    Nombre de requêtes SQL par action de JobViewSet
+
+    Le budget ne dépend pas du nombre d'offres de la page : une requête par
+    relation chargée en amont (voir with_job_relations), jamais par offre.
+    """
+
+    # Action -> (URL, requêtes au plus)
+    BUDGETS = {
+        # total (estimation puis COUNT), page, photos
+        'list': ('/api/jobs/', 4),
+        # page, photos
+        'list_cursor': ('/api/jobs/?cursor=', 2),
+        'list_card': ('/api/jobs/?view=card&cursor=', 2),
+        'search': ('/api/jobs/search/?q=serveur', 4),
+        # validateurs du GET conditionnel, offre, photos
+        'retrieve': (None, 3),
+    }
+
+    def assertWithinBudget(self, action):
+        url, budget = self.BUDGETS[action]
+        url = url or f'/api/jobs/{self.jobs[0].pk}/'
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertLessEqual(
+            len(queries), budget,
+            f"{action} : {len(queries)} requêtes pour un budget de {budget}\n"
+            + '\n'.join(query['sql'] for query in queries.captured_queries)
+        )
+        return response.json(), queries
+
+    def test_list(self):
+        payload, _ = self.assertWithinBudget('list')
+        self.assertEqual(len(payload['data']['data']), 20)
+
+    def test_list_cursor(self):
+        payload, _ = self.assertWithinBudget('list_cursor')
+        self.assertEqual(len(payload['data']['data']), 20)
+
+    def test_cursor_shared_timestamp(self):
+        # Offres publiées dans la même microseconde (publication en masse)
+        Job.objects.update(created_at=timezone.now().replace(microsecond=123456))
+        seen, cursor = [], ''
+        while cursor is not None:
+            payload = self.client.get('/api/jobs/', {'cursor': cursor, 'ordering': '-created_at'}).json()['data']
+            seen += [job['id'] for job in payload['data']]
+            cursor = payload['meta']['next_cursor']
+        self.assertEqual(seen, sorted((job.pk for job in self.jobs), reverse=True))
+
+    def test_search(self):
+        payload, _ = self.assertWithinBudget('search')
+        self.assertEqual(len(payload['data']['data']), 20)
+
+    def test_retrieve(self):
+        self.assertWithinBudget('retrieve')
+
+    def test_serialized_relations(self):
+        payload, _ = self.assertWithinBudget('retrieve')
+        job = payload['data']
+        self.assertEqual(job['employeur']['jobCount'], 9)
+        self.assertEqual(len(job['photos']), 2)
+        self.assertTrue(job['photos'][0].endswith(f'{self.jobs[0].pk}-0.jpg'))
+        self.assertTrue(job['logo'].endswith(f'{self.jobs[0].pk}-0.jpg'))
+
+    def test_card_view(self):
+        payload, queries = self.assertWithinBudget('list_card')
+        self.assertEqual(set(payload['data']['data'][0]), set(JOB_CARD_FIELDS))
+        # Colonnes non lues par la carte non chargées
+        page_query = queries.captured_queries[0]['sql']
+        self.assertNotIn('"api_job"."description"', page_query)
+        self.assertNotIn('"api_user"."skills"', page_query)
+
+    def test_sparse_fields(self):
+        response = self.client.get('/api/jobs/?fields=title,employeur,inconnu')
+        job = response.json()['data']['data'][0]
+        self.assertEqual(set(job), {'id', 'title', 'employeur'})
+        employer = Job.objects.get(pk=job['id']).employer
+        self.assertEqual(job['employeur']['jobCount'], employer.jobs.count())
+
+    def test_fragments_follow_job_changes(self):
+        url = f'/api/jobs/employer/?employer_id={self.employers[0].pk}'
+        job = Job.objects.get(pk=self.jobs[0].pk)
+        self.assertEqual(len(self.client.get(url).json()), 9)
+
+        job.title = 'Chef de rang'
+        job.save()
+        JobPhoto.objects.filter(job=job, order=0).delete()
+        self.employers[0].company_name = 'Brasserie'
+        self.employers[0].save()
+
+        data = {item['id']: item for item in self.client.get(url).json()}
+        self.assertEqual(data[job.pk]['title'], 'Chef de rang')
+        self.assertEqual(len(data[job.pk]['photos']), 1)
+
+        # Enregistrement complet de l'employeur sans changement public : offres intactes
+        versions = dict(Job.objects.filter(employer=self.employers[0]).values_list('pk', 'version'))
+        employer = User.objects.get(pk=self.employers[0].pk)
+        employer.set_password('nouveau')
+        employer.save()
+        self.assertEqual(dict(Job.objects.filter(employer=employer).values_list('pk', 'version')), versions)
+        self.assertEqual({item['entreprise'] for item in data.values()}, {'Brasserie'})
+
+    def test_conditional_get(self):
+        url = f'/api/jobs/{self.jobs[0].pk}/'
+        etag = self.client.get(url)['ETag']
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(len(queries), 1)
+
+        job = Job.objects.get(pk=self.jobs[0].pk)
+        job.title = 'Chef de rang'
+        job.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class JobSearchTests(JobTestCase):
+    """Recherche plein texte pondérée (api/search.py)"""
+
+    def test_search_ranking(self):
+        in_title, in_description = [
+            Job.objects.create(
+                employer=self.employers[0], title=title, description=description, category='restauration',
+                contract_type='CDD', city='Lyon', status='active',
+            )
+            for title, description in (('Cuisinier', 'Cuisine traditionnelle'), ('Plongeur', 'Aide au cuisinier'))
+        ]
+        # Titre (poids A) avant description (poids C)
+        results = list(search_jobs(Job.objects.all(), 'cuisinier'))
+        self.assertEqual(results, [in_title, in_description])
+        self.assertGreater(results[0].rank, results[1].rank)
+
+        # Dernier mot traité comme préfixe (recherche pendant la frappe), mots combinés par ET
+        self.assertEqual(set(search_jobs(Job.objects.all(), 'cuisi')), {in_title, in_description})
+        self.assertEqual(list(search_jobs(Job.objects.all(), 'aide cuisi')), [in_description])
+        self.assertIsNone(build_search_query(' !? '))
+
+        payload = self.client.get('/api/jobs/search/', {'q': 'serv'}).json()['data']
+        self.assertEqual(payload['meta']['total'], len(self.jobs))
+
+
+class JobCountTests(JobTestCase):
+    """Totaux des listes en cache, estimés au-delà d'un seuil (api/counts.py)"""
+
+    def get_meta(self, **params):
+        with CaptureQueriesContext(connection) as queries:
+            meta = self.client.get('/api/jobs/', params).json()['data']['meta']
+        counted = [query for query in queries if 'COUNT(' in query['sql'] or 'EXPLAIN' in query['sql']]
+        return (meta['total'], meta['total_is_exact']), len(counted)
+
+    def test_cached_totals(self):
+        # Utilisateur connecté : pas de cache des listes, seul le total est en cache
+        self.client.force_authenticate(self.employers[0])
+        self.assertEqual(self.get_meta(category='restauration'), ((25, True), 2))
+        self.assertEqual(self.get_meta(category='restauration'), ((25, True), 0))
+
+        # Publication : totaux invalidés
+        Job.objects.create(
+            employer=self.employers[0], title='Plongeur', description='Plonge', category='restauration',
+            contract_type='CDD', city='Paris', status='active',
+        )
+        self.assertEqual(self.get_meta(category='restauration')[0], (26, True))
+
+    @override_settings(JOB_COUNT_ESTIMATE_THRESHOLD=0)
+    def test_estimated_totals(self):
+        # Au-delà du seuil : estimation du planificateur, sans COUNT(*)
+        self.client.force_authenticate(self.employers[0])
+        (total, exact), counted = self.get_meta()
+        self.assertFalse(exact)
+        self.assertGreater(total, 0)
+        self.assertEqual(counted, 1)
+
+
+class JobFacetTests(JobTestCase):
+    """Facettes de l'écran de filtres en une requête GROUPING SETS (api/facets.py)"""
+
+    def get_facets(self, **params):
+        with CaptureQueriesContext(connection) as queries:
+            facets = self.client.get('/api/jobs/facets/', params).json()['data']
+        return facets, sum('GROUPING SETS' in query['sql'] for query in queries)
+
+    def test_facets(self):
+        lyon = [
+            Job.objects.create(
+                employer=self.employers[0], title='Plongeur', description='Plonge', category='restauration',
+                contract_type='CDI', city='Lyon', status='active', has_accommodation=True,
+            )
+            for _ in range(2)
+        ]
+        facets, computed = self.get_facets()
+        self.assertEqual(computed, 1)
+        self.assertEqual(facets['total'], 27)
+        self.assertEqual(facets['city'], [{'value': 'Paris', 'count': 25}, {'value': 'Lyon', 'count': 2}])
+        self.assertEqual(facets['contract_type'], [{'value': 'CDD', 'count': 25}, {'value': 'CDI', 'count': 2}])
+        self.assertEqual((facets['flags']['has_accommodation'], facets['flags']['is_urgent']), (2, 0))
+        self.assertEqual(self.get_facets(city='Lyon')[0]['total'], 2)
+
+        # Champ hors facettes : cache conservé ; ville modifiée : facettes recalculées
+        job = Job.objects.get(pk=lyon[0].pk)
+        job.description = 'Plonge et entretien'
+        job.save()
+        self.assertEqual(self.get_facets(), (facets, 0))
+        job.city = 'Paris'
+        job.save()
+        facets, computed = self.get_facets()
+        self.assertEqual((computed, facets['city'][0]), (1, {'value': 'Paris', 'count': 26}))
+
+
+class JobFlagFilterTests(JobTestCase):
+    """Critères booléens filtrés sur le masque Job.flags (api/filters.py)"""
+
+    def filtered(self, **params):
+        return {row['id'] for row in self.client.get('/api/jobs/', params).json()['data']['data']}
+
+    def test_flag_filters(self):
+        def create(**fields):
+            return Job.objects.create(
+                employer=self.employers[0], title='Saisonnier', description='Récolte', category='agriculture',
+                contract_type='CDD', city='Annecy', status='active', **fields,
+            ).pk
+
+        dogs = create(has_accommodation=True, accommodation_accepts_dogs=True, is_urgent=True)
+        lodged = create(has_accommodation=True)
+        holiday_visa = create(accepts_holiday_visa=True)
+        backpacker = create(subcategory='backpacker')
+
+        # Masque tenu à jour à l'enregistrement
+        flags = ('has_accommodation', 'accommodation_accepts_dogs', 'is_urgent', 'is_new')
+        self.assertEqual(Job.objects.get(pk=dogs).flags, sum(JOB_FLAG_BITS[field] for field in flags))
+
+        self.assertEqual(self.filtered(accommodation='true'), {dogs, lodged})
+        self.assertEqual(self.filtered(accommodation='true', accommodation_pets='true'), {dogs})
+        self.assertEqual(self.filtered(has_accommodation='true', is_urgent='false'), {lodged})
+        self.assertEqual(self.filtered(visa_type='holiday'), {holiday_visa})
+        # Backpackers : visa vacances-travail ou de travail (masque), ou sous-catégorie dédiée
+        self.assertEqual(self.filtered(for_backpackers='true'), {holiday_visa, backpacker})
+
+
+class JobFeedCacheTests(JobTestCase):
+    """Listes d'offres anonymes en cache (api/feed_cache.py)"""
+
+    def get_feed(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/jobs/')
+        return response.json(), len(queries)
+
+    def test_feed_cache(self):
+        payload, _ = self.get_feed()
+        self.assertEqual(self.get_feed(), (payload, 0))
+
+        # Compteurs seuls : listes conservées
+        job = Job.objects.get(pk=self.jobs[-1].pk)
+        job.views_count = 5
+        job.save(update_fields=['views_count'])
+        self.assertEqual(self.get_feed(), (payload, 0))
+
+        # Offre, photo ou boost modifiés : listes recalculées
+        job.title = 'Chef de rang'
+        job.save()
+        payload, queries = self.get_feed()
+        self.assertGreater(queries, 0)
+        self.assertIn('Chef de rang', [row['title'] for row in payload['data']['data']])
+        expires_at = timezone.now() + timedelta(days=7)
+        for write in (
+            lambda: JobPhoto.objects.create(job=job, photo='jobs/salle.jpg', order=2),
+            lambda: JobBoost.objects.create(job=job, type='top', amount=10, expires_at=expires_at),
+        ):
+            write()
+            self.assertGreater(self.get_feed()[1], 0)
+            self.assertEqual(self.get_feed()[1], 0)
+
+        # Utilisateurs connectés : pas de cache
+        self.client.force_authenticate(self.employers[0])
+        self.assertGreater(self.get_feed()[1], 0)
+        self.assertGreater(self.get_feed()[1], 0)
+
+
+class SuggestionTests(JobTestCase):
+    """Suggestions d'autocomplétion tenues à jour par delta (api/suggestions.py)"""
+
+    def suggestions(self, text, kind='company'):
+        return [(row['value'], row['count']) for row in autocomplete(text, kinds=[kind])]
+
+    def test_autocomplete(self):
+        # Préfixe classé par nombre d'offres, puis fautes de frappe (trigrammes)
+        ranked = [('Entreprise 0', 9), ('Entreprise 1', 8), ('Entreprise 2', 8)]
+        self.assertEqual(self.suggestions('entre'), ranked)
+        self.assertEqual(self.suggestions('entrepise'), ranked)
+        self.assertEqual(self.suggestions('Serveur 1', kind='title')[0], ('Serveur 1', 1))
+
+    def test_suggestion_deltas(self):
+        employer = self.employers[0]
+        job = Job.objects.get(pk=self.jobs[0].pk)
+
+        def job_count(kind, normalized):
+            suggestion = SearchSuggestion.objects.filter(kind=kind, normalized=normalized).first()
+            return suggestion.job_count if suggestion else None
+
+        # Champs sans suggestion : ni employeur lu, ni suggestion écrite
+        job.description = 'Service du soir'
+        with CaptureQueriesContext(connection) as queries:
+            job.save()
+        self.assertFalse([query for query in queries if 'suggestion' in query['sql'] or '"api_user"' in query['sql']])
+
+        job.title = 'Barman'
+        job.save()
+        self.assertEqual((job_count('title', 'barman'), job_count('title', 'serveur 0')), (1, 0))
+        job.status = 'closed'
+        job.save()
+        self.assertEqual(job_count('company', 'entreprise 0'), 8)
+
+        # Entreprise de l'employeur renommée : offres actives sans entreprise propre
+        employer.company_name = 'Maison Dupont'
+        employer.save()
+        self.assertEqual((job_count('company', 'maison dupont'), job_count('company', 'entreprise 0')), (8, 0))
+        Job.objects.filter(employer=employer, status='active').first().delete()
+        self.assertEqual(job_count('company', 'maison dupont'), 7)
+
+
+class GeoTests(JobTestCase):
+    """Recherche par distance : geohash, boîte englobante et haversine (api/geo.py)"""
+
+    def test_geohash_cover(self):
+        paris = GAZETTEER['paris']
+        prefixes = geohash_cover(*paris, 10)
+        self.assertLessEqual(len(prefixes), 9)
+        self.assertEqual(len({len(prefix) for prefix in prefixes}), 1)
+        self.assertIn(geohash_encode(*paris)[:len(prefixes[0])], prefixes)
+        # Cellules au moins aussi grandes que le rayon
+        height, width = geohash_cell_size(len(prefixes[0]))
+        self.assertGreaterEqual(height * KM_PER_DEGREE, 10)
+        self.assertIsNone(geohash_cover(*paris, 10000))
+
+    def test_filter_within_radius(self):
+        employer = self.employers[0]
+        near, far = [
+            Job.objects.create(
+                employer=employer, title='Plongeur', description='Plonge', category='restauration',
+                contract_type='CDD', city=city, status='active',
+            )
+            for city in ('Versailles', 'Lyon')
+        ]
+        jobs = list(filter_within_radius(Job.objects.all(), *GAZETTEER['paris'], 30))
+        self.assertEqual(len(jobs), len(self.jobs) + 1)
+        self.assertNotIn(far, jobs)
+        # Du plus proche au plus lointain : Versailles en dernier
+        self.assertEqual(jobs[-1], near)
+        distance = haversine_km(*GAZETTEER['paris'], *GAZETTEER['versailles'])
+        self.assertAlmostEqual(jobs[-1].distance, distance, places=3)
+
+        payload = self.client.get('/api/jobs/', {'lat': 45.76, 'lng': 4.84, 'distance': 5}).json()['data']
+        self.assertEqual([row['id'] for row in payload['data']], [far.pk])
+
+    def test_coordinates_kept(self):
+        job = Job.objects.get(pk=self.jobs[0].pk)
+        job.city = 'Ville inconnue'
+        job.save()
+        self.assertIsNone(Job.objects.get(pk=job.pk).latitude)
+
+        # Ville inchangée : pas de nouveau géocodage, même sans position
+        job.title = 'Chef de rang'
+        with CaptureQueriesContext(connection) as queries:
+            job.save()
+        self.assertFalse([query for query in queries if 'geocode' in query['sql']])
+
+
+class SavedSearchTests(JobTestCase):
+    """Recherches sauvegardées et index inversé des critères (api/saved_searches.py)"""
+
+    def test_saved_search_matching(self):
+        candidate = self.create_candidates(1)[0]
+        searches = {
+            name: SavedSearch.objects.create(user=candidate, name=name, filters=filters, notify=False)
+            for name, filters in {
+                'lyon': {'city': 'Lyon', 'category': 'restauration'},
+                'plonge': {'city': 'lyon', 'q': 'plong'},
+                'sommelier': {'city': 'Lyon', 'q': 'sommelier'},
+                'cdi': {'city': 'Lyon', 'contract_type': 'CDI'},
+                'logement': {'flags': ['logement']},
+            }.items()
+        }
+
+        # Critères indexés, puis texte libre vérifié en une requête pour tout le lot
+        with CaptureQueriesContext(connection) as queries:
+            job = Job.objects.create(
+                employer=self.employers[0], title='Plongeur', description='Plonge et entretien',
+                category='restauration', contract_type='CDD', city='Lyon', status='active',
+            )
+        self.assertEqual(
+            set(SavedSearchMatch.objects.filter(job=job).values_list('saved_search__name', flat=True)),
+            {'lyon', 'plonge'},
+        )
+        self.assertEqual(sum('to_tsquery' in query['sql'] for query in queries), 1)
+
+        self.client.force_authenticate(candidate)
+        counts = self.client.get('/api/saved-searches/new-counts/').json()['data']
+        self.assertEqual(counts[str(searches['lyon'].pk)], 1)
+        self.assertEqual(counts[str(searches['cdi'].pk)], 0)
+
+        # Consultation des résultats : plus de nouveaux résultats
+        payload = self.client.get(f"/api/saved-searches/{searches['lyon'].pk}/results/").json()['data']
+        self.assertEqual(([row['id'] for row in payload['data']], payload['new_count']), ([job.pk], 1))
+        counts = self.client.get('/api/saved-searches/new-counts/').json()['data']
+        self.assertEqual(counts[str(searches['lyon'].pk)], 0)
+
+
+class BulkJobTests(JobTestCase):
+    """Publication en masse (api/bulk.py)"""
+
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+    def row(self, **fields):
+        return {
+            'title': 'Plongeur', 'description': 'Plonge et entretien', 'category': 'restauration',
+            'contract_type': 'CDD', 'city': 'Lyon', 'status': 'active', 'salary_type': 'hourly',
+            'isUrgent': False, 'isNew': True, 'logement': False, 'vehicule': False, **fields,
+        }
+
+    def post_bulk(self, jobs, **data):
+        photo = SimpleUploadedFile('salle.jpg', b'photo', content_type='image/jpeg')
+        return self.client.post(
+            '/api/jobs/bulk/', {'jobs': json.dumps(jobs), 'salle': photo, **data}, format='multipart'
+        )
+
+    def test_bulk_create(self):
+        employer, other = self.employers[0], self.employers[1]
+        total_jobs = EmployerCounters.objects.get(pk=employer.pk).total_jobs
+        self.assertEqual(self.post_bulk([self.row()]).status_code, 401)
+
+        # user_id ignoré hors de l'équipe : offres publiées pour le compte connecté
+        self.client.force_authenticate(employer)
+        response = self.post_bulk(
+            [self.row(photos=['salle']), self.row(title=''), self.row(photos=['inconnue']), self.row()],
+            user_id=other.pk,
+        )
+        self.assertEqual(response.status_code, 201)
+        payload = response.json()['data']
+        self.assertEqual((payload['created'], payload['errors']), (2, 2))
+        self.assertIn('title', payload['results'][1]['errors'])
+        self.assertIn('photos', payload['results'][2]['errors'])
+
+        created = Job.objects.filter(pk__in=[result['id'] for result in payload['results'] if 'id' in result])
+        self.assertEqual(set(created.values_list('employer_id', flat=True)), {employer.pk})
+        self.assertEqual(JobPhoto.objects.filter(job__in=created).count(), 1)
+        self.assertEqual(EmployerCounters.objects.get(pk=employer.pk).total_jobs, total_jobs + 2)
+
+    def test_bulk_rollback(self):
+        self.client.force_authenticate(self.employers[0])
+        jobs = Job.objects.count()
+        with mock.patch('api.bulk.jobs_created', side_effect=RuntimeError), self.assertRaises(RuntimeError):
+            self.post_bulk([self.row(photos=['salle'])])
+
+        # Ni offre ni photo orpheline
+        self.assertEqual(Job.objects.count(), jobs)
+        self.assertEqual(os.listdir(os.path.join(self.media_root, 'job_photos')), [])
+
+
+class JobLifecycleTests(JobTestCase):
+    """Clôture des offres expirées et badge « nouveau » (api/lifecycle.py)"""
+
+    def test_close_expired_jobs(self):
+        employer = self.employers[0]
+        expired = [job.pk for job in self.jobs if job.employer_id == employer.pk][:3]
+        Job.objects.filter(pk__in=expired).update(expires_at=timezone.now() - timedelta(hours=1))
+        active_jobs = EmployerCounters.objects.get(pk=employer.pk).active_jobs
+
+        # Lots de 2 : la deuxième transaction reprend après la première
+        self.assertEqual(close_expired_jobs(batch_size=2), 3)
+        self.assertEqual(set(Job.objects.filter(status='closed').values_list('pk', flat=True)), set(expired))
+        self.assertEqual(EmployerCounters.objects.get(pk=employer.pk).active_jobs, active_jobs - 3)
+        self.assertEqual(SearchSuggestion.objects.get(kind='company', normalized='entreprise 0').job_count, 6)
+        self.assertEqual(close_expired_jobs(), 0)
+
+    def test_expire_new_flags(self):
+        old, boosted = self.jobs[0], self.jobs[1]
+        Job.objects.filter(pk__in=[old.pk, boosted.pk]).update(created_at=timezone.now() - timedelta(days=30))
+        JobBoost.objects.create(job=boosted, type='new', amount=5, expires_at=timezone.now() + timedelta(days=3))
+
+        # Boost « nouveau » en cours : badge conservé ; masque flags tenu à jour
+        self.assertEqual(expire_new_flags(batch_size=1), 1)
+        flags = dict(Job.objects.filter(pk__in=[old.pk, boosted.pk]).values_list('pk', 'flags'))
+        self.assertFalse(flags[old.pk] & JOB_FLAG_BITS['is_new'])
+        self.assertTrue(flags[boosted.pk] & JOB_FLAG_BITS['is_new'])
+        self.assertEqual(Job.objects.filter(is_new=False).get().pk, old.pk)
+
+
+class CompressionTests(JobTestCase):
+    """Compression négociée des réponses (gojobs_api/middleware.py)"""
+
+    def test_negotiate_encoding(self):
+        with mock.patch('gojobs_api.middleware.brotli', object()):
+            self.assertEqual(negotiate_encoding('gzip, deflate, br'), 'br')
+            self.assertEqual(negotiate_encoding('br;q=0.5, gzip'), 'gzip')
+            self.assertEqual(negotiate_encoding('*'), 'br')
+            # Réponses privées : gzip avec remplissage seulement
+            self.assertEqual(negotiate_encoding('br'), 'br')
+            self.assertIsNone(negotiate_encoding('br', padded=True))
+            self.assertEqual(negotiate_encoding('br, gzip', padded=True), 'gzip')
+        self.assertIsNone(negotiate_encoding('identity, gzip;q=0'))
+
+    def get(self, **extra):
+        return self.client.get('/api/jobs/', HTTP_ACCEPT_ENCODING='gzip', **extra)
+
+    def test_compressed_responses(self):
+        plain = self.client.get('/api/jobs/').content
+        response = self.get()
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(gzip.decompress(response.content), plain)
+
+        # Liste anonyme : corps compressé une seule fois, lu ensuite dans le cache
+        key = f'compressed:gzip:{hashlib.md5(plain).hexdigest()}'
+        self.assertEqual(cache.get(key), response.content)
+        cache.set(key, b'corps en cache')
+        self.assertEqual(self.get().content, b'corps en cache')
+
+        # Réponse privée : remplissage aléatoire de l'en-tête gzip (FNAME), jamais en cache
+        self.client.force_authenticate(self.employers[0])
+        response = self.get()
+        self.assertTrue(response.content[3] & gzip.FNAME)
+        self.assertEqual(gzip.decompress(response.content), self.client.get('/api/jobs/').content)
+
+
+class ResponseEnvelopeTests(TestCase):
+    """Enveloppe {status, data, message} au rendu ou par le middleware (api/renderers.py)"""
+
+    url = '/api/jobs/employer/'
+    middleware = settings.MIDDLEWARE + ['gojobs_api.middleware.APIResponseMiddleware']
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_envelope(self):
+        self.assertEqual(self.client.get(self.url).json(), {'error': "Le paramètre employer_id est requis"})
+        enveloped = {'status': 'error', 'data': {'error': "Le paramètre employer_id est requis"}, 'message': None}
+        with self.settings(API_RESPONSE_ENVELOPE=True):
+            self.assertEqual(self.client.get(self.url).json(), enveloped)
+
+        # Middleware : enveloppe appliquée une seule fois, au rendu ou à défaut par relecture
+        for envelope in (True, False):
+            with self.settings(API_RESPONSE_ENVELOPE=envelope, MIDDLEWARE=self.middleware):
+                # Nouveau client : les middlewares sont chargés à la première requête
+                self.assertEqual(APIClient().get(self.url).json(), enveloped)
+
+    def test_renderer_matches_drf(self):
+        now = timezone.now().replace(microsecond=123456)
+        data = {'at': now, 'day': now.date(), 'amount': Decimal('9.5')}
+        self.assertEqual(json.loads(EnvelopeJSONRenderer().render(data)), json.loads(JSONRenderer().render(data)))
+
+
+class ApplicantListTests(JobTestCase):
+    """Liste compacte et paginée des candidatures (api/applicants.py)"""
+
+    def test_job_applicants(self):
+        job = self.jobs[0]
+        for candidate in self.create_candidates(30):
+            Application.objects.create(job=job, candidate=candidate)
+
+        url = f'/api/jobs/{job.pk}/applicants/?ordering=nom'
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        self.client.force_authenticate(job.employer)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        # total et page des candidatures, offre, photos
+        self.assertLessEqual(len(queries), 5)
+        payload = response.json()['data']
+        self.assertEqual(payload['job']['id'], job.pk)
+        self.assertEqual(payload['meta']['total'], 30)
+        self.assertEqual([row['candidat']['nom'] for row in payload['applicants'][:2]], ['Candidat 00', 'Candidat 01'])
+
+    def test_employer_applicants(self):
+        employer = self.employers[0]
+        job = next(job for job in self.jobs if job.employer_id == employer.pk)
+        for candidate in self.create_candidates(3):
+            Application.objects.create(job=job, candidate=candidate)
+
+        url = f'/api/applications/employer/{employer.pk}/?view=compact'
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.client.force_authenticate(self.employers[1])
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        self.client.force_authenticate(employer)
+        payload = self.client.get(url).json()['data']
+        self.assertEqual(payload['meta']['total'], 3)
+        self.assertEqual([row['id'] for row in payload['jobs']], [job.pk])
+        # Page inconnue : 404 de la pagination, pas une erreur 500
+        self.assertEqual(self.client.get(f'{url}&page=99').status_code, 404)
+
+
+class EmployerCounterTests(JobTestCase):
+    """Compteurs dénormalisés des employeurs (api/employer_counters.py)"""
+
+    def test_employer_counters(self):
+        employer = self.employers[0]
+        job, other = [job for job in self.jobs if job.employer_id == employer.pk][:2]
+        applications = [
+            Application.objects.create(job=job, candidate=candidate) for candidate in self.create_candidates(2)
+        ]
+        applications[0].is_read = True
+        applications[0].save()
+        buffer_job_view(job.pk)
+        self.flush_views()
+        other.status = 'closed'
+        other.save()
+        Job.objects.get(pk=self.jobs[1].pk).delete()
+
+        counters = EmployerCounters.objects.get(pk=employer.pk)
+        self.assertEqual(
+            [counters.total_jobs, counters.active_jobs, counters.total_applications,
+             counters.unread_applications, counters.total_views],
+            [9, 8, 2, 1, 1],
+        )
+        self.assertEqual(EmployerCounters.objects.get(pk=self.employers[1].pk).total_jobs, 7)
+
+        # Compteur modifié en mémoire mais absent de update_fields : ni écrit, ni compté
+        job.views_count = 10
+        job.save(update_fields=['title'])
+        self.assertEqual(EmployerCounters.objects.get(pk=employer.pk).total_views, 1)
+
+        EmployerCounters.objects.filter(pk=employer.pk).update(total_jobs=0, unread_applications=5)
+        self.assertEqual(reconcile_employer_counters(), (3, 1))
+        counters.refresh_from_db()
+        self.assertEqual((counters.total_jobs, counters.unread_applications), (9, 1))
+
+
+class JobViewTests(JobTestCase):
+    """Vues des offres : tampon partagé ou écriture directe (api/view_buffer.py)"""
+
+    @override_settings(JOB_VIEW_BUFFER_ENABLED=True)
+    def test_buffered_views(self):
+        job, other = self.jobs[0], self.jobs[1]
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(3):
+                self.assertEqual(self.client.post(f'/api/jobs/{job.pk}/view/').status_code, 200)
+        self.assertEqual(len(queries), 0)
+        self.client.post(f'/api/jobs/{other.pk}/view/')
+        self.client.post('/api/jobs/999999/view/')
+
+        self.assertEqual(self.flush_views(), 4)
+        self.assertEqual(self.flush_views(), 0)
+        self.assertEqual(Job.objects.get(pk=job.pk).views_count, 3)
+        self.assertEqual(Statistic.objects.get(job=job).views, 3)
+
+        self.client.post(f'/api/jobs/{job.pk}/view/')
+        self.flush_views()
+        self.assertEqual(Statistic.objects.get(job=job).views, 4)
+        self.assertEqual(EmployerCounters.objects.get(pk=job.employer_id).total_views, 4)
+
+    def test_unbuffered_views(self):
+        # Cache local (par défaut) : aucun autre processus ne pourrait reporter le tampon
+        job = Job.objects.get(pk=self.jobs[0].pk)
+        self.client.post(f'/api/jobs/{job.pk}/view/')
+        self.assertEqual(self.flush_views(), 0)
+        # Compteur de l'offre (sans toucher à updated_at) et statistique du jour seulement
+        self.assertEqual(Job.objects.values_list('views_count', 'updated_at').get(pk=job.pk), (1, job.updated_at))
+        self.assertEqual(Statistic.objects.get(job=job).views, 1)
+        self.assertEqual(EmployerCounters.objects.get(pk=job.employer_id).total_views, 0)
+        self.assertFalse(JobViewSketch.objects.filter(job=job).exists())
+
+
+class ApplicationCounterTests(JobTestCase):
+    """Compteurs de candidatures tenus en SQL (api/counters.py)"""
+
+    def test_application_counters(self):
+        job = self.jobs[0]
+        stale = Job.objects.get(pk=job.pk)
+        flash_job = FlashJob.objects.create(job=job, start_time=timezone.now(), max_applicants=2, status='active')
+        for candidate in self.create_candidates(2):
+            Application.objects.create(job=job, candidate=candidate)
+
+        # Un enregistrement complet d'une instance lue avant les candidatures ne réécrit pas le compteur
+        stale.title = 'Chef de rang'
+        stale.save()
+        self.assertEqual(Job.objects.get(pk=job.pk).applications_count, 2)
+        flash_job.refresh_from_db()
+        self.assertEqual((flash_job.current_applicants, flash_job.status), (2, 'filled'))
+        self.assertEqual(Statistic.objects.get(job=job).applications, 2)
+
+        # Compteurs affectés explicitement : écrits, taux de conversion borné
+        job = Job.objects.get(pk=job.pk)
+        job.views_count = 0
+        job.save()
+        job.views_count = 1
+        job.applications_count = 20
+        job.save()
+        job = Job.objects.get(pk=job.pk)
+        self.assertEqual((job.views_count, job.conversion_rate), (1, MAX_CONVERSION_RATE))
+        self.assertEqual(EmployerCounters.objects.get(pk=job.employer_id).total_views, 1)
+        job.applications_count = 2
+        job.save()
+
+        Job.objects.filter(pk=job.pk).update(applications_count=7)
+        Statistic.objects.filter(job=job).delete()
+        self.assertEqual(reconcile_application_counters(), {'jobs': 1, 'flash_jobs': 0, 'statistics': 1})
+        self.assertEqual(Job.objects.get(pk=job.pk).applications_count, 2)
+        self.assertEqual(Statistic.objects.get(job=job).applications, 2)
+
+        # Ligne supprimée entre-temps : réinsérée, comme un enregistrement complet par défaut
+        Job.objects.filter(pk=stale.pk).delete()
+        stale.save()
+        self.assertTrue(Job.objects.filter(pk=stale.pk).exists())
+
+
+class UniqueViewerTests(JobTestCase):
+    """Visiteurs distincts estimés par HyperLogLog (api/view_sketches.py)"""
+
+    def test_unique_viewers(self):
+        job = self.jobs[0]
+        # Cache locmem des tests limité à 300 clés : deux clés par visiteur distinct
+        visitors = [f'visiteur{i}' for i in range(60)]
+        for visitor in visitors * 3:
+            buffer_job_view(job.pk, visitor=visitor)
+        self.assertEqual(self.flush_views(), 180)
+
+        today = statistic_date()
+        self.assertEqual(Statistic.objects.get(job=job, date=today).views, 180)
+        self.assertAlmostEqual(unique_viewers(job, today, today), 60, delta=2)
+
+        # Fusion avec le jour précédent : visiteurs communs comptés une fois
+        sketch = HyperLogLog()
+        for visitor in visitors[:30] + [f'autre{i}' for i in range(1000)]:
+            sketch.add(visitor)
+        JobViewSketch.objects.create(job=job, date=today - timedelta(days=1), sketch=sketch.to_bytes())
+        self.assertAlmostEqual(unique_viewers(job, today - timedelta(days=1), today), 1060, delta=50)
+        self.assertLess(len(JobViewSketch.objects.get(job=job, date=today).sketch), 4096)
+
+        self.client.force_authenticate(job.employer)
+        url = '/api/statistics/unique-viewers/'
+        # 90 jours au plus (JOB_UNIQUE_VIEWERS_MAX_RANGE_DAYS)
+        self.assertEqual(self.client.get(f'{url}?start={today - timedelta(days=89)}&end={today}').status_code, 200)
+        for params in (f'start={today - timedelta(days=90)}&end={today}', 'job_id=abc'):
+            self.assertEqual(self.client.get(f'{url}?{params}').status_code, 400)
+
+    def test_visitor_id(self):
+        request = RequestFactory().get('/', HTTP_X_FORWARDED_FOR='1.1.1.1, 2.2.2.2', REMOTE_ADDR='3.3.3.3')
+        request.user = AnonymousUser()
+        # En-tête ignoré sans proxy de confiance, sinon adresse ajoutée par le proxy
+        self.assertTrue(visitor_id(request).startswith('anon:3.3.3.3:'))
+        with self.settings(TRUSTED_PROXY_COUNT=1):
+            self.assertTrue(visitor_id(request).startswith('anon:2.2.2.2:'))
+
+
+class StatRollupTests(JobTestCase):
+    """Statistiques agrégées par heure, jour et mois (api/rollups.py)"""
+
+    def test_stat_rollups(self):
+        job = self.jobs[0]
+        for _ in range(3):
+            buffer_job_view(job.pk)
+        self.flush_views()
+        Application.objects.create(job=job, candidate=self.create_candidates(1)[0])
+        self.assertEqual(
+            set(JobStatRollup.objects.filter(job=job).values_list('granularity', 'views', 'applications')),
+            {('hour', 3, 1), ('day', 3, 1), ('month', 3, 1)},
+        )
+
+        self.client.force_authenticate(job.employer)
+        payload = self.client.get(f'/api/statistics/timeseries/?hours=6&job_id={job.pk}').json()
+        self.assertEqual(payload['granularity'], 'hour')
+        self.assertEqual((sum(payload['views']), sum(payload['applications'])), (3, 1))
+        # Au-delà de la conservation des heures : niveau journalier
+        payload = self.client.get('/api/statistics/timeseries/?hours=1000&resolution=hour').json()
+        self.assertEqual(payload['granularity'], 'day')
+        self.assertEqual(sum(payload['views']), 3)
+        self.assertEqual(self.client.get('/api/statistics/timeseries/?job_id=abc').status_code, 400)
+
+        later = timezone.now() + timedelta(days=settings.JOB_STATS_HOURLY_RETENTION_DAYS + 1)
+        self.assertEqual(compact_job_stat_rollups(now=later), 1)
+        self.assertFalse(JobStatRollup.objects.filter(granularity='hour').exists())
+
+
+class EmployerDashboardTests(JobTestCase):
+    """Tableau de bord de l'employeur en cache (api/dashboard.py)"""
+
+    def test_employer_dashboard(self):
+        employer = self.employers[0]
+        job = Job.objects.filter(employer=employer).order_by('pk').first()
+        Application.objects.create(job=job, candidate=self.create_candidates(1)[0])
+        buffer_job_view(job.pk)
+        self.flush_views()
+        self.client.force_authenticate(employer)
+
+        # Compteurs et meilleures offres, série journalière, visiteurs distincts
+        with CaptureQueriesContext(connection) as queries:
+            payload = self.client.get('/api/statistics/dashboard/').json()
+        self.assertLessEqual(len(queries), 3)
+        self.assertEqual(
+            (payload['totalJobs'], payload['totalApplications'], payload['totalViews']),
+            (Job.objects.filter(employer=employer).count(), 1, 1),
+        )
+        self.assertEqual(payload['activeJobsData'][0]['id'], job.pk)
+        self.assertEqual(len(payload['activeJobsData']), 5)
+        self.assertEqual((sum(payload['viewsData']['values']), sum(payload['applicationData']['values'])), (1, 1))
+
+        # Tableau de bord en cache jusqu'à la prochaine écriture ; les vues ne l'invalident pas
+        buffer_job_view(job.pk)
+        self.flush_views()
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get('/api/statistics/dashboard/').json(), payload)
+        self.assertEqual(len(queries), 0)
+
+        # Visiteurs distincts conservés hors de la génération
+        Application.objects.filter(job=job).get().delete()
+        with CaptureQueriesContext(connection) as queries:
+            payload = self.client.get('/api/statistics/dashboard/').json()
+        self.assertEqual(len(queries), 2)
+        self.assertEqual((payload['totalApplications'], payload['totalViews']), (0, 2))
+
+
+class RankScoreTests(TestCase):
+    """Recalcul périodique du score de classement (api/ranking.py)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        employer = User.objects.create_user(email='employeur@example.com', password=None, role='employer')
+        cls.jobs = [
+            Job.objects.create(
+                employer=employer, title=f'Serveur {i}', description='Service en salle',
+                category='restauration', contract_type='CDD', city='Paris', status='active',
+            )
+            for i in range(3)
+        ]
+
+    def test_refresh_rewrites_changed_scores_only(self):
+        now = timezone.now()
+        refresh_rank_scores(now=now)
+        generation = get_generation(FEED_NAMESPACE)
+        self.assertEqual(refresh_rank_scores(now=now + timedelta(minutes=15)), 0)
+        self.assertEqual(get_generation(FEED_NAMESPACE), generation)
+
+        # Palier de fraîcheur franchi
+        self.assertEqual(refresh_rank_scores(now=now + timedelta(seconds=FRESHNESS_STEP_SECONDS)), 3)
+        self.assertNotEqual(get_generation(FEED_NAMESPACE), generation)
+
+    def test_migration_matches_runtime_score(self):
+        fill_rank_scores = import_module('api.migrations.0009_job_rank_score').fill_rank_scores
+        fill_rank_scores(django_apps, None)
+        self.assertEqual(refresh_rank_scores(), 0)
@@ -20,6 +20,7 @@ router.register(r'payments', views.PaymentViewSet, basename='payment')
 router.register(r'job-boosts', views.JobBoostViewSet, basename='job_boost')
 router.register(r'job-shares', views.JobShareViewSet, basename='job_share')
 router.register(r'connections', views.UserConnectionViewSet, basename='connection')
+router.register(r'saved-searches', views.SavedSearchViewSet, basename='saved_search')
 
 urlpatterns = [
     # Auth routes
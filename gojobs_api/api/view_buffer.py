@@ -0,0 +1,231 @@
+# view_buffer.py
+
+import time
+from collections import defaultdict
+from datetime import datetime, timezone as dt_timezone
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils import timezone
+from .counters import MAX_CONVERSION_RATE, add_daily_statistics, statistic_date
+from .employer_counters import apply_employer_counters
+from .hyperloglog import HyperLogLog
+from .models import Job
+from .rollups import add_job_stat_rollups
+from .view_sketches import merge_view_observations
+
+VIEW_BUFFER_PREFIX = 'jobs:views'
+
+# Caches propres à chaque processus : un tampon qu'aucun autre processus
+# (commande flush_job_views, autre worker) ne peut lire
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def view_buffer_enabled():
+    """
+    Vues cumulées dans le cache (JOB_VIEW_BUFFER_ENABLED, par défaut : le cache
+    CACHE_BACKEND est partagé entre processus)
+    """
+    enabled = settings.JOB_VIEW_BUFFER_ENABLED
+    if enabled is None:
+        return settings.CACHES['default']['BACKEND'] not in PROCESS_LOCAL_CACHES
+    return enabled
+
+
+def current_slot(now=None):
+    """Tranche de JOB_VIEW_BUFFER_SLOT secondes à laquelle une vue est rattachée."""
+    return int((now or time.time()) // settings.JOB_VIEW_BUFFER_SLOT)
+
+
+def _slot_key(slot, suffix):
+    return f'{VIEW_BUFFER_PREFIX}:{slot}:{suffix}'
+
+
+def _incr(key, delta=1):
+    """Incrément atomique d'une clé du cache partagé, créée si besoin."""
+    timeout = settings.JOB_VIEW_BUFFER_TIMEOUT
+    if cache.add(key, delta, timeout):
+        return delta
+    try:
+        return cache.incr(key, delta)
+    except ValueError:
+        # Clé expirée entre add() et incr()
+        cache.add(key, delta, timeout)
+        return delta
+
+
+def buffer_job_view(job_id, visitor=None, count=1):
+    """
+    Compte une vue dans le tampon partagé (cache), sans écriture en base
+
+    Les vues sont cumulées par tranche de temps, offre et jour. La première vue
+    d'une offre dans une tranche inscrit le couple (offre, jour) dans l'index de
+    la tranche, que flush_job_views parcourt.
+
+    Le visiteur est réduit à son observation HyperLogLog (registre, rang) : seule
+    la première occurrence d'une observation dans la tranche est conservée, pour
+    être fusionnée dans l'esquisse du jour (api/view_sketches.py).
+
+    Args:
+        job_id: Identifiant de l'offre
+        visitor: Identifiant du visiteur (visitor_id), None s'il n'est pas compté
+        count: Nombre de vues
+    """
+    timeout = settings.JOB_VIEW_BUFFER_TIMEOUT
+    slot, day = current_slot(), statistic_date()
+    key = _slot_key(slot, f'{job_id}:{day.isoformat()}')
+    if _incr(key, count) == count:
+        position = _incr(_slot_key(slot, 'size'))
+        cache.set(_slot_key(slot, f'entry:{position}'), (job_id, day, key), timeout)
+
+    if visitor is not None:
+        index, rank = HyperLogLog.observation(visitor)
+        if cache.add(f'{key}:seen:{index}:{rank}', True, timeout):
+            position = _incr(_slot_key(slot, 'observations'))
+            cache.set(_slot_key(slot, f'observation:{position}'), (job_id, day, index, rank), timeout)
+
+
+def record_job_view(job_id, visitor=None):
+    """
+    Compte une vue : dans le tampon partagé si le cache le permet
+    (view_buffer_enabled), sinon directement en base
+
+    Sans tampon, seuls le compteur de l'offre et sa statistique du jour sont
+    écrits (deux requêtes par vue) : compteurs des employeurs, statistiques
+    agrégées et visiteurs distincts ne sont alimentés que par le tampon.
+    """
+    if view_buffer_enabled():
+        buffer_job_view(job_id, visitor=visitor)
+        return
+
+    with transaction.atomic():
+        if update_job_view_counters({job_id: 1}):
+            add_daily_statistics([(job_id, statistic_date(), 1, 0)])
+
+
+def update_job_view_counters(per_job):
+    """
+    Ajoute des vues aux compteurs des offres (et recalcule leur taux de
+    conversion) en un seul UPDATE ... FROM (VALUES ...), lignes verrouillées
+    dans l'ordre des identifiants
+
+    Args:
+        per_job: dict {job_id: nombre de vues}
+
+    Returns:
+        dict {job_id: employer_id} des offres existantes
+    """
+    job_table = Job._meta.db_table
+    job_ids = sorted(per_job)
+    values = ', '.join(['(%s::bigint, %s::integer)'] * len(job_ids))
+    params = [value for job_id in job_ids for value in (job_id, per_job[job_id])]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'UPDATE {job_table} SET views_count = {job_table}.views_count + deltas.views, '
+            f'conversion_rate = LEAST(ROUND({job_table}.applications_count * 100.0 '
+            f'/ ({job_table}.views_count + deltas.views), 2), {MAX_CONVERSION_RATE}) '
+            f'FROM (VALUES {values}) AS deltas (id, views) '
+            f'WHERE {job_table}.id = deltas.id '
+            f'RETURNING {job_table}.id, {job_table}.employer_id',
+            params
+        )
+        return dict(cursor.fetchall())
+
+
+def apply_job_views(views, observations=(), at=None):
+    """
+    Applique des vues cumulées en base, en une transaction
+
+    Compteurs des offres (update_job_view_counters), compteurs des employeurs
+    par F(), statistiques journalières par INSERT ... ON CONFLICT
+    (add_daily_statistics et add_job_stat_rollups), visiteurs distincts par
+    fusion des esquisses journalières. Les vues d'offres
+    supprimées entre-temps sont ignorées.
+
+    Args:
+        views: dict {(job_id, date): nombre de vues}
+        observations: Itérable de (job_id, date, index, rang) des visiteurs
+        at: Instant des vues (période horaire des statistiques agrégées), maintenant par défaut
+
+    Returns:
+        int: Nombre de vues appliquées
+    """
+    per_job = defaultdict(int)
+    for (job_id, _), count in views.items():
+        per_job[job_id] += count
+    if not per_job:
+        return 0
+
+    with transaction.atomic():
+        employers = update_job_view_counters(per_job)
+
+        per_employer = defaultdict(int)
+        for job_id, employer_id in employers.items():
+            per_employer[employer_id] += per_job[job_id]
+        for employer_id in sorted(per_employer):
+            apply_employer_counters(employer_id, total_views=per_employer[employer_id])
+
+        add_daily_statistics(
+            (job_id, day, count, 0) for (job_id, day), count in views.items() if job_id in employers
+        )
+        add_job_stat_rollups((job_id, at or timezone.now(), per_job[job_id], 0) for job_id in employers)
+        merge_view_observations(observation for observation in observations if observation[0] in employers)
+
+    return sum(per_job[job_id] for job_id in employers)
+
+
+def _flush_slot(slot, size):
+    entry_keys = [_slot_key(slot, f'entry:{position}') for position in range(1, size + 1)]
+    entries = cache.get_many(entry_keys).values()
+    counts = cache.get_many([key for _, _, key in entries])
+
+    observed = cache.get(_slot_key(slot, 'observations')) or 0
+    observation_keys = [_slot_key(slot, f'observation:{position}') for position in range(1, observed + 1)]
+    observations = cache.get_many(observation_keys).values()
+
+    views = defaultdict(int)
+    for job_id, day, key in entries:
+        views[(job_id, day)] += counts.get(key, 0)
+    at = datetime.fromtimestamp(slot * settings.JOB_VIEW_BUFFER_SLOT, tz=dt_timezone.utc)
+    applied = apply_job_views(views, observations, at=at)
+
+    # Les clés de dédoublonnage des observations expirent d'elles-mêmes
+    cache.delete_many([
+        *entry_keys, *counts, *observation_keys,
+        _slot_key(slot, 'size'), _slot_key(slot, 'observations'),
+    ])
+    return applied
+
+
+def flush_job_views(now=None):
+    """
+    Reporte en base les vues des tranches terminées
+
+    La tranche en cours et la précédente sont laissées de côté (vues en cours
+    d'écriture). Chaque tranche est verrouillée par une clé du cache pendant son
+    traitement, et ses vues retirées du cache avant que le verrou ne soit levé :
+    deux exécutions concurrentes ne les appliquent pas deux fois. En cas
+    d'échec, les vues restent dans le cache pour l'exécution suivante.
+
+    Returns:
+        int: Nombre de vues appliquées
+    """
+    timeout = settings.JOB_VIEW_BUFFER_TIMEOUT
+    end = current_slot(now) - 1
+    # Tranches encore conservées par le cache
+    slots = range(end - timeout // settings.JOB_VIEW_BUFFER_SLOT, end)
+    sizes = cache.get_many([_slot_key(slot, 'size') for slot in slots])
+
+    applied = 0
+    for slot in slots:
+        size = sizes.get(_slot_key(slot, 'size'))
+        if not size or not cache.add(_slot_key(slot, 'lock'), True, timeout):
+            continue
+        try:
+            applied += _flush_slot(slot, size)
+        finally:
+            cache.delete(_slot_key(slot, 'lock'))
+    return applied
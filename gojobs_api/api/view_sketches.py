@@ -0,0 +1,97 @@
+# view_sketches.py
+
+from collections import defaultdict
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from .hyperloglog import HyperLogLog
+from .models import JobViewSketch
+
+
+def visitor_id(request):
+    """
+    Identifiant d'un visiteur pour le comptage des visiteurs distincts :
+    l'utilisateur connecté, sinon l'adresse IP et le navigateur
+
+    X-Forwarded-For n'est lu que derrière des proxys de confiance
+    (TRUSTED_PROXY_COUNT), et seulement l'adresse ajoutée par le premier
+    d'entre eux : les entrées précédentes sont fournies par le client.
+    """
+    if request.user.is_authenticated:
+        return f'user:{request.user.pk}'
+    address = request.META.get('REMOTE_ADDR', '')
+    if settings.TRUSTED_PROXY_COUNT:
+        forwarded = [entry.strip() for entry in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',')]
+        if len(forwarded) >= settings.TRUSTED_PROXY_COUNT and forwarded[-settings.TRUSTED_PROXY_COUNT]:
+            address = forwarded[-settings.TRUSTED_PROXY_COUNT]
+    return f"anon:{address}:{request.META.get('HTTP_USER_AGENT', '')}"
+
+
+def merge_view_observations(observations):
+    """
+    Fusionne des observations HyperLogLog dans les esquisses journalières
+
+    Les lignes absentes sont d'abord créées vides (ON CONFLICT DO NOTHING), puis
+    toutes verrouillées : deux fusions concurrentes d'un même jour s'appliquent
+    l'une après l'autre.
+
+    Args:
+        observations: Itérable de (job_id, date, index, rang)
+
+    Returns:
+        int: Nombre d'esquisses mises à jour
+    """
+    partials = defaultdict(HyperLogLog)
+    for job_id, day, index, rank in observations:
+        partials[(job_id, day)].add_observation(index, rank)
+    if not partials:
+        return 0
+
+    with transaction.atomic():
+        JobViewSketch.objects.bulk_create(
+            [JobViewSketch(job_id=job_id, date=day, sketch=b'') for job_id, day in sorted(partials)],
+            ignore_conflicts=True,
+        )
+        days = Q()
+        for job_id, day in partials:
+            days |= Q(job_id=job_id, date=day)
+        sketches = list(JobViewSketch.objects.select_for_update().filter(days).order_by('job_id', 'date'))
+
+        now = timezone.now()
+        for row in sketches:
+            merged = HyperLogLog.from_bytes(row.sketch).merge(partials[(row.job_id, row.date)])
+            row.sketch, row.updated_at = merged.to_bytes(), now
+        JobViewSketch.objects.bulk_update(sketches, ['sketch', 'updated_at'])
+    return len(sketches)
+
+
+def merged_sketch(sketches):
+    """Esquisse de l'union de plusieurs esquisses (queryset de JobViewSketch)."""
+    merged = HyperLogLog()
+    for data in sketches.values_list('sketch', flat=True).iterator():
+        merged.merge(HyperLogLog.from_bytes(data))
+    return merged
+
+
+def unique_viewers(jobs, start, end):
+    """
+    Visiteurs distincts d'une ou plusieurs offres sur une période (bornes
+    incluses), par fusion des esquisses journalières : un visiteur revenu
+    plusieurs jours, ou sur plusieurs offres, n'est compté qu'une fois
+
+    Args:
+        jobs: Offre, identifiant ou queryset d'offres
+    """
+    sketches = JobViewSketch.objects.filter(date__gte=start, date__lte=end)
+    if hasattr(jobs, 'values'):
+        sketches = sketches.filter(job__in=jobs.values('pk'))
+    else:
+        sketches = sketches.filter(job=jobs)
+    return merged_sketch(sketches).count()
+
+
+def daily_unique_viewers(job, start, end):
+    """Visiteurs distincts d'une offre jour par jour : dict {date: estimation}."""
+    sketches = JobViewSketch.objects.filter(job=job, date__gte=start, date__lte=end)
+    return {day: HyperLogLog.from_bytes(data).count() for day, data in sketches.values_list('date', 'sketch')}
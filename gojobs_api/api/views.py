@@ -1,5 +1,8 @@
 from datetime import datetime
+from functools import partial
+import json
 import uuid
+from django.conf import settings
 from django.shortcuts import render
 from django_filters.rest_framework import DjangoFilterBackend
 # from django.contrib.gis.geos import Point
@@ -10,10 +13,34 @@ from django.db.models import Avg, Sum, Case, When, F, Value
 from rest_framework import viewsets, permissions, status, filters
 from rest_framework.response import Response
 from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.exceptions import APIException
 from django.shortcuts import get_object_or_404
+from django.http import Http404
+from django.utils.dateparse import parse_date
 from .models import *
 from .serializers import *
 from .permissions import IsEmployer, IsCandidate, IsOwner, HasSubscription
+from .filters import JobFlagsFilter, JobSearchFilter
+from .pagination import JobKeysetPagination, JobPageNumberPagination, PAGINATION_PARAMS
+from .caching import query_signature
+from .conditional import (
+    conditional_response, feed_validators, job_validators, notification_validators,
+    subscription_plan_validators,
+)
+from .applicants import employer_applicants, job_applicants
+from .bulk import bulk_create_jobs
+from .counters import conversion_rate as conversion_percentage
+from .dashboard import employer_dashboard
+from .facets import job_facets
+from .feed_cache import cached_feed, is_cacheable
+from .fragments import serialize_jobs
+from .geo import filter_within_radius
+from .saved_searches import with_new_counts
+from .search import search_jobs
+from .suggestions import autocomplete as autocomplete_suggestions
+from .rollups import GRANULARITIES, day_start, job_timeseries, parse_stats_moment
+from .view_buffer import record_job_view
+from .view_sketches import daily_unique_viewers, unique_viewers, visitor_id
 from rest_framework.generics import ListAPIView
 from django.contrib.auth import get_user_model
 from rest_framework import status
@@ -177,6 +204,7 @@ class JobViewSet(viewsets.ModelViewSet):
     queryset = Job.objects.all()
     serializer_class = JobSerializer
     permission_classes = [permissions.AllowAny]
+    pagination_class = JobPageNumberPagination
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['title', 'description', 'city']
     ordering_fields = ['created_at', 'updated_at', 'salary_amount']
@@ -236,28 +264,75 @@ class JobViewSet(viewsets.ModelViewSet):
             else:
                 raise serializers.ValidationError({"user_id": "ID utilisateur requis"})
             
+    def requested_fields(self):
+        """Champs demandés par ?fields= ou ?view=card (lecture seule), None pour l'offre complète."""
+        if self.request.method != 'GET':
+            return None
+        return requested_job_fields(self.request.query_params)
+    
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault('fields', self.requested_fields())
+        return super().get_serializer(*args, **kwargs)
+    
     def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
+        return self.paginated_api_response(lambda: self.filter_queryset(self.get_queryset()))
+    
+    def paginated_api_response(self, get_queryset):
+        """
+        Réponse paginée au format {data, meta} attendu par le frontend
+        
+        Avec ?cursor=, pagination par curseur (meta.next_cursor) sans COUNT ni OFFSET ;
+        sinon pagination par numéro de page (meta.current_page, last_page, total),
+        le total étant mis en cache ou estimé (meta.total_is_exact).
+        Les réponses aux visiteurs anonymes sont mises en cache (voir feed_cache).
+        """
+        return conditional_response(self.request, partial(self.feed_response, get_queryset), feed_validators())
+    
+    def feed_response(self, get_queryset):
+        response = api_response(cached_feed(self.request, self.action, lambda: self.paginated_data(get_queryset())))
+        if is_cacheable(self.request):
+            # Corps identique pour tous les visiteurs anonymes : compressé une seule fois
+            response.compressed_cache_timeout = settings.JOB_FEED_CACHE_TIMEOUT
+        return response
+    
+    def paginated_data(self, queryset):
+        if JobKeysetPagination.is_requested(self.request):
+            paginator = JobKeysetPagination()
+            page = paginator.paginate_queryset(queryset, self.request, view=self)
+            return {
+                "data": self.serialize_jobs(page),
+                "meta": paginator.get_meta()
+            }
+        
         page = self.paginate_queryset(queryset)
         
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            response = self.get_paginated_response(serializer.data)
             # Adapter la structure pour correspondre à ce que le frontend attend
-            return api_response({
-                "data": serializer.data,
+            return {
+                "data": self.serialize_jobs(page),
                 "meta": {
                     "current_page": self.paginator.page.number,
                     "last_page": self.paginator.page.paginator.num_pages,
                     "per_page": self.paginator.page_size,
-                    "total": self.paginator.page.paginator.count
+                    "total": self.paginator.page.paginator.count,
+                    "total_is_exact": self.paginator.page.paginator.count_is_exact
                 }
-            })
+            }
         
-        serializer = self.get_serializer(queryset, many=True)
-        return api_response(serializer.data)
+        return self.serialize_jobs(queryset)
+    
+    def serialize_jobs(self, jobs):
+        """Sérialise une liste d'offres à partir des fragments en cache (voir api/fragments.py)."""
+        return serialize_jobs(jobs, self.get_serializer_context(), fields=self.requested_fields())
     
     def retrieve(self, request, *args, **kwargs):
+        # GET conditionnel : 304 sans sérialisation si l'offre n'a pas changé
+        validators, last_modified = job_validators(kwargs.get('pk'))
+        return conditional_response(
+            request, partial(self.retrieve_response, request, *args, **kwargs), validators, last_modified
+        )
+    
+    def retrieve_response(self, request, *args, **kwargs):
         try:
             instance = self.get_object()
             serializer = self.get_serializer(instance)
@@ -274,6 +349,55 @@ class JobViewSet(viewsets.ModelViewSet):
         print(serializer.errors)
         return api_response(None, serializer.errors, status_code=400)
     
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Publication en masse d'offres d'emploi
+        POST /api/jobs/bulk/
+        
+        Corps JSON : liste d'offres, ou {"user_id": ..., "jobs": [...]}.
+        En multipart, `jobs` est une liste JSON et chaque fichier envoyé est une
+        photo partagée, référencée par sa clé dans la liste `photos` des offres.
+        
+        Réservé aux utilisateurs connectés : les offres sont publiées pour leur
+        compte, ou pour celui de `user_id` par un membre de l'équipe (is_staff).
+        """
+        if not request.user.is_authenticated:
+            return api_response(None, "Authentification requise", status_code=401)
+        
+        data = request.data
+        rows = data if isinstance(data, list) else data.get('jobs')
+        if isinstance(rows, str):
+            try:
+                rows = json.loads(rows)
+            except ValueError:
+                rows = None
+        
+        if not isinstance(rows, list) or not rows:
+            return api_response(None, "Une liste d'offres (jobs) est requise", status_code=400)
+        if len(rows) > settings.JOB_BULK_MAX_ROWS:
+            return api_response(None, f"{settings.JOB_BULK_MAX_ROWS} offres au maximum par envoi", status_code=400)
+        
+        # user_id n'est pris en compte que pour l'équipe
+        user_id = None if isinstance(data, list) else data.get('user_id')
+        if user_id and request.user.is_staff:
+            try:
+                employer = User.objects.get(id=user_id)
+            except (User.DoesNotExist, ValueError):
+                return api_response(None, "Utilisateur non trouvé", status_code=404)
+        else:
+            employer = request.user
+        
+        files = {key: request.FILES[key] for key in request.FILES}
+        results = bulk_create_jobs(rows, employer, files=files, context=self.get_serializer_context())
+        
+        created = sum(1 for result in results if result['status'] == 'created')
+        return api_response(
+            {"results": results, "created": created, "errors": len(results) - created},
+            f"{created} offre(s) créée(s) sur {len(results)}",
+            status_code=201 if created else 400
+        )
+    
     @action(detail=False, methods=['GET'])
     def employer(self, request):
         """
@@ -290,12 +414,11 @@ class JobViewSet(viewsets.ModelViewSet):
             
         try:
             # Récupérer tous les emplois publiés par l'employeur spécifié
-            jobs = Job.objects.filter(
+            jobs = with_job_relations(Job.objects.filter(
                 employer_id=employer_id
-            ).order_by('-created_at')  # Supposant que tu as un champ 'created_at'
+            ).order_by('-created_at'), fields=self.requested_fields())  # Supposant que tu as un champ 'created_at'
             
-            serializer = self.get_serializer(jobs, many=True)
-            return Response(serializer.data)
+            return Response(self.serialize_jobs(jobs))
             
         except Exception as e:
             return Response(
@@ -379,15 +502,18 @@ class JobViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def search(self, request):
-        query = request.query_params.get('q', '')
-        category = request.query_params.get('category', None)
-        city = request.query_params.get('city', None)
-        contract_type = request.query_params.get('contract_type', None)
+        return self.paginated_api_response(self.search_queryset)
+    
+    def search_queryset(self):
+        query = self.request.query_params.get('q', '')
+        category = self.request.query_params.get('category', None)
+        city = self.request.query_params.get('city', None)
+        contract_type = self.request.query_params.get('contract_type', None)
         
         jobs = Job.objects.filter(status='active')
         
         if query:
-            jobs = jobs.filter(title__icontains=query) | jobs.filter(description__icontains=query)
+            jobs = search_jobs(jobs, query)
         
         if category:
             jobs = jobs.filter(category=category)
@@ -398,37 +524,40 @@ class JobViewSet(viewsets.ModelViewSet):
         if contract_type:
             jobs = jobs.filter(contract_type=contract_type)
         
-        # Pagination
-        page = self.paginate_queryset(jobs)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            response = self.get_paginated_response(serializer.data)
-            # Adapter la structure pour correspondre à ce que le frontend attend
-            return api_response({
-                "data": serializer.data,
-                "meta": {
-                    "current_page": self.paginator.page.number,
-                    "last_page": self.paginator.page.paginator.num_pages,
-                    "per_page": self.paginator.page_size,
-                    "total": self.paginator.page.paginator.count
-                }
-            })
+        return with_job_relations(jobs, fields=self.requested_fields(), columns=self.ordering_fields)
+    
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """
+        Suggestions d'autocomplétion pour la barre de recherche
+        GET /api/jobs/autocomplete/?q=<texte>&kind=title,city,company&limit=<n>
+        """
+        query = request.query_params.get('q', '')
+        kinds = [kind for kind in request.query_params.get('kind', '').split(',') if kind]
         
-        serializer = self.get_serializer(jobs, many=True)
-        return api_response(serializer.data)
+        try:
+            limit = min(max(int(request.query_params.get('limit', 8)), 1), 20)
+        except ValueError:
+            limit = 8
+        
+        return api_response(autocomplete_suggestions(query, kinds=kinds, limit=limit))
     
+    @action(detail=False, methods=['get'])
+    def facets(self, request):
+        """
+        Compteurs de l'écran de filtres : par catégorie, ville, type de contrat,
+        type de salaire et critère booléen, pour les mêmes filtres que la liste
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        signature = query_signature(request.query_params, ignored=PAGINATION_PARAMS)
+        return api_response(job_facets(queryset, signature))
     
-    filter_backends = [filters.SearchFilter, DjangoFilterBackend, filters.OrderingFilter]
-    filterset_fields = [
-        'category', 'subcategory', 'contract_type', 'city',
-        'is_urgent', 'is_new', 'is_top', 'status',
-        'accepts_working_visa', 'accepts_holiday_visa', 'accepts_student_visa',
-        'has_accommodation', 'accommodation_accepts_children', 'accommodation_accepts_dogs',
-        'accommodation_is_accessible', 'job_accepts_handicapped', 'has_company_car',
-        'is_entry_level', 'requires_driving_license'
-    ]
-    search_fields = ['title', 'description', 'company_name', 'city', 'address']
-    ordering_fields = ['created_at', 'updated_at', 'salary_amount', 'applications_count', 'views_count']
+    filter_backends = [JobSearchFilter, JobFlagsFilter, DjangoFilterBackend, filters.OrderingFilter]
+    # Les critères booléens (is_urgent, has_accommodation...) sont filtrés par JobFlagsFilter
+    filterset_fields = ['category', 'subcategory', 'contract_type', 'city', 'status']
+    # Champs couverts par le vecteur de recherche plein texte (Job.search_vector)
+    search_fields = ['title', 'description', 'company', 'city']
+    ordering_fields = ['created_at', 'updated_at', 'salary_amount', 'applications_count', 'views_count', 'rank_score']
     
     @action(detail=False, methods=['get'])
     def recommended(self, request):
@@ -450,7 +579,7 @@ class JobViewSet(viewsets.ModelViewSet):
         
         # Formater la réponse
         job_ids = [job.id for job, _ in recommendations]
-        jobs = Job.objects.filter(id__in=job_ids)
+        jobs = with_job_relations(Job.objects.filter(id__in=job_ids))
         
         # Associer les scores aux emplois
         job_scores = {job.id: score for job, score in recommendations}
@@ -474,7 +603,9 @@ class JobViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
     
     def get_queryset(self):
-        queryset = Job.objects.filter(status='active')
+        # Ordre par défaut du fil : boosts, urgence et fraîcheur (index job_feed_rank_idx) ;
+        # remplacé par la pertinence (?search=), la distance ou ?ordering=
+        queryset = Job.objects.filter(status='active').order_by('-rank_score', '-id')
         
         # Filtrer par salaire
         salary_min = self.request.query_params.get('salary_min')
@@ -498,7 +629,7 @@ class JobViewSet(viewsets.ModelViewSet):
         if salary_type:
             queryset = queryset.filter(salary_type=salary_type)
         
-        # Filtrer par distance (si la latitude et longitude sont fournies)
+        # Filtrer par distance (km) autour d'une position, du plus proche au plus lointain
         lat = self.request.query_params.get('lat')
         lng = self.request.query_params.get('lng')
         distance = self.request.query_params.get('distance')
@@ -508,66 +639,20 @@ class JobViewSet(viewsets.ModelViewSet):
                 lat = float(lat)
                 lng = float(lng)
                 distance = float(distance)
-                
-                # Calculer un carré approximatif autour du point
-                # 1 degré ≈ 111 km à l'équateur (approximation)
-                delta = distance / 111.0
-                
-                # Filtrer les emplois dans le carré approximatif
-                queryset = queryset.filter(
-                    latitude__gte=lat-delta,
-                    latitude__lte=lat+delta,
-                    longitude__gte=lng-delta,
-                    longitude__lte=lng+delta
-                )
             except ValueError:
                 pass
+            else:
+                if -90 <= lat <= 90 and -180 <= lng <= 180 and distance > 0:
+                    queryset = filter_within_radius(queryset, lat, lng, distance)
         
-        # Filtrer par options de logement
-        accommodation = self.request.query_params.get('accommodation')
-        if accommodation == 'true':
-            queryset = queryset.filter(has_accommodation=True)
-            
-            # Sous-filtres pour le logement
-            children = self.request.query_params.get('accommodation_children')
-            pets = self.request.query_params.get('accommodation_pets')
-            accessible = self.request.query_params.get('accommodation_accessible')
-            
-            if children == 'true':
-                queryset = queryset.filter(accommodation_accepts_children=True)
-            
-            if pets == 'true':
-                queryset = queryset.filter(accommodation_accepts_dogs=True)
-            
-            if accessible == 'true':
-                queryset = queryset.filter(accommodation_is_accessible=True)
-        
-        # Filtrer par véhicule de fonction
-        company_car = self.request.query_params.get('company_car')
-        if company_car == 'true':
-            queryset = queryset.filter(has_company_car=True)
-        
-        # Filtrer par niveau d'expérience
-        entry_level = self.request.query_params.get('entry_level')
-        if entry_level == 'true':
-            queryset = queryset.filter(is_entry_level=True)
-        
-        # Filtrer par type de visa
-        visa_type = self.request.query_params.get('visa_type')
-        if visa_type:
-            if visa_type == 'work':
-                queryset = queryset.filter(accepts_working_visa=True)
-            elif visa_type == 'holiday':
-                queryset = queryset.filter(accepts_holiday_visa=True)
-            elif visa_type == 'student':
-                queryset = queryset.filter(accepts_student_visa=True)
+        # Logement, véhicule, niveau d'expérience et visa : voir JobFlagsFilter
         
         # Filtrer pour les backpackers
         for_backpackers = self.request.query_params.get('for_backpackers')
         if for_backpackers == 'true':
-            queryset = queryset.filter(
-                Q(accepts_working_visa=True) | 
-                Q(accepts_holiday_visa=True) |
+            visa_mask = JOB_FLAG_BITS['accepts_working_visa'] | JOB_FLAG_BITS['accepts_holiday_visa']
+            queryset = queryset.alias(visa_flags=F('flags').bitand(visa_mask)).filter(
+                Q(visa_flags__gt=0) |
                 Q(subcategory='backpacker')
             )
         
@@ -579,31 +664,41 @@ class JobViewSet(viewsets.ModelViewSet):
                 Q(subcategory='freelance')
             )
         
-        return queryset
+        # Employeur, photos et nombre d'offres de l'employeur lus par JobSerializer ;
+        # colonnes de tri chargées pour le curseur de pagination
+        return with_job_relations(queryset, fields=self.requested_fields(), columns=self.ordering_fields)
+    
+    @action(detail=True, methods=['get'])
+    def applicants(self, request, pk=None):
+        """
+        Candidats d'une offre, pour son employeur
+        GET /api/jobs/<id>/applicants/?ordering=-created_at&status=<statut>&is_read=<bool>&page=<n>
+        
+        L'offre est renvoyée une seule fois, suivie d'une page de candidatures
+        compactes (tris : created_at, status, is_read, nom).
+        """
+        job = get_object_or_404(Job, pk=pk)
+        if not request.user.is_authenticated or (job.employer_id != request.user.id and not request.user.is_staff):
+            return api_response(None, "Vous n'êtes pas autorisé à voir ces candidatures", status_code=403)
+        
+        return api_response(job_applicants(job, request, view=self))
     
     @action(detail=True, methods=['post'], url_path='view')
     def record_view(self, request, pk=None):
         """
         Enregistre une vue pour une offre d'emploi spécifique.
-        """
-        job = self.get_object()
-        
-        # Incrémenter le compteur de vues
-        job.views_count += 1
-        job.save(update_fields=['views_count'])
         
-        # Créer ou mettre à jour les statistiques journalières
-        today = timezone.now().date()
-        stat, created = Statistic.objects.get_or_create(
-            job=job,
-            date=today,
-            defaults={'views': 1}
-        )
+        Avec un cache partagé, la vue est comptée dans le tampon, sans accès à
+        la base ; le compteur de l'offre et les statistiques journalières sont
+        mis à jour par lots (tâche planifiée ou commande flush_job_views). Sinon
+        elle est appliquée directement (voir record_job_view).
+        """
+        try:
+            job_id = int(pk)
+        except (TypeError, ValueError):
+            raise Http404
         
-        # Si les statistiques existaient déjà, incrémenter les vues
-        if not created:
-            stat.views += 1
-            stat.save(update_fields=['views'])
+        record_job_view(job_id, visitor=visitor_id(request))
         
         return Response({"status": "success", "message": "Vue enregistrée avec succès"})
     
@@ -736,11 +831,22 @@ class ApplicationViewSet(viewsets.ModelViewSet):
             # if request.user.role != 'employer':
             #     return api_response(None, "Accès limité aux employeurs", status_code=403)
             
-            applications = Application.objects.filter(job__employer_id=employer_id)
+            # Représentation compacte : offres une seule fois, candidatures paginées et triées
+            if request.query_params.get('view') == 'compact':
+                if not request.user.is_authenticated or (employer_id != request.user.pk and not request.user.is_staff):
+                    return api_response(None, "Vous n'êtes pas autorisé à voir ces candidatures", status_code=403)
+                return api_response(employer_applicants(employer_id, request, view=self))
+            
+            applications = Application.objects.filter(job__employer_id=employer_id).select_related(
+                'job__employer', 'candidate'
+            ).prefetch_related('job__photos')
             serializer = self.get_serializer(applications, many=True)
             return api_response(serializer.data)
         except ValueError:
             return api_response(None, "ID d'employeur invalide", status_code=400)
+        except APIException:
+            # Erreurs DRF (page inconnue de la pagination...) : réponse d'erreur standard
+            raise
         except Exception as e:
             return api_response(None, f"Erreur lors de la récupération des candidatures: {str(e)}", status_code=500)
 
@@ -899,8 +1005,7 @@ class SubscriptionPlanViewSet(viewsets.ReadOnlyModelViewSet):
             is_active=True, 
             type__in=['basic_pro', 'standard_pro', 'premium_pro']
         )
-        serializer = self.get_serializer(plans, many=True)
-        return Response(serializer.data)
+        return self.conditional_list(request, plans)
     
     @action(detail=False, methods=['get'])
     def candidate_plans(self, request):
@@ -909,8 +1014,18 @@ class SubscriptionPlanViewSet(viewsets.ReadOnlyModelViewSet):
             is_active=True, 
             type__in=['apply_ai', 'apply_ai_pro']
         )
-        serializer = self.get_serializer(plans, many=True)
-        return Response(serializer.data)
+        return self.conditional_list(request, plans)
+    
+    def list(self, request, *args, **kwargs):
+        return conditional_response(
+            request, partial(super().list, request, *args, **kwargs), *subscription_plan_validators()
+        )
+    
+    def conditional_list(self, request, plans):
+        """Liste de formules avec GET conditionnel (ETag / Last-Modified)."""
+        return conditional_response(
+            request, lambda: Response(self.get_serializer(plans, many=True).data), *subscription_plan_validators()
+        )
 
 
 class SubscriptionViewSet(viewsets.ModelViewSet):
@@ -1308,17 +1423,14 @@ class FlashJobViewSet(viewsets.ModelViewSet):
             return Response({"detail": "Vous avez déjà postulé à cet emploi flash"}, 
                            status=status.HTTP_400_BAD_REQUEST)
         
-        # Créer une candidature
+        # Créer une candidature (compteur de candidats de l'emploi flash incrémenté en SQL,
+        # voir api/counters.py)
         application = Application.objects.create(
             job=flash_job.job,
             candidate=request.user,
             status='pending'
         )
         
-        # Incrémenter le compteur de candidatures
-        flash_job.current_applicants += 1
-        flash_job.save()
-        
         # Créer une notification pour l'employeur
         Notification.objects.create(
             user=flash_job.job.employer,
@@ -1483,6 +1595,12 @@ class NotificationViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         return Notification.objects.filter(user=self.request.user).order_by('-created_at')
     
+    def list(self, request, *args, **kwargs):
+        # GET conditionnel : 304 tant qu'aucune notification n'est créée, supprimée ou lue
+        return conditional_response(
+            request, partial(super().list, request, *args, **kwargs), notification_validators(request.user)
+        )
+    
     @action(detail=True, methods=['put'], url_path='read')
     def mark_as_read(self, request, pk=None):
         """
@@ -1554,85 +1672,10 @@ class StatisticsViewSet(viewsets.ViewSet):
     def dashboard(self, request):
         """
         Obtenir les statistiques du tableau de bord de l'employeur.
-        Inclut des données agrégées sur toutes les offres d'emploi de l'employeur.
+        Inclut des données agrégées sur toutes les offres d'emploi de l'employeur,
+        mises en cache par employeur et invalidées à chaque écriture (voir api/dashboard.py).
         """
-        user = request.user
-        jobs = Job.objects.filter(employer=user)
-        
-        # Statistiques de base
-        total_jobs = jobs.count()
-        active_jobs = jobs.filter(status='active').count()
-        total_applications = Application.objects.filter(job__employer=user).count()
-        new_applications = Application.objects.filter(job__employer=user, is_read=False).count()
-        
-        # Calculer le taux de CV (conversion)
-        total_views = sum(job.views_count for job in jobs)
-        cv_rate = round((total_applications / total_views * 100), 2) if total_views > 0 else 0
-        
-        # Récupérer les données pour les graphiques
-        # Récupérer les 14 derniers jours de statistiques
-        end_date = timezone.now().date()
-        start_date = end_date - timedelta(days=13)
-        
-        # Créer un dictionnaire avec toutes les dates
-        date_range = [start_date + timedelta(days=i) for i in range(14)]
-        views_data = {date: 0 for date in date_range}
-        application_data = {date: 0 for date in date_range}
-        
-        # Remplir avec les données réelles
-        stats = Statistic.objects.filter(
-            job__in=jobs,
-            date__gte=start_date,
-            date__lte=end_date
-        ).values('date').annotate(
-            total_views=Sum('views'),
-            total_applications=Sum('applications')
-        )
-        
-        for stat in stats:
-            date = stat['date']
-            views_data[date] = stat['total_views']
-            application_data[date] = stat['total_applications']
-        
-        # Formater pour la réponse
-        views_chart_data = {
-            'labels': [date.strftime('%d/%m') for date in date_range],
-            'values': [views_data[date] for date in date_range]
-        }
-        
-        application_chart_data = {
-            'labels': [date.strftime('%d/%m') for date in date_range],
-            'values': [application_data[date] for date in date_range]
-        }
-        
-        # Meilleures offres d'emploi
-        top_jobs = jobs.annotate(
-            cv_count=Count('applications'),
-            cv_rate=Case(
-                When(views_count__gt=0, then=F('applications_count') * 100.0 / F('views_count')),
-                default=Value(0.0)
-            )
-        ).order_by('-cv_count')[:5]
-        
-        active_jobs_data = [{
-            'id': job.id,
-            'title': job.title,
-            'views': job.views_count,
-            'cvCount': job.applications_count,
-            'cvRate': round(job.conversion_rate, 2)
-        } for job in top_jobs]
-        
-        return Response({
-            'totalJobs': total_jobs,
-            'activeJobs': active_jobs,
-            'totalApplications': total_applications,
-            'totalViews': total_views,
-            'cvRate': cv_rate,
-            'newApplications': new_applications,
-            'viewsData': views_chart_data,
-            'applicationData': application_chart_data,
-            'activeJobsData': active_jobs_data
-        })
+        return Response(employer_dashboard(request.user.pk))
     
     @action(detail=False, methods=['get'], url_path='job/(?P<job_id>[^/.]+)')
     def job_stats(self, request, job_id=None):
@@ -1646,28 +1689,29 @@ class StatisticsViewSet(viewsets.ViewSet):
         end_date = timezone.now().date()
         start_date = end_date - timedelta(days=30)  # Dernier mois
         
-        # Créer un dictionnaire avec toutes les dates
-        date_range = [start_date + timedelta(days=i) for i in range(31)]
-        daily_stats = {date: {'views': 0, 'applications': 0, 'conversion_rate': 0} for date in date_range}
-        
-        # Récupérer les statistiques réelles
-        stats = Statistic.objects.filter(
-            job=job,
-            date__gte=start_date,
-            date__lte=end_date
-        ).order_by('date')
-        
-        for stat in stats:
-            daily_stats[stat.date] = {
-                'views': stat.views,
-                'applications': stat.applications,
-                'conversion_rate': stat.conversion_rate
+        # Statistiques agrégées par jour, jours sans activité compris
+        start = day_start(start_date)
+        series = job_timeseries(job, start, start + timedelta(days=31), resolution='day')
+        date_range = [point['bucket'].date() for point in series['points']]
+        daily_stats = {
+            point['bucket'].date(): {
+                'views': point['views'],
+                'applications': point['applications'],
+                'conversion_rate': conversion_percentage(point['applications'], point['views'])
             }
+            for point in series['points']
+        }
+        
+        # Visiteurs distincts par jour et sur la période (esquisses HyperLogLog)
+        daily_unique = daily_unique_viewers(job, start_date, end_date)
+        unique_views = unique_viewers(job, start_date, end_date)
+        period_applications = sum(daily_stats[date]['applications'] for date in date_range)
         
         # Formater les données pour les graphiques
         charts_data = {
             'labels': [date.strftime('%d/%m') for date in date_range],
             'views': [daily_stats[date]['views'] for date in date_range],
+            'unique_views': [daily_unique.get(date, 0) for date in date_range],
             'applications': [daily_stats[date]['applications'] for date in date_range],
             'conversion_rates': [daily_stats[date]['conversion_rate'] for date in date_range]
         }
@@ -1694,6 +1738,8 @@ class StatisticsViewSet(viewsets.ViewSet):
             'views': total_views,
             'applications': total_applications,
             'conversion_rate': conversion_rate,
+            'unique_viewers': unique_views,
+            'unique_conversion_rate': round(period_applications / unique_views * 100, 2) if unique_views else 0,
             'views_comparison': round(views_comparison, 2),
             'applications_comparison': round(applications_comparison, 2),
             'conversion_comparison': round(conversion_comparison, 2),
@@ -1703,6 +1749,97 @@ class StatisticsViewSet(viewsets.ViewSet):
             'days_until_expiry': job.days_until_expiry
         })
     
+    @action(detail=False, methods=['get'])
+    def timeseries(self, request):
+        """
+        Vues et candidatures des offres de l'employeur (ou d'une offre) par heure, jour ou mois
+        GET /api/statistics/timeseries/?hours=6&job_id=<id>
+        GET /api/statistics/timeseries/?start=<date ou date-heure>&end=<...>&resolution=hour|day|month
+        
+        Le niveau interrogé est le plus grossier qui couvre l'intervalle à la
+        résolution demandée (heures conservées JOB_STATS_HOURLY_RETENTION_DAYS
+        jours, jours JOB_STATS_DAILY_RETENTION_DAYS jours, mois sans limite) ;
+        il est renvoyé dans `granularity`.
+        """
+        now = timezone.now()
+        try:
+            end = parse_stats_moment(request.query_params.get('end')) or now
+            hours = request.query_params.get('hours')
+            if hours:
+                start = end - timedelta(hours=int(hours))
+            else:
+                start = parse_stats_moment(request.query_params.get('start')) or end - timedelta(days=1)
+        except ValueError:
+            return Response({"detail": "Intervalle invalide"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        resolution = request.query_params.get('resolution') or None
+        if resolution not in (None, *GRANULARITIES):
+            return Response({"detail": "Résolution invalide (hour, day ou month)"}, status=status.HTTP_400_BAD_REQUEST)
+        if start >= end or end - start > timedelta(days=settings.JOB_STATS_MAX_RANGE_DAYS):
+            return Response({"detail": "Intervalle invalide"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        jobs = Job.objects.filter(employer=request.user)
+        job_id = request.query_params.get('job_id')
+        if job_id:
+            try:
+                jobs = jobs.filter(id=int(job_id))
+            except ValueError:
+                return Response({"detail": "Identifiant d'offre invalide"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        series = job_timeseries(jobs, start, end, resolution=resolution)
+        return Response({
+            'start': start,
+            'end': end,
+            'granularity': series['granularity'],
+            'labels': [point['bucket'] for point in series['points']],
+            'views': [point['views'] for point in series['points']],
+            'applications': [point['applications'] for point in series['points']],
+        })
+    
+    @action(detail=False, methods=['get'], url_path='unique-viewers')
+    def unique_viewer_stats(self, request):
+        """
+        Visiteurs distincts des offres de l'employeur (ou d'une offre) sur une période
+        GET /api/statistics/unique-viewers/?start=AAAA-MM-JJ&end=AAAA-MM-JJ&job_id=<id>
+        
+        Estimation par fusion des esquisses journalières : un visiteur revenu
+        plusieurs jours n'est compté qu'une fois.
+        """
+        try:
+            end_date = parse_date(request.query_params.get('end') or '') or timezone.now().date()
+            start_date = parse_date(request.query_params.get('start') or '') or end_date - timedelta(days=29)
+        except ValueError:
+            return Response({"detail": "Date invalide (format AAAA-MM-JJ)"}, status=status.HTTP_400_BAD_REQUEST)
+        if start_date > end_date:
+            return Response({"detail": "La date de début doit précéder la date de fin"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        # Une esquisse par offre et par jour est fusionnée : période bornée
+        if end_date - start_date >= timedelta(days=settings.JOB_UNIQUE_VIEWERS_MAX_RANGE_DAYS):
+            return Response({"detail": "Intervalle invalide"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        jobs = Job.objects.filter(employer=request.user)
+        job_id = request.query_params.get('job_id')
+        if job_id:
+            try:
+                jobs = jobs.filter(id=int(job_id))
+            except ValueError:
+                return Response({"detail": "Identifiant d'offre invalide"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        views = Statistic.objects.filter(
+            job__in=jobs, date__gte=start_date, date__lte=end_date
+        ).aggregate(views=Sum('views'), applications=Sum('applications'))
+        unique_views = unique_viewers(jobs, start_date, end_date)
+        applications = views['applications'] or 0
+        
+        return Response({
+            'start': start_date,
+            'end': end_date,
+            'views': views['views'] or 0,
+            'uniqueViewers': unique_views,
+            'applications': applications,
+            'uniqueCvRate': round(applications / unique_views * 100, 2) if unique_views else 0,
+        })
+    
     @action(detail=False, methods=['get'])
     def performance_by_type(self, request):
         """
@@ -2015,4 +2152,50 @@ class UserConnectionViewSet(viewsets.ModelViewSet):
         )
         
         serializer = self.get_serializer(accepted_connections, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        return Response(serializer.data)
+
+
+class SavedSearchViewSet(viewsets.ModelViewSet):
+    serializer_class = SavedSearchSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get_queryset(self):
+        return with_new_counts(SavedSearch.objects.filter(user=self.request.user))
+    
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+    
+    def list(self, request, *args, **kwargs):
+        serializer = self.get_serializer(self.get_queryset(), many=True)
+        return api_response(serializer.data)
+    
+    @action(detail=False, methods=['get'], url_path='new-counts')
+    def new_counts(self, request):
+        """
+        Nombre de nouveaux résultats de chaque recherche sauvegardée depuis sa dernière consultation
+        """
+        counts = self.get_queryset().order_by().values('id', 'new_count')
+        return api_response({item['id']: item['new_count'] for item in counts})
+    
+    @action(detail=True, methods=['get'])
+    def results(self, request, pk=None):
+        """
+        Offres trouvées pour une recherche sauvegardée (les plus récentes d'abord),
+        puis marque la recherche comme consultée
+        """
+        saved_search = self.get_object()
+        jobs = with_job_relations(Job.objects.filter(
+            saved_search_matches__saved_search=saved_search,
+            status='active'
+        ).order_by('-saved_search_matches__matched_at'))
+        
+        page = self.paginate_queryset(jobs)
+        data = serialize_jobs(page if page is not None else jobs, self.get_serializer_context())
+        
+        saved_search.last_seen_at = timezone.now()
+        saved_search.save(update_fields=['last_seen_at'])
+        
+        return api_response({
+            "data": data,
+            "new_count": saved_search.new_count
+        })
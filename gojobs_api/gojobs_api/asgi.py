@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'gojobs_api.settings')
 
 application = get_asgi_application()
+
+# Planificateur intégré (JOB_SCHEDULER_ENABLED) : processus serveurs uniquement
+from api import scheduler  # noqa: E402
+
+scheduler.start()
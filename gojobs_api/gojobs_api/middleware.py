@@ -1,9 +1,27 @@
 # core/middleware.py
 
+import hashlib
 import json
+from django.conf import settings
+from django.core.cache import cache
 from django.http import JsonResponse
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
 from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_string
 from rest_framework.response import Response
+from api.renderers import EnvelopeJSONRenderer
+
+try:
+    import brotli
+except ImportError:  # Compression gzip uniquement
+    brotli = None
+
+# Niveaux de compression (brotli) : réponses compressées à chaque requête,
+# réponses compressées une fois puis mises en cache ; gzip au niveau de
+# compress_string (6)
+BROTLI_QUALITY = 5
+BROTLI_CACHED_QUALITY = 9
 
 class APIResponseMiddleware(MiddlewareMixin):
     """
@@ -22,6 +40,13 @@ class APIResponseMiddleware(MiddlewareMixin):
         if 'application/json' not in response.get('Content-Type', ''):
             return response
         
+        # Réponses DRF : enveloppe appliquée au rendu (EnvelopeJSONRenderer), sans
+        # relecture ; sans API_RESPONSE_ENVELOPE, le rendu ne l'applique pas
+        if settings.API_RESPONSE_ENVELOPE and isinstance(
+            getattr(response, 'accepted_renderer', None), EnvelopeJSONRenderer
+        ):
+            return response
+        
         # Essayer de décoder le contenu JSON
         try:
             content = json.loads(response.content.decode('utf-8'))
@@ -41,4 +66,105 @@ class APIResponseMiddleware(MiddlewareMixin):
             return response
         except (json.JSONDecodeError, UnicodeDecodeError):
             # Si le contenu n'est pas du JSON valide, ne pas le modifier
-            return response
\ No newline at end of file
+            return response
+
+
+def negotiate_encoding(accept_encoding, padded=False):
+    """
+    Choisit le codage de contenu d'une réponse d'après l'en-tête Accept-Encoding
+
+    Args:
+        padded: Réponse à compresser avec remplissage aléatoire (gzip seulement)
+
+    Returns:
+        'br', 'gzip' ou None (réponse non compressée)
+    """
+    supported = ['br', 'gzip'] if brotli is not None and not padded else ['gzip']
+    weights = {}
+    for item in accept_encoding.split(','):
+        coding, _, params = item.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[coding] = weight
+
+    candidates = [
+        (weights.get(coding, weights.get('*', 0.0)), -rank, coding)
+        for rank, coding in enumerate(supported)
+    ]
+    weight, _, coding = max(candidates)
+    return coding if weight > 0 else None
+
+
+def is_private(request):
+    """
+    Réponse susceptible de mêler une entrée reflétée et des secrets (jetons,
+    données du compte) : requête authentifiée ou autre qu'une lecture
+    (connexion, inscription...)
+    """
+    if request.method not in ('GET', 'HEAD') or 'HTTP_AUTHORIZATION' in request.META:
+        return True
+    user = getattr(request, 'user', None)
+    return bool(user and user.is_authenticated)
+
+
+def compress(content, encoding, cached=False, padded=False):
+    if encoding == 'br':
+        return brotli.compress(content, quality=BROTLI_CACHED_QUALITY if cached else BROTLI_QUALITY)
+    # Remplissage aléatoire de l'en-tête gzip contre BREACH, comme GZipMiddleware
+    return compress_string(content, max_random_bytes=GZipMiddleware.max_random_bytes if padded else None)
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compression négociée (brotli, gzip) des réponses de plus de API_COMPRESSION_MIN_SIZE octets
+
+    Une réponse issue d'un cache (attribut compressed_cache_timeout, voir
+    JobViewSet.feed_response) est compressée une seule fois : le corps
+    compressé est mis en cache sous l'empreinte du corps d'origine.
+
+    Les réponses privées (is_private) sont compressées en gzip avec le
+    remplissage aléatoire de GZipMiddleware (atténuation de BREACH), jamais en
+    brotli ni depuis le cache.
+    """
+    
+    def process_response(self, request, response):
+        if getattr(response, 'streaming', False) or response.has_header('Content-Encoding'):
+            return response
+        if len(response.content) < settings.API_COMPRESSION_MIN_SIZE:
+            return response
+        
+        patch_vary_headers(response, ('Accept-Encoding',))
+        padded = is_private(request)
+        encoding = negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''), padded=padded)
+        if encoding is None:
+            return response
+        
+        timeout = getattr(response, 'compressed_cache_timeout', None)
+        if timeout and not padded:
+            key = f'compressed:{encoding}:{hashlib.md5(response.content).hexdigest()}'
+            body = cache.get(key)
+            if body is None:
+                body = compress(response.content, encoding, cached=True)
+                cache.set(key, body, timeout)
+        else:
+            body = compress(response.content, encoding, padded=padded)
+        
+        if len(body) >= len(response.content):
+            return response
+        
+        response.content = body
+        response['Content-Length'] = str(len(body))
+        response['Content-Encoding'] = encoding
+        # Le corps transmis n'est plus celui de l'ETag : ETag faible (comme GZipMiddleware)
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
@@ -39,6 +39,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'rest_framework_simplejwt',
     'rest_framework_simplejwt.token_blacklist',
@@ -50,6 +51,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # Compression des réponses (avant les middlewares qui lisent ou modifient le corps)
+    'gojobs_api.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -100,6 +103,20 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# Mémoire locale par défaut ; en production, configurer un cache partagé
+# (ex. CACHE_BACKEND=django.core.cache.backends.redis.RedisCache). Le tampon des
+# vues (JOB_VIEW_BUFFER_ENABLED) exige un cache partagé entre processus.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'gojobs'),
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -152,6 +169,11 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.AllowAny',  # Pour permettre l'accès aux endpoints d'authentification
     ],
     # 'EXCEPTION_HANDLER': 'gojobs_api.utils.custom_exception_handler', 
+    # Enveloppe {status, data, message} et encodage orjson en une seule passe
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.EnvelopeJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
         'rest_framework.filters.SearchFilter',
@@ -191,6 +213,56 @@ AUTHENTICATION_BACKENDS = [
     'api.backends.EmailBackend',
     'django.contrib.auth.backends.ModelBackend',  # Gardez ceci comme fallback
 ]
+# Nombre total d'offres dans les réponses paginées
+JOB_COUNT_CACHE_TIMEOUT = 60  # secondes
+JOB_COUNT_ESTIMATE_THRESHOLD = 10000  # au-delà, estimation du planificateur PostgreSQL
+# Compteurs de l'écran de filtres (/api/jobs/facets/)
+JOB_FACETS_CACHE_TIMEOUT = 300  # secondes
+# Listes et recherches d'offres des visiteurs anonymes
+JOB_FEED_CACHE_TIMEOUT = 60  # secondes
+# Fragments sérialisés des offres, par version (compteurs rafraîchis à l'expiration)
+JOB_FRAGMENT_CACHE_TIMEOUT = 300  # secondes
+# Placer toutes les réponses /api/ dans l'enveloppe {status, data, message} au rendu
+# (remplace APIResponseMiddleware pour les réponses DRF)
+API_RESPONSE_ENVELOPE = os.getenv('API_RESPONSE_ENVELOPE', 'false').lower() == 'true'
+# Compression brotli / gzip des réponses à partir de cette taille
+API_COMPRESSION_MIN_SIZE = 1024  # octets
+# Publication en masse (/api/jobs/bulk/)
+JOB_BULK_MAX_ROWS = 500
+JOB_BULK_BATCH_SIZE = 100
+# Cycle de vie des offres (commande sweep_jobs ou planificateur intégré)
+JOB_SWEEP_BATCH_SIZE = 1000
+JOB_NEW_MAX_AGE_DAYS = 7  # durée du badge « nouveau »
+JOB_SWEEP_INTERVAL = 15 * 60  # secondes
+# Vues des offres (/api/jobs/<id>/view/) cumulées dans le cache, reportées en base
+# par lots (commande flush_job_views ou planificateur intégré). Le cache doit être
+# partagé entre processus (CACHE_BACKEND) : avec le cache local par défaut, chaque
+# vue est écrite directement en base (compteur de l'offre et statistique du jour
+# seulement : vues des employeurs, statistiques agrégées et visiteurs distincts
+# exigent le tampon). None : selon CACHE_BACKEND
+JOB_VIEW_BUFFER_ENABLED = {'true': True, 'false': False}.get(os.getenv('JOB_VIEW_BUFFER_ENABLED', '').lower())
+JOB_VIEW_BUFFER_SLOT = 10  # secondes, durée d'une tranche du tampon
+JOB_VIEW_FLUSH_INTERVAL = 60  # secondes
+JOB_VIEW_BUFFER_TIMEOUT = 60 * 60  # secondes, vues perdues si elles ne sont pas reportées avant
+# Statistiques agrégées des offres : heures et jours conservés, mois sans limite
+# (purge par la commande compact_job_stats ou le planificateur intégré)
+JOB_STATS_HOURLY_RETENTION_DAYS = 14
+JOB_STATS_DAILY_RETENTION_DAYS = 2 * 365
+JOB_STATS_COMPACT_INTERVAL = 60 * 60  # secondes
+JOB_STATS_MAX_RANGE_DAYS = 10 * 365  # intervalle maximal de /api/statistics/timeseries/
+JOB_UNIQUE_VIEWERS_MAX_RANGE_DAYS = 90  # jours fusionnés au plus par /api/statistics/unique-viewers/
+# Proxys inverses de confiance devant l'application : l'adresse des visiteurs est
+# lue dans X-Forwarded-For (ajoutée par le dernier d'entre eux), sinon REMOTE_ADDR
+TRUSTED_PROXY_COUNT = int(os.getenv('TRUSTED_PROXY_COUNT', '0'))
+# Tableau de bord des employeurs (/api/statistics/dashboard/), invalidé à chaque
+# écriture sur leurs offres ou candidatures ; les vues y apparaissent à l'expiration
+EMPLOYER_DASHBOARD_CACHE_TIMEOUT = 60  # secondes
+EMPLOYER_DASHBOARD_VIEWERS_CACHE_TIMEOUT = 10 * 60  # secondes, visiteurs distincts du tableau de bord
+# Planificateur intégré, démarré par les processus serveurs (wsgi.py, asgi.py) : à
+# n'activer que si aucun cron n'exécute les commandes. Déploiement recommandé :
+# cron lançant sweep_jobs, flush_job_views et compact_job_stats
+JOB_SCHEDULER_ENABLED = os.getenv('JOB_SCHEDULER_ENABLED', 'false').lower() == 'true'
+
 # CORS settings
 APPEND_SLASH=False
 CORS_ALLOW_ALL_ORIGINS = True  # En développement, on autorise toutes les origines